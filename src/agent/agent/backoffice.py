@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
@@ -9,10 +10,23 @@ from pathlib import Path
 import logfire
 from pydantic_ai import Agent, RunContext
 
-from agent.ingestion import IngestionResult, ingest_company
+from agent.ingestion import (
+    IngestionResult,
+    ingest_company,
+    ingest_stream,
+    publish_company,
+    publish_first_vectors,
+)
+from agent.ingestion.config import STREAM_QUEUE_SIZE, STREAMING
 from agent.scraper import scrape_company
-from agent.scraper.models import ScrapeResult
-from agent.scraper.storage import list_companies, wipe_raw_data
+from agent.scraper.checkpoint import ScrapeCheckpoint
+from agent.scraper.models import RawDocument, ScrapeResult
+from agent.scraper.storage import (
+    has_raw_data,
+    list_companies,
+    new_generation,
+    wipe_raw_data,
+)
 from agent.settings import get_settings
 from agent.vectorstore import get_vectorstore
 
@@ -34,8 +48,70 @@ class ScrapeJob:
     errors: list[str] = field(default_factory=list)
 
 
-# in-memory job registry — survives across requests, lost on restart
+# job registry — survives across requests; status is mirrored to JOBS_FILE so
+# jobs interrupted by a restart can be resumed from their checkpoints
 _scrape_jobs: dict[str, ScrapeJob] = {}
+JOBS_FILE = "scrape_jobs.json"
+
+
+def _save_jobs(data_dir: Path) -> None:
+    data = {
+        name: {
+            "status": job.status,
+            "started_at": job.started_at.isoformat(),
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            "error": job.error,
+        }
+        for name, job in _scrape_jobs.items()
+    }
+    data_dir.mkdir(parents=True, exist_ok=True)
+    tmp = data_dir / f"{JOBS_FILE}.tmp"
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(data_dir / JOBS_FILE)
+
+
+def _load_jobs(data_dir: Path) -> dict[str, ScrapeJob]:
+    path = data_dir / JOBS_FILE
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return {
+            name: ScrapeJob(
+                company=name,
+                status=info["status"],
+                started_at=datetime.fromisoformat(info["started_at"]),
+                finished_at=datetime.fromisoformat(info["finished_at"])
+                if info.get("finished_at")
+                else None,
+                error=info.get("error"),
+            )
+            for name, info in data.items()
+        }
+    except (OSError, ValueError, KeyError):
+        logger.warning("Ignoring unreadable job registry %s", path, exc_info=True)
+        return {}
+
+
+def _start_scrape(company: str, data_dir: Path) -> None:
+    task = asyncio.create_task(_run_scrape(company, data_dir))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def resume_interrupted_scrapes(data_dir: Path) -> list[str]:
+    """Restore the job registry and restart jobs a shutdown left running.
+
+    Call once at startup, from the event loop. Each restarted job picks up
+    from its on-disk checkpoint instead of starting from scratch.
+    """
+    _scrape_jobs.update(_load_jobs(data_dir))
+    resumed = [name for name, job in _scrape_jobs.items() if job.status == "running"]
+    for name in resumed:
+        logger.info("Resuming interrupted scrape for '%s'", name)
+        _start_scrape(name, data_dir)
+    return resumed
+
 
 BACKOFFICE_INSTRUCTIONS = """\
 You are the Company Intelligence Backoffice operator. \
@@ -58,11 +134,46 @@ FORMAT:
 """
 
 
-async def _run_scrape(company: str, data_dir: object) -> None:
+async def _scrape_and_ingest(
+    company: str, data_dir: Path, generation: int
+) -> tuple[ScrapeResult, IngestionResult]:
+    """Run the scraper and streaming ingestion side by side on a bounded queue."""
+    queue: asyncio.Queue[RawDocument | None] = asyncio.Queue(STREAM_QUEUE_SIZE)
+
+    async def produce() -> ScrapeResult:
+        result = await scrape_company(company, data_dir, queue, generation)
+        await queue.put(None)
+        return result
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            scrape_task = tg.create_task(produce())
+            ingest_task = tg.create_task(ingest_stream(company, queue, generation))
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    return scrape_task.result(), ingest_task.result()
+
+
+async def _run_scrape(company: str, data_dir: Path) -> None:
     job = _scrape_jobs[company]
     with logfire.span("background_scrape {company}", company=company) as span:
         try:
-            result = await scrape_company(company, Path(str(data_dir)))
+            # staged until both raw files and vectors are complete; chat keeps
+            # answering from the previous generation meanwhile. A first gather
+            # has no previous generation, so its vectors are searchable as
+            # they stream in.
+            generation = new_generation(company, data_dir)
+            span.set_attribute("generation", generation)
+            if STREAMING:
+                span.set_attribute(
+                    "published_early",
+                    publish_first_vectors(company, data_dir, generation),
+                )
+                result, job.ingestion_result = await _scrape_and_ingest(
+                    company, data_dir, generation
+                )
+            else:
+                result = await scrape_company(company, data_dir, generation=generation)
             job.result = result
             job.errors = result.errors
 
@@ -80,14 +191,20 @@ async def _run_scrape(company: str, data_dir: object) -> None:
                 len(result.errors),
             )
 
-            job.ingestion_result = await ingest_company(company, Path(str(data_dir)))
+            if not STREAMING:
+                job.ingestion_result = await ingest_company(
+                    company, data_dir, generation
+                )
+            publish_company(company, data_dir, generation)
 
             job.status = "done"
             job.finished_at = datetime.now(UTC)
+            _save_jobs(data_dir)
         except Exception as exc:
             job.status = "failed"
             job.finished_at = datetime.now(UTC)
             job.error = str(exc)
+            _save_jobs(data_dir)
 
             span.record_exception(exc)
             logger.exception("Background scrape failed for '%s'", company)
@@ -132,10 +249,11 @@ def create_backoffice_agent() -> Agent[None, str]:
                 status="running",
                 started_at=datetime.now(UTC),
             )
-
-            task = asyncio.create_task(_run_scrape(normalized, settings.data_dir))
-            _background_tasks.add(task)
-            task.add_done_callback(_background_tasks.discard)
+            _save_jobs(settings.data_dir)
+            # an explicit gather asks for fresh data; only jobs interrupted
+            # by a restart resume from their checkpoint
+            ScrapeCheckpoint(normalized, settings.data_dir).clear()
+            _start_scrape(normalized, settings.data_dir)
 
             return (
                 f"Gathering started for '{company_name}'. "
@@ -180,6 +298,7 @@ def create_backoffice_agent() -> Agent[None, str]:
                 info["documents_loaded"] = job.ingestion_result.documents_loaded
                 info["chunks_produced"] = job.ingestion_result.chunks_produced
                 info["vectors_stored"] = job.ingestion_result.vectors_stored
+                info["chunks_reused"] = job.ingestion_result.chunks_reused
             if job.error:
                 info["error"] = job.error
             if job.errors:
@@ -214,10 +333,12 @@ def create_backoffice_agent() -> Agent[None, str]:
             store = get_vectorstore()
             deleted_points = store.delete_company(normalized)
 
-            raw_dir = settings.data_dir / normalized / "raw"
-            if raw_dir.exists():
+            # a leftover checkpoint would bring the data back on the next gather
+            ScrapeCheckpoint(normalized, settings.data_dir).clear()
+            if has_raw_data(normalized, settings.data_dir):
                 wipe_raw_data(normalized, settings.data_dir)
                 _scrape_jobs.pop(normalized, None)
+                _save_jobs(settings.data_dir)
                 return (
                     f"Deleted all data for '{company_name}' "
                     f"({deleted_points} vectors removed)."
@@ -1,3 +1,3 @@
-from agent.chunker.pipeline import chunk_documents
+from agent.chunker.pipeline import chunk_document, chunk_documents
 
-__all__ = ["chunk_documents"]
+__all__ = ["chunk_document", "chunk_documents"]
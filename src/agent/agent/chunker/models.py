@@ -12,6 +12,8 @@ class ChunkMetadata(BaseModel):
     source_type: str
     chunk_index: int
     scraped_at: datetime
+    doc_hash: str = ""  # set by ingestion; see agent.ingestion.pipeline
+    chunk_hash: str = ""
 
 
 class Chunk(BaseModel):
@@ -1,4 +1,15 @@
 from agent.ingestion.models import IngestionResult
-from agent.ingestion.pipeline import ingest_company
+from agent.ingestion.pipeline import (
+    ingest_company,
+    ingest_stream,
+    publish_company,
+    publish_first_vectors,
+)
 
-__all__ = ["IngestionResult", "ingest_company"]
+__all__ = [
+    "IngestionResult",
+    "ingest_company",
+    "ingest_stream",
+    "publish_company",
+    "publish_first_vectors",
+]
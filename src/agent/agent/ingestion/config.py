@@ -0,0 +1,7 @@
+STREAMING = True  # ingest documents as they are scraped instead of after the scrape
+STREAM_QUEUE_SIZE = 32  # documents buffered between scraper and ingestion
+STREAM_BATCH_CHUNKS = 64  # embed + upsert once this many chunks are pending
+STREAM_FLUSH_INTERVAL = 2.0  # seconds; flush a partial batch when the queue is idle
+INCREMENTAL = (
+    True  # carry over live vectors of unchanged chunks instead of re-embedding
+)
@@ -7,4 +7,6 @@ class IngestionResult(BaseModel):
     company: str
     documents_loaded: int
     chunks_produced: int
-    vectors_stored: int
+    vectors_stored: int  # embedded + carried over
+    chunks_reused: int = 0  # carried over from the live generation, not embedded
+    documents_unchanged: int = 0
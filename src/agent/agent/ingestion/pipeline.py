@@ -1,26 +1,211 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import time
+from functools import lru_cache
 from pathlib import Path
 
 import logfire
 
-from agent.chunker import chunk_documents
+from agent.chunker import chunk_document
+from agent.chunker.config import (
+    HARD_MAX_TOKENS,
+    MIN_CHUNK_TOKENS,
+    OVERLAP_TOKENS,
+    TARGET_CHUNK_TOKENS,
+    TIKTOKEN_ENCODING,
+)
+from agent.chunker.models import Chunk
 from agent.embedder import get_embedder
+from agent.embedder.config import SPARSE_MODEL
+from agent.ingestion.config import (
+    INCREMENTAL,
+    STREAM_BATCH_CHUNKS,
+    STREAM_FLUSH_INTERVAL,
+)
 from agent.ingestion.models import IngestionResult
-from agent.scraper.storage import load_raw_documents
+from agent.scraper.models import RawDocument
+from agent.scraper.storage import (
+    has_raw_data,
+    load_raw_documents,
+    mark_ingested,
+    publish_generation,
+    remove_stale_generations,
+)
+from agent.settings import get_settings
 from agent.vectorstore import get_vectorstore
+from agent.vectorstore.client import StoredChunk
 
 logger = logging.getLogger(__name__)
 
+_background: set[asyncio.Task[None]] = set()
 
-async def ingest_company(company: str, data_dir: Path) -> IngestionResult:
-    """Load raw docs, chunk, embed, and upsert to vector store."""
-    with logfire.span("ingest_company {company}", company=company):
-        store = get_vectorstore()
-        store.delete_company(company)
 
-        docs = load_raw_documents(company, data_dir)
+@lru_cache(maxsize=1)
+def _hash_salt() -> bytes:
+    """Everything besides the text that stored vectors depend on."""
+    parts = (
+        get_settings().embed_model,
+        SPARSE_MODEL,
+        TIKTOKEN_ENCODING,
+        TARGET_CHUNK_TOKENS,
+        HARD_MAX_TOKENS,
+        MIN_CHUNK_TOKENS,
+        OVERLAP_TOKENS,
+    )
+    return "|".join(map(str, parts)).encode()
+
+
+def _content_hash(*parts: str) -> str:
+    h = hashlib.blake2b(_hash_salt(), digest_size=16)
+    for part in parts:
+        h.update(b"\0" + part.encode())
+    return h.hexdigest()
+
+
+class _Incremental:
+    """Picks the chunks to embed per document, reusing live vectors.
+
+    A document whose hash matches all its live points keeps them without
+    being chunked; in a changed document, each chunk whose hash matches one
+    of the document's live points keeps that point, wherever it sat before,
+    so an insertion near the top re-embeds only the chunks it changed. Kept
+    points are carried over to `generation` (re-indexed if they moved), and
+    live points not kept (changed or vanished chunks) are deleted once it is
+    published. Without INCREMENTAL, or without a live generation, every
+    chunk is embedded.
+    """
+
+    def __init__(self, company: str, generation: int) -> None:
+        self.company = company
+        self.generation = generation
+        self.live: dict[str, list[StoredChunk]] = {}
+        if INCREMENTAL:
+            for point in get_vectorstore().live_chunks(company):
+                self.live.setdefault(point.url, []).append(point)
+        self.reused = 0
+        self.unchanged = 0
+
+    def chunks(self, doc: RawDocument) -> tuple[list[Chunk], int]:
+        """Chunks of `doc` that need embedding, and its total chunk count."""
+        doc_hash = _content_hash(doc.title, doc.source_type, doc.content)
+        live = self.live.get(doc.url, [])
+        if live and all(p.doc_hash == doc_hash for p in live):
+            self.unchanged += 1
+            self._carry_over(doc, doc_hash, [p.point_id for p in live])
+            return [], len(live)
+
+        # repeated chunks (shared boilerplate) reuse their points in order
+        by_hash: dict[str, list[StoredChunk]] = {}
+        for point in sorted(live, key=lambda p: p.chunk_index):
+            by_hash.setdefault(point.chunk_hash, []).append(point)
+
+        chunks = chunk_document(doc)
+        kept: list[str] = []
+        moved: dict[str, int] = {}
+        fresh: list[Chunk] = []
+        for chunk in chunks:
+            chunk.metadata.doc_hash = doc_hash
+            chunk.metadata.chunk_hash = _content_hash(
+                doc.title, doc.source_type, chunk.text
+            )
+            matches = by_hash.get(chunk.metadata.chunk_hash)
+            if not matches:
+                fresh.append(chunk)
+                continue
+            point = matches.pop(0)
+            kept.append(point.point_id)
+            if point.chunk_index != chunk.metadata.chunk_index:
+                moved[point.point_id] = chunk.metadata.chunk_index
+        self._carry_over(doc, doc_hash, kept, moved)
+        return fresh, len(chunks)
+
+    def _carry_over(
+        self,
+        doc: RawDocument,
+        doc_hash: str,
+        point_ids: list[str],
+        moved: dict[str, int] | None = None,
+    ) -> None:
+        if point_ids:
+            self.reused += get_vectorstore().carry_over(
+                self.company,
+                point_ids,
+                self.generation,
+                {"doc_hash": doc_hash, "scraped_at": doc.scraped_at.isoformat()},
+                moved,
+            )
+
+
+async def _embed_and_store(chunks: list[Chunk], generation: int) -> int:
+    if not chunks:
+        return 0
+    embedder = get_embedder()
+    dense, sparse = await embedder.embed_texts([c.text for c in chunks])
+    return get_vectorstore().upsert_chunks(chunks, dense, sparse, generation)
+
+
+def _collect_stale(company: str, data_dir: Path | None) -> None:
+    get_vectorstore().delete_stale_generations(company)
+    if data_dir is not None:
+        remove_stale_generations(company, data_dir)
+
+
+def _collect_in_background(company: str, data_dir: Path | None) -> None:
+    task = asyncio.create_task(asyncio.to_thread(_collect_stale, company, data_dir))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+def publish_company(company: str, data_dir: Path, generation: int) -> None:
+    """Switch readers to a fully staged generation, then drop the old one.
+
+    Chat searches move to the new vectors and raw readers to ``raw.<gen>/``
+    at once; until then they keep seeing the previous generation, so a
+    re-gather never leaves the company empty. Old points and directories are
+    deleted in the background.
+    """
+    with logfire.span("publish_company {company}", company=company):
+        get_vectorstore().publish_generation(company, generation)
+        publish_generation(company, data_dir, generation, ingested=True)
+    _collect_in_background(company, data_dir)
+
+
+def publish_first_vectors(company: str, data_dir: Path, generation: int) -> bool:
+    """Make a company's first staged vector generation searchable right away.
+
+    Staging protects the data a re-gather replaces. A company with no data
+    has nothing to protect, so its streamed vectors are published before the
+    scrape finishes and chat can answer from the first documents within
+    seconds. Raw files stay staged until `publish_company`. If the run then
+    fails, the partial generation stays live until the next gather replaces
+    it. Returns False (and publishes nothing) when the company has data.
+    """
+    store = get_vectorstore()
+    if store.live_generation(company) is not None or has_raw_data(company, data_dir):
+        return False
+    store.publish_generation(company, generation)
+    return True
+
+
+async def ingest_company(
+    company: str, data_dir: Path, generation: int | None = None
+) -> IngestionResult:
+    """Load raw docs, chunk, embed, and upsert to vector store.
+
+    With `generation`, that staged raw generation is ingested into vectors of
+    the same generation, and the caller publishes both (`publish_company`).
+    Without it, the published raw documents are re-ingested into a new vector
+    generation that replaces the live one when complete. Only new or changed
+    chunks are embedded (see `_Incremental`).
+    """
+    with logfire.span("ingest_company {company}", company=company) as span:
+        staged = generation is not None
+        docs = load_raw_documents(company, data_dir, generation)
+        if generation is None:
+            generation = time.time_ns() // 1_000_000
         if not docs:
             logger.warning("No raw documents to ingest for '%s'", company)
             return IngestionResult(
@@ -30,8 +215,14 @@ async def ingest_company(company: str, data_dir: Path) -> IngestionResult:
                 vectors_stored=0,
             )
 
-        chunks = chunk_documents(docs)
-        if not chunks:
+        incremental = _Incremental(company, generation)
+        chunks: list[Chunk] = []
+        produced = 0
+        for doc in docs:
+            fresh, count = incremental.chunks(doc)
+            chunks.extend(fresh)
+            produced += count
+        if not produced:
             logger.warning("No chunks produced for '%s'", company)
             return IngestionResult(
                 company=company,
@@ -40,21 +231,88 @@ async def ingest_company(company: str, data_dir: Path) -> IngestionResult:
                 vectors_stored=0,
             )
 
-        embedder = get_embedder()
-        texts = [c.text for c in chunks]
-        dense, sparse = await embedder.embed_texts(texts)
-
-        total = store.upsert_chunks(chunks, dense, sparse)
+        embedded = await _embed_and_store(chunks, generation)
+        if not staged:
+            get_vectorstore().publish_generation(company, generation)
+            mark_ingested(company, data_dir)
+            _collect_in_background(company, None)
         logger.info(
-            "Ingested %d chunks for '%s' (%d docs)",
-            total,
+            "Ingested %d chunks for '%s' (%d docs): %d embedded, %d carried over",
+            produced,
             company,
             len(docs),
+            embedded,
+            incremental.reused,
         )
+        span.set_attribute("chunks_embedded", embedded)
+        span.set_attribute("chunks_reused", incremental.reused)
 
         return IngestionResult(
             company=company,
             documents_loaded=len(docs),
-            chunks_produced=len(chunks),
-            vectors_stored=total,
+            chunks_produced=produced,
+            vectors_stored=embedded + incremental.reused,
+            chunks_reused=incremental.reused,
+            documents_unchanged=incremental.unchanged,
+        )
+
+
+async def ingest_stream(
+    company: str, queue: asyncio.Queue[RawDocument | None], generation: int
+) -> IngestionResult:
+    """Chunk, embed and upsert documents as the scraper produces them.
+
+    Reads until a None sentinel. Chunks are flushed in batches of
+    STREAM_BATCH_CHUNKS, or sooner when no document arrives for
+    STREAM_FLUSH_INTERVAL seconds, so embedding overlaps with the crawl.
+    Points go to the staged `generation`; they become searchable when the
+    caller publishes it.
+    """
+    with logfire.span("ingest_stream {company}", company=company) as span:
+        incremental = _Incremental(company, generation)
+        t0 = time.monotonic()
+        pending: list[Chunk] = []
+        docs_loaded = chunks_produced = total = 0
+        finished = False
+
+        while not finished:
+            try:
+                doc = await asyncio.wait_for(queue.get(), STREAM_FLUSH_INTERVAL)
+            except TimeoutError:
+                flush = True
+            else:
+                finished = doc is None
+                if doc is not None:
+                    docs_loaded += 1
+                    fresh, count = incremental.chunks(doc)
+                    chunks_produced += count
+                    pending.extend(fresh)
+                flush = finished or len(pending) >= STREAM_BATCH_CHUNKS
+
+            if flush and pending:
+                if total == 0:
+                    span.set_attribute("first_upsert_seconds", time.monotonic() - t0)
+                total += await _embed_and_store(pending, generation)
+                pending = []
+
+        logger.info(
+            "Stream-ingested %d chunks for '%s' (%d docs): %d embedded,"
+            " %d carried over",
+            chunks_produced,
+            company,
+            docs_loaded,
+            total,
+            incremental.reused,
+        )
+        span.set_attribute("documents_loaded", docs_loaded)
+        span.set_attribute("chunks_embedded", total)
+        span.set_attribute("chunks_reused", incremental.reused)
+
+        return IngestionResult(
+            company=company,
+            documents_loaded=docs_loaded,
+            chunks_produced=chunks_produced,
+            vectors_stored=total + incremental.reused,
+            chunks_reused=incremental.reused,
+            documents_unchanged=incremental.unchanged,
         )
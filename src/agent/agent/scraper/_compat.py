@@ -3,42 +3,101 @@
 Uvicorn uses SelectorEventLoop on Windows, which lacks subprocess support.
 Playwright (used by Crawl4AI) needs subprocesses to launch Chromium.
 This module runs browser operations in a thread with ProactorEventLoop.
+
+The loop is long-lived: Playwright objects are bound to the loop that created
+them, so browsers kept in the pool must always be driven from the same loop.
 """
 
 from __future__ import annotations
 
 import asyncio
 import sys
-from collections.abc import Awaitable, Callable
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable
 
 from opentelemetry import context as otel_context
 
-_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="crawl4ai")
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
 
+def _get_crawler_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            if sys.platform == "win32":
+                loop: asyncio.AbstractEventLoop = asyncio.ProactorEventLoop()
+            else:
+                loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_run_loop, args=(loop,), name="crawl4ai", daemon=True
+            ).start()
+            _loop = loop
+        return _loop
 
-def _run_in_new_loop[T](fn: Callable[[], Awaitable[T]], ctx: otel_context.Context) -> T:
+
+async def _with_context[T](
+    fn: Callable[[], Awaitable[T]], ctx: otel_context.Context
+) -> T:
     token = otel_context.attach(ctx)
     try:
-        if sys.platform == "win32":
-            loop = asyncio.ProactorEventLoop()
-        else:
-            loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(fn())
-        finally:
-            loop.close()
+        return await fn()
     finally:
         otel_context.detach(token)
 
 
 async def run_in_crawler_thread[T](fn: Callable[[], Awaitable[T]]) -> T:
-    """Run an async callable in a thread with ProactorEventLoop on Windows.
+    """Run an async callable on the crawler loop (ProactorEventLoop on Windows).
 
-    Propagates OpenTelemetry context to the worker thread.
+    Propagates OpenTelemetry context to the worker thread. Cancelling the
+    caller cancels the task on the crawler loop.
     """
     ctx = otel_context.get_current()
-    return await asyncio.get_running_loop().run_in_executor(
-        _pool, _run_in_new_loop, fn, ctx
+    future = asyncio.run_coroutine_threadsafe(
+        _with_context(fn, ctx), _get_crawler_loop()
     )
+    return await asyncio.wrap_future(future)
+
+
+async def stream_from_crawler_thread[T](
+    fn: Callable[[Callable[[T], None]], Awaitable[object]],
+) -> AsyncIterator[T]:
+    """Run `fn(emit)` on the crawler loop and yield what it emits, as emitted.
+
+    `emit` hands each item to the caller's loop immediately, so the caller
+    processes items while the crawl continues. Exceptions from `fn` are raised
+    after the items emitted before them; closing the iterator early cancels
+    the crawl.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[bool, T | None]] = asyncio.Queue()
+
+    def emit(item: T) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, (False, item))
+
+    task = asyncio.ensure_future(run_in_crawler_thread(lambda: fn(emit)))
+    # runs after every emit scheduled before the crawl finished
+    task.add_done_callback(lambda _: queue.put_nowait((True, None)))
+    try:
+        while True:
+            done, item = await queue.get()
+            if done:
+                break
+            yield item  # type: ignore[misc]
+        await task
+    finally:
+        task.cancel()
+
+
+def stop_crawler_loop() -> None:
+    """Stop the crawler loop thread. Pending browser work is abandoned."""
+    global _loop
+    with _loop_lock:
+        if _loop is not None and not _loop.is_closed():
+            _loop.call_soon_threadsafe(_loop.stop)
+        _loop = None
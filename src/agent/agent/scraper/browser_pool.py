@@ -0,0 +1,234 @@
+"""Process-wide pool of headless browsers shared by every crawl phase.
+
+Launching Chromium costs seconds and a few hundred MB, so browsers are started
+lazily, lent out to crawl calls and kept alive between scrape jobs. A browser is
+recycled (closed and relaunched on next demand) after it has served
+BROWSER_MAX_PAGES pages or when the browser process tree grows past
+BROWSER_MAX_RSS_MB.
+
+With BROWSER_LEAN, pooled browsers render with a small viewport, Chromium's
+light mode, and a request filter that aborts images, media, fonts,
+stylesheets and known tracker domains. JavaScript stays on: the browser tier
+exists for JS-rendered pages.
+
+All pool methods must run on the crawler loop (see _compat.py).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+from urllib.parse import urlparse
+
+import psutil
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from agent.scraper.config import (
+    BROWSER_BLOCK_STYLESHEETS,
+    BROWSER_BLOCKED_BYTES_ESTIMATE,
+    BROWSER_BLOCKED_DOMAINS,
+    BROWSER_BLOCKED_RESOURCE_TYPES,
+    BROWSER_LEAN,
+    BROWSER_MAX_PAGES,
+    BROWSER_MAX_RSS_MB,
+    BROWSER_POOL_SIZE,
+    BROWSER_VIEWPORT,
+)
+from agent.scraper.metrics import (
+    active_browsers,
+    browser_blocked_requests,
+    browser_bytes_saved_estimate,
+    browser_wait_time,
+)
+
+logger = logging.getLogger(__name__)
+
+BROWSER_CONFIG = (
+    BrowserConfig(
+        headless=True,
+        light_mode=True,
+        viewport_width=BROWSER_VIEWPORT[0],
+        viewport_height=BROWSER_VIEWPORT[1],
+    )
+    if BROWSER_LEAN
+    else BrowserConfig(headless=True)
+)
+
+_BLOCKED_TYPES = BROWSER_BLOCKED_RESOURCE_TYPES | (
+    {"stylesheet"} if BROWSER_BLOCK_STYLESHEETS else set()
+)
+
+
+def _block_reason(url: str, resource_type: str) -> str | None:
+    """Why a browser subresource request should be aborted, if it should."""
+    if resource_type == "document":
+        return None
+    if resource_type in _BLOCKED_TYPES:
+        return resource_type
+    host = (urlparse(url).hostname or "").lower()
+    while host:
+        if host in BROWSER_BLOCKED_DOMAINS:
+            return "tracker"
+        host = host.partition(".")[2]
+    return None
+
+
+async def _filter_request(route: Any) -> None:
+    request = route.request
+    reason = _block_reason(request.url, request.resource_type)
+    if reason is None:
+        await route.continue_()
+        return
+    browser_blocked_requests.add(1, {"reason": reason})
+    browser_bytes_saved_estimate.add(
+        BROWSER_BLOCKED_BYTES_ESTIMATE.get(reason, 0), {"reason": reason}
+    )
+    await route.abort()
+
+
+async def _on_page_context_created(page: Any, **_: Any) -> Any:
+    await page.route("**/*", _filter_request)
+    return page
+
+
+@dataclass
+class BrowserLease:
+    """A browser on loan from the pool. Callers add to `pages` as they crawl."""
+
+    crawler: AsyncWebCrawler
+    pages: int = 0
+
+
+@dataclass
+class _PooledBrowser:
+    crawler: AsyncWebCrawler
+    # the Playwright driver started for this browser; Chromium runs under it
+    processes: list[psutil.Process] = field(default_factory=list)
+    pages: int = 0
+
+
+def _helper_processes() -> set[psutil.Process]:
+    """Direct children that are not Python (post-processing workers are)."""
+    me = psutil.Process()
+    helpers: set[psutil.Process] = set()
+    for child in me.children():
+        try:
+            if child.exe() != me.exe():
+                helpers.add(child)
+        except psutil.Error:
+            continue
+    return helpers
+
+
+def _tree_rss_mb(roots: list[psutil.Process]) -> float:
+    """RSS of `roots` and all their descendants in MB."""
+    total = 0
+    for root in roots:
+        try:
+            tree = [root, *root.children(recursive=True)]
+        except psutil.Error:
+            continue
+        for proc in tree:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+    return total / (1024 * 1024)
+
+
+@dataclass
+class BrowserPool:
+    size: int = BROWSER_POOL_SIZE
+    max_pages: int = BROWSER_MAX_PAGES
+    max_rss_mb: int = BROWSER_MAX_RSS_MB
+    _idle: list[_PooledBrowser] = field(default_factory=list, init=False)
+    _slots: asyncio.Semaphore = field(init=False)
+    _launching: asyncio.Lock = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._slots = asyncio.Semaphore(self.size)
+        self._launching = asyncio.Lock()
+
+    async def _launch(self) -> _PooledBrowser:
+        crawler = AsyncWebCrawler(config=BROWSER_CONFIG)
+        if BROWSER_LEAN:
+            crawler.crawler_strategy.set_hook(
+                "on_page_context_created", _on_page_context_created
+            )
+        # one launch at a time, so the helper processes that appear during
+        # start() are this browser's own
+        async with self._launching:
+            before = _helper_processes()
+            await crawler.start()
+            processes = list(_helper_processes() - before)
+        active_browsers.add(1, {"state": "idle"})
+        logger.info("Launched pooled browser (pool size %d)", self.size)
+        return _PooledBrowser(crawler=crawler, processes=processes)
+
+    async def _retire(self, browser: _PooledBrowser, reason: str) -> None:
+        active_browsers.add(-1, {"state": "idle"})
+        logger.info("Recycling browser after %d pages (%s)", browser.pages, reason)
+        try:
+            await browser.crawler.close()
+        except Exception:
+            logger.warning("Failed to close recycled browser", exc_info=True)
+
+    def _recycle_reason(self, browser: _PooledBrowser) -> str | None:
+        if browser.pages >= self.max_pages:
+            return "page_limit"
+        if _tree_rss_mb(browser.processes) > self.max_rss_mb:
+            return "rss_limit"
+        return None
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserLease]:
+        """Borrow a started browser; it returns to the pool on exit."""
+        t0 = time.monotonic()
+        active_browsers.add(1, {"state": "waiting"})
+        try:
+            await self._slots.acquire()
+        finally:
+            active_browsers.add(-1, {"state": "waiting"})
+        browser_wait_time.record(time.monotonic() - t0)
+
+        try:
+            browser = self._idle.pop() if self._idle else await self._launch()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        lease = BrowserLease(crawler=browser.crawler)
+        active_browsers.add(-1, {"state": "idle"})
+        active_browsers.add(1, {"state": "leased"})
+        failed = False
+        try:
+            yield lease
+        except BaseException:
+            # cancellation can leave pages mid-navigation, so it counts too
+            failed = True
+            raise
+        finally:
+            active_browsers.add(-1, {"state": "leased"})
+            active_browsers.add(1, {"state": "idle"})
+            browser.pages += lease.pages
+            reason = "crawl_error" if failed else self._recycle_reason(browser)
+            if reason:
+                await self._retire(browser, reason)
+            else:
+                self._idle.append(browser)
+            self._slots.release()
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._retire(self._idle.pop(), "shutdown")
+
+
+@lru_cache(maxsize=1)
+def get_browser_pool() -> BrowserPool:
+    return BrowserPool()
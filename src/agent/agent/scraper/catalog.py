@@ -0,0 +1,103 @@
+"""Catalog of published raw data: one small JSON file under data_dir.
+
+One entry per company, describing its published generation, so listing
+companies is a single file read instead of a scan of every company
+directory. Storage keeps it current: `publish_generation` and
+`wipe_raw_data` edit it, and the ingestion pipeline records when the
+published documents are in the vector store. Edits are read-modify-write
+under a process-wide lock and land with an atomic replace, so readers see
+the old or the new catalog, never a partial one.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Literal
+
+from agent.scraper.config import CATALOG_FILE
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 1
+_lock = threading.Lock()
+
+IngestionStatus = Literal["pending", "ingested", "unknown"]
+
+
+@dataclass
+class CatalogEntry:
+    """What one company's published raw data holds.
+
+    `content_hash` digests every document's URL and body hash, so an unchanged
+    re-scrape keeps it. `ingestion` is "pending" until the published documents
+    are in the vector store, "unknown" for entries rebuilt from disk.
+    """
+
+    company: str
+    generation: int | None  # None: unversioned raw/ directory
+    documents: int
+    bytes: int  # UTF-8 body bytes
+    stored_bytes: int  # on disk
+    scraped_at: str  # latest document, ISO 8601; "" when empty
+    content_hash: str
+    ingestion: IngestionStatus = "pending"
+    ingested_at: str = ""
+
+    def listing(self) -> dict[str, str | int]:
+        return {
+            "company": self.company,
+            "files": self.documents,
+            "bytes": self.bytes,
+            "scraped_at": self.scraped_at,
+            "ingestion": self.ingestion,
+        }
+
+
+def read_catalog(base_dir: Path) -> dict[str, CatalogEntry] | None:
+    """Entries by company, or None when there is no readable catalog."""
+    try:
+        data = json.loads((base_dir / CATALOG_FILE).read_text(encoding="utf-8"))
+        if data.get("version") != _VERSION:
+            return None
+        return {entry["company"]: CatalogEntry(**entry) for entry in data["companies"]}
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring unreadable catalog in %s", base_dir)
+        return None
+
+
+def _write_catalog(base_dir: Path, entries: dict[str, CatalogEntry]) -> None:
+    path = base_dir / CATALOG_FILE
+    tmp = path.with_suffix(".tmp")
+    payload = {
+        "version": _VERSION,
+        "companies": [asdict(entries[name]) for name in sorted(entries)],
+    }
+    base_dir.mkdir(parents=True, exist_ok=True)
+    tmp.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+@contextmanager
+def edit_catalog(
+    base_dir: Path, rebuild: Callable[[], dict[str, CatalogEntry]]
+) -> Iterator[dict[str, CatalogEntry]]:
+    """Yield the entries for in-place changes, then write them atomically.
+
+    A missing catalog is first rebuilt with `rebuild` (a scan of the raw
+    data). Nothing is written if the block raises.
+    """
+    with _lock:
+        entries = read_catalog(base_dir)
+        if entries is None:
+            entries = rebuild()
+        yield entries
+        _write_catalog(base_dir, entries)
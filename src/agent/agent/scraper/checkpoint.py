@@ -0,0 +1,181 @@
+"""On-disk checkpoints that let an interrupted scrape resume.
+
+Layout under ``<data_dir>/<company>/checkpoint/``:
+
+    state.json   — discovery results and the website BFS frontier
+    pages.jsonl  — every successfully fetched page (url, title, markdown),
+                   appended as it arrives and tagged with its phase
+
+On resume, discovery (Wikipedia + search) is restored instead of re-run, the
+website BFS continues from its saved frontier, and pages already in
+``pages.jsonl`` are not fetched again. The directory is removed once the raw
+files are saved. A checkpoint older than CHECKPOINT_MAX_AGE is discarded
+rather than resumed: its discovery results and pages would be stale.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from agent.scraper.config import CHECKPOINT_DIR, CHECKPOINT_MAX_AGE
+from agent.scraper.fetcher import PageResult, extract_fit_markdown
+from agent.scraper.models import RawDocument, SearchResults, WikipediaResult
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeCheckpoint:
+    def __init__(self, company: str, data_dir: Path) -> None:
+        self.company = company
+        self.path = data_dir / company / CHECKPOINT_DIR
+        self._state: dict[str, Any] = {
+            "created_at": time.time(),
+            "discovery": None,
+            "bfs": {},
+        }
+        self._pages: dict[str, dict[str, dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls, company: str, data_dir: Path, max_age: float = CHECKPOINT_MAX_AGE
+    ) -> ScrapeCheckpoint:
+        checkpoint = cls(company, data_dir)
+        state_file = checkpoint.path / "state.json"
+        pages_file = checkpoint.path / "pages.jsonl"
+        try:
+            if state_file.exists():
+                state = json.loads(state_file.read_text(encoding="utf-8"))
+                # checkpoints written before created_at was recorded
+                state.setdefault("created_at", state_file.stat().st_mtime)
+                checkpoint._state.update(state)
+            if pages_file.exists():
+                for line in pages_file.read_text(encoding="utf-8").splitlines():
+                    if not line.strip():
+                        continue
+                    try:
+                        page = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash
+                    checkpoint._pages.setdefault(page["phase"], {})[page["url"]] = page
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable checkpoint at %s", checkpoint.path)
+            return cls(company, data_dir)
+        age = time.time() - checkpoint._state["created_at"]
+        if checkpoint.resumed and age > max_age:
+            logger.info("Discarding %.1f h old checkpoint for %s", age / 3600, company)
+            checkpoint.clear()
+            return cls(company, data_dir)
+        if checkpoint.resumed:
+            logger.info(
+                "Resuming scrape for %s from checkpoint (%d pages)",
+                company,
+                sum(len(p) for p in checkpoint._pages.values()),
+            )
+        return checkpoint
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self._state["discovery"] or self._pages)
+
+    def _write_state(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / "state.json.tmp"
+        with self._lock:
+            tmp.write_text(json.dumps(self._state), encoding="utf-8")
+            tmp.replace(self.path / "state.json")
+
+    # -- discovery --
+
+    def save_discovery(self, wiki: WikipediaResult, search: SearchResults) -> None:
+        self._state["discovery"] = {
+            "wiki_document": wiki.document.model_dump(mode="json")
+            if wiki.document
+            else None,
+            "wiki_related": [d.model_dump(mode="json") for d in wiki.related_documents],
+            "official_website": wiki.official_website,
+            "homepage_url": search.homepage_url,
+            "company_urls": search.company_urls,
+            "extra_urls": search.extra_urls,
+        }
+        self._write_state()
+
+    def discovery(self) -> tuple[WikipediaResult, SearchResults] | None:
+        data = self._state["discovery"]
+        if not data:
+            return None
+        wiki_doc = data["wiki_document"]
+        wiki = WikipediaResult(
+            document=RawDocument.model_validate(wiki_doc) if wiki_doc else None,
+            official_website=data["official_website"],
+            related_documents=[
+                RawDocument.model_validate(d) for d in data["wiki_related"]
+            ],
+        )
+        search = SearchResults(
+            homepage_url=data["homepage_url"],
+            company_urls=list(data["company_urls"]),
+            extra_urls=list(data["extra_urls"]),
+        )
+        return wiki, search
+
+    # -- pages --
+
+    def page_recorder(self, phase: str) -> Callable[[Any], None]:
+        """Callback for TieredCrawler(on_page=...); runs on the crawler loop."""
+
+        def record(result: Any) -> None:
+            url = str(getattr(result, "url", ""))
+            meta = getattr(result, "metadata", None) or {}
+            page = {
+                "phase": phase,
+                "url": url,
+                "title": str(meta.get("title") or ""),
+                "markdown": extract_fit_markdown(result) or "",
+            }
+            self.path.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._pages.setdefault(phase, {})[url] = page
+                with (self.path / "pages.jsonl").open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(page) + "\n")
+
+        return record
+
+    def stored_results(self, phase: str) -> list[PageResult]:
+        """Checkpointed pages shaped like crawl results for _process_crawl_result."""
+        return [
+            PageResult(
+                url=page["url"],
+                success=True,
+                markdown=page["markdown"],
+                metadata={"title": page["title"]},
+            )
+            for page in self._pages.get(phase, {}).values()
+        ]
+
+    # -- BFS frontier --
+
+    def bfs_state(self, phase: str) -> dict[str, Any] | None:
+        state: dict[str, Any] | None = self._state["bfs"].get(phase)
+        return state
+
+    def bfs_state_saver(
+        self, phase: str
+    ) -> Callable[[dict[str, Any]], Awaitable[None]]:
+        """on_state_change callback for crawl4ai's BFSDeepCrawlStrategy."""
+
+        async def save(state: dict[str, Any]) -> None:
+            self._state["bfs"][phase] = state
+            self._write_state()
+
+        return save
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -3,45 +3,134 @@ from __future__ import annotations
 import re
 import unicodedata
 
-from langdetect import LangDetectException, detect
-
 MAX_LENGTH = 50_000
 MIN_LENGTH = 50
 
-_MULTI_NEWLINE = re.compile(r"\n{3,}")
 _MULTI_SPACE = re.compile(r"[ \t]{2,}")
-_MD_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
 _BARE_URL = re.compile(r"(?<!\()\bhttps?://\S+")
-_WIKI_EDIT = re.compile(r"\[edit\]")
 _WIKI_CITE = re.compile(r"\[\d+\]")
-_SKIP_LINE = re.compile(r"^Skip to main content$", re.MULTILINE)
 _SLIDE_INDICATOR = re.compile(r"Slide \d+ of \d+")
-_COOKIE_BLOCK = re.compile(
-    r"(?:^|\n)#{1,3} Cookie (?:policy|settings).*?(?=\n#|\Z)", re.DOTALL
-)
+_COOKIE_HEADING = re.compile(r"#{1,3} Cookie (?:policy|settings)")
+_SKIP_LINE = "Skip to main content"
+_WIKI_EDIT = "[edit]"
+
+
+def _strip_images(text: str) -> str:
+    r"""Remove markdown images (``![alt](src)``, possibly spanning lines).
+
+    Same matches as ``re.sub(r"!\[[^\]]*\]\([^)]*\)", "", text)``, found in
+    linear time: the regex rescans to the next ``]`` / ``)`` from every ``![``,
+    which is quadratic on pages with many unclosed ``![``.
+    """
+    parts: list[str] = []
+    pos = 0  # start of the text not yet copied
+    search = 0
+    close_bracket = close_paren = -1  # cached next "]" / ")" positions
+    while (start := text.find("![", search)) >= 0:
+        if close_bracket < start + 2:
+            close_bracket = text.find("]", start + 2)
+            if close_bracket < 0:
+                break  # no "]" left: no later image can match either
+        if not text.startswith("(", close_bracket + 1):
+            search = start + 1
+            continue
+        if close_paren < close_bracket + 2:
+            close_paren = text.find(")", close_bracket + 2)
+            if close_paren < 0:
+                break
+        parts.append(text[pos:start])
+        pos = search = close_paren + 1
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _clean_line(line: str, normalize: bool) -> str:
+    """Line-local filters, in the order the page-level passes used to run."""
+    if normalize and not line.isascii():
+        line = unicodedata.normalize("NFC", line)
+    if "://" in line:
+        line = _BARE_URL.sub("", line)
+    if _WIKI_EDIT in line:
+        line = line.replace(_WIKI_EDIT, "")
+    if "[" in line:
+        line = _WIKI_CITE.sub("", line)
+    if line == _SKIP_LINE:
+        return ""
+    if "Slide " in line:
+        line = _SLIDE_INDICATOR.sub("", line)
+    return line
 
 
 def clean_text(raw: str) -> str | None:
-    text = unicodedata.normalize("NFC", raw)
-    text = _MD_IMAGE.sub("", text)
-    text = _BARE_URL.sub("", text)
-    text = _WIKI_EDIT.sub("", text)
-    text = _WIKI_CITE.sub("", text)
-    text = _SKIP_LINE.sub("", text)
-    text = _SLIDE_INDICATOR.sub("", text)
-    text = _COOKIE_BLOCK.sub("", text)
-    text = _MULTI_NEWLINE.sub("\n\n", text)
-    text = _MULTI_SPACE.sub(" ", text)
-    text = text.strip()
+    """Clean crawled markdown in one pass over its lines.
+
+    NFC-normalizes; removes images, bare URLs, wiki ``[edit]``/citation
+    markers, "Skip to main content" lines, slide indicators and cookie
+    sections (a ``#``-``###`` "Cookie policy/settings" heading up to the next
+    ``#`` line); collapses 3+ newlines and runs of spaces/tabs; strips; and
+    truncates to MAX_LENGTH. Returns None below MIN_LENGTH.
+
+    Every filter except images is confined to one line, so lines are
+    processed as they are read and reading stops once MAX_LENGTH characters
+    of output are certain. Images may span lines and are removed up front,
+    only from pages that contain one.
+    """
+    normalize = True
+    if "![" in raw:
+        # normalize first: removing an image can join a combining mark to the
+        # character before it, which must not compose
+        raw = _strip_images(unicodedata.normalize("NFC", raw))
+        normalize = False
+
+    parts: list[str] = []
+    size = 0  # characters in parts
+    content_end = 0  # end of the last non-whitespace character in parts
+    newlines = 0  # newlines since the last non-empty line
+    first = True
+    in_cookie = False
+    pos = 0
+    end_of_text = len(raw)
+    while pos <= end_of_text:
+        end = raw.find("\n", pos)
+        if end < 0:
+            end = end_of_text
+        line = _clean_line(raw[pos:end], normalize)
+        pos = end + 1
+
+        if in_cookie:
+            if not line.startswith("#"):
+                continue
+            in_cookie = False
+        if _COOKIE_HEADING.match(line):
+            # the section and the newline before it are dropped; at the very
+            # start of the page the first line is left empty instead
+            in_cookie = True
+            first = False
+            continue
+        if first:
+            first = False
+        else:
+            newlines += 1
+        if not line:
+            continue
+
+        if "  " in line or "\t" in line:
+            line = _MULTI_SPACE.sub(" ", line)
+        piece = "\n" * min(newlines, 2) + line if newlines else line
+        newlines = 0
+        if not parts:
+            piece = piece.lstrip()
+            if not piece:
+                continue
+        parts.append(piece)
+        kept = len(piece.rstrip())
+        if kept:
+            content_end = size + kept
+        size += len(piece)
+        if content_end >= MAX_LENGTH:
+            return "".join(parts)[:MAX_LENGTH]
+
+    text = "".join(parts)[:content_end]
     if len(text) < MIN_LENGTH:
         return None
-    if len(text) > MAX_LENGTH:
-        text = text[:MAX_LENGTH]
     return text
-
-
-def is_english(text: str) -> bool:
-    try:
-        return bool(detect(text) == "en")
-    except LangDetectException:
-        return True
@@ -0,0 +1,142 @@
+"""Optional zstd compression of raw document bodies.
+
+Bodies are compressed one by one, so the record store keeps random access to
+each document. Per-document frames lose the cross-document redundancy that a
+whole-file compressor would find (navigation, legal and cookie boilerplate
+repeated on every page and across companies); a dictionary trained on the
+corpus puts it back. Dictionaries are stored under ``data_dir/RAW_DICT_DIR/``
+as ``<id>.dict`` and never deleted, since every store names the dictionary it
+was written with; the CURRENT file there names the one used for new stores.
+
+Needs the ``zstandard`` package (the ``zstd`` extra). Without it new stores
+are written uncompressed; reading a compressed store raises.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from agent.scraper.config import (
+    RAW_COMPRESSION,
+    RAW_COMPRESSION_LEVEL,
+    RAW_DICT_DIR,
+    RAW_DICT_SIZE,
+)
+
+try:
+    import zstandard
+except ImportError:  # optional dependency (the zstd extra)
+    zstandard = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_CURRENT = "CURRENT"
+
+
+@dataclass(frozen=True)
+class Codec:
+    """How the bodies of one store are encoded.
+
+    `dictionary` is the zstd dictionary ID, 0 for none.
+    """
+
+    name: str = "none"
+    dictionary: int = 0
+
+
+NO_COMPRESSION = Codec()
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise RuntimeError(
+            "Raw documents are zstd-compressed but the zstandard package is not"
+            " installed (install the zstd extra)"
+        )
+
+
+def current_dictionary(base_dir: Path) -> int:
+    """ID of the dictionary new stores use, 0 when none was trained."""
+    try:
+        return int((base_dir / RAW_DICT_DIR / _CURRENT).read_text().strip())
+    except (OSError, ValueError):
+        return 0
+
+
+@lru_cache(maxsize=8)
+def _dictionary(base_dir: Path, dict_id: int) -> zstandard.ZstdCompressionDict:
+    data = (base_dir / RAW_DICT_DIR / f"{dict_id}.dict").read_bytes()
+    dictionary = zstandard.ZstdCompressionDict(data)
+    dictionary.precompute_compress(level=RAW_COMPRESSION_LEVEL)
+    return dictionary
+
+
+@lru_cache(maxsize=1)
+def _warn_unavailable() -> None:
+    logger.warning("zstandard is not installed; raw documents stored uncompressed")
+
+
+def default_codec(base_dir: Path) -> Codec:
+    """Codec for a new store, per RAW_COMPRESSION and the current dictionary."""
+    if RAW_COMPRESSION != "zstd":
+        return NO_COMPRESSION
+    if zstandard is None:
+        _warn_unavailable()
+        return NO_COMPRESSION
+    return Codec("zstd", current_dictionary(base_dir))
+
+
+def compressor(codec: Codec, base_dir: Path) -> Callable[[bytes], bytes] | None:
+    """Body encoder for `codec`, None when bodies are stored as they are."""
+    if codec.name == "none":
+        return None
+    _require_zstandard()
+    if codec.dictionary:
+        return zstandard.ZstdCompressor(
+            level=RAW_COMPRESSION_LEVEL,
+            dict_data=_dictionary(base_dir, codec.dictionary),
+        ).compress
+    return zstandard.ZstdCompressor(level=RAW_COMPRESSION_LEVEL).compress
+
+
+def decompressor(codec: Codec, base_dir: Path) -> Callable[[bytes], bytes] | None:
+    """Body decoder for `codec`, None when bodies are stored as they are."""
+    if codec.name == "none":
+        return None
+    _require_zstandard()
+    if codec.dictionary:
+        return zstandard.ZstdDecompressor(
+            dict_data=_dictionary(base_dir, codec.dictionary)
+        ).decompress
+    return zstandard.ZstdDecompressor().decompress
+
+
+def train_dictionary(samples: Sequence[bytes], base_dir: Path) -> int:
+    """Train a dictionary on `samples`, save it and make it current.
+
+    Stores written before keep decoding with the dictionary they name.
+    """
+    _require_zstandard()
+    trained = zstandard.train_dictionary(
+        RAW_DICT_SIZE, list(samples), level=RAW_COMPRESSION_LEVEL
+    )
+    dict_id = trained.dict_id()
+    directory = base_dir / RAW_DICT_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{dict_id}.dict").write_bytes(trained.as_bytes())
+    pointer = directory / _CURRENT
+    tmp = pointer.with_suffix(".tmp")
+    tmp.write_text(str(dict_id))
+    os.replace(tmp, pointer)
+    logger.info(
+        "Trained raw dictionary %d (%d bytes) on %d samples",
+        dict_id,
+        len(trained),
+        len(samples),
+    )
+    return dict_id
@@ -6,24 +6,217 @@ from __future__ import annotations
 WEBSITE_MAX_DEPTH = 2
 WEBSITE_MAX_PAGES = 20
 
+# -- Best-first frontier for the website crawl (fetch the most useful links first) --
+WEBSITE_BEST_FIRST = True  # False: plain BFS in discovery order
+FRONTIER_BATCH_SIZE = 4  # links fetched per round before re-ranking
+FRONTIER_DEPTH_PENALTY = 0.5  # score lost per link hop from the homepage
+FRONTIER_HIGH_VALUE_KEYWORDS = {
+    "about",
+    "company",
+    "overview",
+    "history",
+    "mission",
+    "story",
+    "leadership",
+    "management",
+    "team",
+    "board",
+    "governance",
+    "investor",
+    "investors",
+    "ir",
+    "press",
+    "news",
+    "newsroom",
+    "media",
+    "annual",
+    "report",
+    "sustainability",
+    "esg",
+}
+FRONTIER_LOW_VALUE_KEYWORDS = {
+    "careers",
+    "career",
+    "jobs",
+    "job",
+    "legal",
+    "privacy",
+    "terms",
+    "cookie",
+    "cookies",
+    "imprint",
+    "accessibility",
+    "login",
+    "signin",
+    "signup",
+    "register",
+    "account",
+    "cart",
+    "checkout",
+    "shop",
+    "store",
+    "catalog",
+    "tag",
+    "tags",
+    "category",
+    "search",
+    "download",
+    "downloads",
+}
+
+# -- Sitemap discovery (replaces the website crawl when it yields enough pages) --
+SITEMAP_ENABLED = True
+SITEMAP_MIN_URLS = 3  # fewer relevant entries (besides the homepage) => crawl
+SITEMAP_MAX_FILES = 10  # sitemap files read per site (indexes included)
+SITEMAP_MAX_URLS = 50_000  # page entries read per site
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024  # per file, uncompressed (protocol limit)
+SITEMAP_TIMEOUT = 20  # seconds
+
 # -- Company pages shallow crawl (newsroom, about, blog) --
 COMPANY_PAGES_MAX_DEPTH = 1
-COMPANY_PAGES_MAX_PAGES = 10
+COMPANY_PAGES_MAX_PAGES = 10  # per seed; seeds crawl together on a shared budget
 COMPANY_PAGES_MAX_SEEDS = 5
 
 # -- Search results scrape --
 SEARCH_MAX_URLS = 10
 SEARCH_PER_URL_TIMEOUT = 45  # seconds
 SEARCH_BATCH_TIMEOUT = 300  # seconds
+SEARCH_CONCURRENT = True  # fetch URLs in parallel tabs instead of one by one
+SEARCH_CONCURRENCY = 4  # max tabs open at once
+SEARCH_PER_HOST_CONCURRENCY = 1  # max tabs per host
 
 # -- Shared crawl settings --
 PAGE_TIMEOUT_MS = 30_000
-MEAN_DELAY = 1.0  # seconds between requests
-DELAY_JITTER = 0.5  # ± range around mean_delay
+MEAN_DELAY = 1.0  # seconds between requests to one registered domain
+DELAY_JITTER = 0.5  # random extra wait added when a request has to wait
 EXCLUDED_TAGS = ["nav", "footer", "header", "aside", "form"]
 
+# -- Politeness (per registered domain, shared by all jobs) --
+POLITENESS_BURST = 2  # requests allowed back-to-back before pacing kicks in
+POLITENESS_MAX_INTERVAL = 60.0  # cap for Crawl-delay and 429/503 backoff (s)
+POLITENESS_BACKOFF_STATUSES = {429, 503}
+
+# -- HTTP-first fetch tier (browser only for JS-rendered pages) --
+HTTP_FIRST = True
+HTTP_TIMEOUT = 20  # seconds
+HTTP_MAX_BYTES = 5_000_000  # response bodies are truncated past this
+HTTP_MAX_CONNECTIONS = 20
+HTTP_PER_HOST_CONCURRENCY = 2  # parallel fetches per host in one arun_many batch
+HTTP_MIN_TEXT_CHARS = 300  # less cleaned text than this => assume a JS shell
+HTTP_SHELL_MAX_TEXT_CHARS = 2_000  # "enable JavaScript" pages below this => browser
+
+# -- Persistent page cache (under data_dir; reused across scrape jobs) --
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_DIR = ".cache"
+PAGE_CACHE_TTL = 24 * 3600  # seconds; older entries are revalidated (ETag / 304)
+PAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024  # LRU eviction past this
+
+# -- Page post-processing (cleaning + language detection, off the event loop) --
+POSTPROCESS_WORKERS = 2  # worker processes; 0 processes pages inline
+POSTPROCESS_BATCH_SIZE = 8  # pages per worker task
+
+# -- Language identification (English-only corpus) --
+LANGID_SEED = 0  # fixed langdetect seed: the same text always gets the same verdict
+LANGID_WINDOWS = 3  # evenly spaced samples of long documents (start, middle, end)
+LANGID_WINDOW_CHARS = 600
+LANGID_STOPWORD_RATIO = (
+    0.15  # share of English function words accepted without langdetect
+)
+LANGID_STOPWORD_MIN_WORDS = 30
+LANGID_DOMAIN_MIN_PAGES = 5  # agreeing verdicts before a host's language is trusted
+LANGID_DOMAIN_CACHE_SIZE = 1024  # hosts
+
+# -- Near-duplicate elimination (SimHash over cleaned content, per scrape job) --
+NEAR_DUP_ENABLED = True
+NEAR_DUP_SHINGLE_WORDS = 3
+NEAR_DUP_MAX_DISTANCE = 6  # differing bits (of 64) still counted as a duplicate
+
+# -- Raw document store (data_dir/<company>/raw.<generation>/) --
+RAW_STORE_FORMAT = "records"  # "records" (record file + offset index) or "markdown"
+RAW_RECORDS_FILE = "documents.dat"  # document bodies, back to back, append-only
+RAW_INDEX_FILE = "documents.idx"  # metadata + (offset, length) per document
+RAW_CURRENT_FILE = "CURRENT"  # names the published raw.<generation>/ directory
+CATALOG_FILE = "catalog.json"  # under data_dir: one entry per published company
+RAW_COMPRESSION = "zstd"  # "zstd" (needs the zstd extra) or "none"; per document
+RAW_COMPRESSION_LEVEL = 9
+RAW_DICT_DIR = ".zstd"  # under data_dir: shared dictionaries, named by zstd ID
+RAW_DICT_SIZE = 64 * 1024  # bytes
+RAW_DICT_SAMPLE_BYTES = 2048  # documents are cut into samples of this size
+RAW_DICT_MIN_SAMPLES = 16  # smaller corpus => no dictionary
+RAW_DICT_MAX_SAMPLES = 20_000  # evenly thinned beyond this
+
+# -- Resumable jobs (checkpoint under data_dir/<company>/, removed on success) --
+CHECKPOINT_ENABLED = True
+CHECKPOINT_DIR = "checkpoint"
+CHECKPOINT_MAX_AGE = 24 * 3600  # seconds; older checkpoints start over
+
+# -- Robots.txt / DNS caches (process-wide, persisted next to the page cache) --
+NET_CACHE_FILE = "netcache.json"
+ROBOTS_CACHE_TTL = 24 * 3600  # seconds
+ROBOTS_CACHE_ERROR_TTL = 600  # seconds; unreachable / 5xx robots.txt
+ROBOTS_CACHE_MAX_ENTRIES = 2_000
+ROBOTS_TIMEOUT = 5  # seconds
+DNS_CACHE_TTL = 300  # seconds
+DNS_CACHE_NEGATIVE_TTL = 60  # seconds; NXDOMAIN answers
+DNS_CACHE_MAX_ENTRIES = 5_000
+
+# -- Browser pool (shared across phases and jobs) --
+BROWSER_POOL_SIZE = 2
+BROWSER_MAX_PAGES = 200  # recycle a browser after serving this many pages
+BROWSER_MAX_RSS_MB = 2048  # recycle when one browser's process tree exceeds this
+
+# -- Lean rendering profile (we only keep text, so skip what does not affect it) --
+BROWSER_LEAN = True
+BROWSER_VIEWPORT = (800, 600)  # width, height
+BROWSER_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BROWSER_BLOCK_STYLESHEETS = True  # text extraction does not depend on CSS
+BROWSER_BLOCKED_DOMAINS = {
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "analytics.twitter.com",
+    "static.ads-twitter.com",
+    "snap.licdn.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "fullstory.com",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "heap.io",
+    "hs-analytics.net",
+    "hs-scripts.com",
+    "js-agent.newrelic.com",
+    "nr-data.net",
+    "optimizely.com",
+    "cookielaw.org",
+    "onetrust.com",
+    "cookiebot.com",
+    "amazon-adsystem.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+}
+# Typical transfer sizes per block reason (HTTP Archive medians, rounded). An
+# aborted request is never downloaded, so bytes saved can only be estimated.
+BROWSER_BLOCKED_BYTES_ESTIMATE = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 30_000,
+    "stylesheet": 20_000,
+    "tracker": 25_000,
+}
+
 # -- Wikipedia --
 WIKIPEDIA_MAX_RETRIES = 3
+WIKIPEDIA_VIA_API = True  # article HTML from action=parse, rendered in-process
+WIKIPEDIA_API_TIMEOUT = 15  # seconds
 WIKIPEDIA_RELATED_LIMIT = 4  # extra articles whose title contains the company name
 WIKIPEDIA_CSS_SELECTOR = "div#mw-content-text"
 WIKIPEDIA_EXCLUDED_SELECTOR = ".reflist, .navbox, .hatnote, .sidebar, .infobox"
@@ -39,6 +232,9 @@ DDG_SEARCH_QUERIES = [
     "{company} about company overview",
     "{company} company news products",
 ]
+DDG_MAX_WORKERS = 4  # queries (web + news) run in parallel threads
+DDG_CACHE_TTL = 6 * 3600  # seconds; query -> result URLs, in-process
+DDG_CACHE_MAX_ENTRIES = 512
 
 # -- URL filtering --
 SKIP_DOMAINS = {
@@ -67,3 +263,5 @@ PROBE_SUBDOMAINS = [
     "news",
 ]
 PROBE_TIMEOUT = 5  # seconds
+PROBE_DNS_TIMEOUT = 2  # seconds; unresolvable candidates skip the HTTP attempt
+PROBE_HEAD_FALLBACK_STATUSES = {403, 405, 501}  # HEAD refused => retry with GET
@@ -3,17 +3,18 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
+from functools import partial
+from typing import Any
 from urllib.parse import quote, urlparse
 
 import httpx
 import logfire
-from crawl4ai import (
-    AsyncWebCrawler,
-    BrowserConfig,
-    CacheMode,
-    CrawlerRunConfig,
-)
+from crawl4ai import CacheMode, CrawlerRunConfig
 from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
 from crawl4ai.deep_crawling.filters import ContentTypeFilter, FilterChain
@@ -21,46 +22,75 @@ from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 from duckduckgo_search import DDGS
 from duckduckgo_search.exceptions import DuckDuckGoSearchException
 
-from agent.scraper._compat import run_in_crawler_thread
-from agent.scraper.cleaner import clean_text, is_english
+from agent.scraper._compat import run_in_crawler_thread, stream_from_crawler_thread
+from agent.scraper.checkpoint import ScrapeCheckpoint
 from agent.scraper.config import (
     ABOUT_KEYWORDS,
     COMPANY_PAGES_MAX_DEPTH,
     COMPANY_PAGES_MAX_PAGES,
     COMPANY_PAGES_MAX_SEEDS,
+    DDG_CACHE_MAX_ENTRIES,
+    DDG_CACHE_TTL,
     DDG_MAX_RESULTS,
+    DDG_MAX_WORKERS,
     DDG_SEARCH_QUERIES,
-    DELAY_JITTER,
     EXCLUDED_TAGS,
-    MEAN_DELAY,
     PAGE_TIMEOUT_MS,
+    PROBE_DNS_TIMEOUT,
+    PROBE_HEAD_FALLBACK_STATUSES,
     PROBE_SUBDOMAINS,
     PROBE_TIMEOUT,
     SEARCH_BATCH_TIMEOUT,
+    SEARCH_CONCURRENCY,
+    SEARCH_CONCURRENT,
     SEARCH_MAX_URLS,
+    SEARCH_PER_HOST_CONCURRENCY,
     SEARCH_PER_URL_TIMEOUT,
+    SITEMAP_MIN_URLS,
     SKIP_DOMAINS,
+    WEBSITE_BEST_FIRST,
     WEBSITE_MAX_DEPTH,
     WEBSITE_MAX_PAGES,
     WIKIPEDIA_API,
+    WIKIPEDIA_API_TIMEOUT,
     WIKIPEDIA_CSS_SELECTOR,
     WIKIPEDIA_EXCLUDED_SELECTOR,
     WIKIPEDIA_MAX_RETRIES,
     WIKIPEDIA_RELATED_LIMIT,
     WIKIPEDIA_USER_AGENT,
+    WIKIPEDIA_VIA_API,
+)
+from agent.scraper.fetcher import (
+    PageResult,
+    TieredCrawler,
+    extract_fit_markdown,
+    render_html,
+)
+from agent.scraper.frontier import (
+    BestFirstDeepCrawlStrategy,
+    LeanBFSDeepCrawlStrategy,
+    SharedBFSDeepCrawlStrategy,
+    SharedCrawlState,
 )
 from agent.scraper.metrics import (
-    active_browsers,
-    page_content_size,
-    pages_dropped,
-    pages_scraped,
     scrape_errors,
 )
 from agent.scraper.models import RawDocument, SearchResults, SourceType, WikipediaResult
+from agent.scraper.netcache import cached_dns_transport, get_dns_cache
+from agent.scraper.politeness import paced_event_hooks, registered_domain
+from agent.scraper.postprocess import (
+    DocumentSink,
+    PageProcessor,
+    PageText,
+    process_page,
+    record_outcome,
+)
+from agent.scraper.sitemap import collect_sitemap_entries, select_sitemap_urls
 
 logger = logging.getLogger(__name__)
 
-BROWSER_CONFIG = BrowserConfig(headless=True)
+PageCallback = Callable[[Any], None]
+Emit = Callable[[PageResult], None]
 
 MARKDOWN_GENERATOR = DefaultMarkdownGenerator(
     options={"ignore_links": True},
@@ -72,35 +102,56 @@ _WIKIPEDIA_INFOBOX_URL_RE = re.compile(
 )
 
 
-def _extract_fit_markdown(result: object) -> str | None:
-    md = getattr(result, "markdown", None)
-    if md is None:
-        return None
-    if hasattr(md, "fit_markdown") and md.fit_markdown:
-        return str(md.fit_markdown)
-    if isinstance(md, str):
-        return md
-    raw = getattr(md, "raw_markdown", None)
-    return str(raw) if raw else None
-
-
-def _build_bfs_config(max_depth: int, max_pages: int) -> CrawlerRunConfig:
-    return CrawlerRunConfig(
-        deep_crawl_strategy=BFSDeepCrawlStrategy(
+def _build_bfs_config(
+    max_depth: int,
+    max_pages: int,
+    shared: SharedCrawlState | None = None,
+    resume_state: dict[str, Any] | None = None,
+    on_state_change: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    best_first: bool = False,
+) -> CrawlerRunConfig:
+    filter_chain = FilterChain(
+        [ContentTypeFilter(allowed_types=["text/html"], check_extension=True)]
+    )
+    strategy: BFSDeepCrawlStrategy
+    if shared is not None:
+        strategy = SharedBFSDeepCrawlStrategy(
+            shared,
+            max_depth=max_depth,
+            include_external=False,
+            filter_chain=filter_chain,
+        )
+    else:
+        strategy_cls = (
+            BestFirstDeepCrawlStrategy if best_first else LeanBFSDeepCrawlStrategy
+        )
+        strategy = strategy_cls(
             max_depth=max_depth,
             max_pages=max_pages,
             include_external=False,
-            filter_chain=FilterChain(
-                [ContentTypeFilter(allowed_types=["text/html"], check_extension=True)]
-            ),
-        ),
+            filter_chain=filter_chain,
+            resume_state=resume_state,
+            on_state_change=on_state_change,
+        )
+    return CrawlerRunConfig(
+        deep_crawl_strategy=strategy,
+        scraping_strategy=LXMLWebScrapingStrategy(),
+        markdown_generator=MARKDOWN_GENERATOR,
+        excluded_tags=EXCLUDED_TAGS,
+        check_robots_txt=True,
+        page_timeout=PAGE_TIMEOUT_MS,
+        cache_mode=CacheMode.BYPASS,
+    )
+
+
+def _build_page_config() -> CrawlerRunConfig:
+    """Single-page fetch (no deep crawl), e.g. search results, sitemap pages."""
+    return CrawlerRunConfig(
         scraping_strategy=LXMLWebScrapingStrategy(),
         markdown_generator=MARKDOWN_GENERATOR,
         excluded_tags=EXCLUDED_TAGS,
         check_robots_txt=True,
         page_timeout=PAGE_TIMEOUT_MS,
-        mean_delay=MEAN_DELAY,
-        max_range=DELAY_JITTER,
         cache_mode=CacheMode.BYPASS,
     )
 
@@ -121,21 +172,22 @@ def _build_wikipedia_config() -> CrawlerRunConfig:
 # --- Raw browser operations (run in crawler thread) ---
 
 
-async def _crawl_pages(url: str, config: CrawlerRunConfig) -> list[object]:
-    active_browsers.add(1)
-    try:
-        async with AsyncWebCrawler(config=BROWSER_CONFIG) as crawler:
-            results = await crawler.arun(url=url, config=config)
-            return results if isinstance(results, list) else [results]
-    finally:
-        active_browsers.add(-1)
+async def _crawl_pages(
+    url: str,
+    config: CrawlerRunConfig,
+    emit: Emit,
+    on_page: PageCallback | None = None,
+) -> None:
+    """Deep-crawl from `url`, emitting each page (slimmed) as it is fetched."""
+    async with TieredCrawler(on_page, emit) as crawler:
+        await crawler.arun(url=url, config=config)
 
 
 async def _crawl_single_with_retry(
     url: str,
     config: CrawlerRunConfig,
     max_retries: int = WIKIPEDIA_MAX_RETRIES,
-    crawler: AsyncWebCrawler | None = None,
+    crawler: TieredCrawler | None = None,
 ) -> object:
     delay = 1.0
     last_result = None
@@ -144,7 +196,7 @@ async def _crawl_single_with_retry(
             if crawler is not None:
                 result = await crawler.arun(url=url, config=config)
             else:
-                async with AsyncWebCrawler(config=BROWSER_CONFIG) as c:
+                async with TieredCrawler() as c:
                     result = await c.arun(url=url, config=config)
             if getattr(result, "success", False):
                 return result
@@ -164,46 +216,106 @@ async def _crawl_single_with_retry(
 
 
 async def _crawl_urls_sequentially(
-    urls: list[str], config: CrawlerRunConfig
+    urls: list[str],
+    config: CrawlerRunConfig,
+    on_page: PageCallback | None = None,
+    limit: int = SEARCH_MAX_URLS,
 ) -> list[tuple[str, object]]:
     results: list[tuple[str, object]] = []
-    active_browsers.add(1)
-    try:
-        async with AsyncWebCrawler(config=BROWSER_CONFIG) as crawler:
-            for url in urls[:SEARCH_MAX_URLS]:
+    async with TieredCrawler(on_page) as crawler:
+        for url in urls[:limit]:
+            try:
+                result = await asyncio.wait_for(
+                    crawler.arun(url=url, config=config),
+                    timeout=SEARCH_PER_URL_TIMEOUT,
+                )
+                results.append((url, result))
+            except TimeoutError:
+                logger.warning("Timeout scraping %s, skipping", url)
+    return results
+
+
+async def _crawl_urls_concurrently(
+    urls: list[str],
+    config: CrawlerRunConfig,
+    batch_timeout: float,
+    on_page: PageCallback | None = None,
+    limit: int = SEARCH_MAX_URLS,
+) -> list[tuple[str, object]]:
+    """Fetch URLs in parallel (tabs when a browser is needed), one per host.
+
+    Returns whatever finished before `batch_timeout`; unfinished URLs are
+    cancelled rather than discarding the whole batch.
+    """
+    targets = urls[:limit]
+    finished: dict[str, object] = {}
+    tabs = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    host_slots: dict[str, asyncio.Semaphore] = {}
+
+    async with TieredCrawler(on_page) as crawler:
+
+        async def fetch(url: str) -> None:
+            host = urlparse(url).netloc.lower()
+            host_slot = host_slots.setdefault(
+                host, asyncio.Semaphore(SEARCH_PER_HOST_CONCURRENCY)
+            )
+            async with host_slot, tabs:
                 try:
-                    result = await asyncio.wait_for(
+                    finished[url] = await asyncio.wait_for(
                         crawler.arun(url=url, config=config),
                         timeout=SEARCH_PER_URL_TIMEOUT,
                     )
-                    results.append((url, result))
                 except TimeoutError:
                     logger.warning("Timeout scraping %s, skipping", url)
-                await asyncio.sleep(MEAN_DELAY)
-    finally:
-        active_browsers.add(-1)
-    return results
+                except Exception:
+                    logger.exception("Scrape crashed for %s", url)
+
+        tasks = [asyncio.create_task(fetch(url)) for url in targets]
+        _, pending = await asyncio.wait(tasks, timeout=batch_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if pending:
+            logger.warning(
+                "Search batch deadline hit, %d of %d URLs unfinished",
+                len(pending),
+                len(targets),
+            )
+
+    return [(url, finished[url]) for url in targets if url in finished]
 
 
 async def _crawl_pages_batch(
-    urls: list[str], config: CrawlerRunConfig
-) -> list[tuple[str, list[object]]]:
-    """Open one browser, BFS-crawl each seed URL sequentially."""
-    results: list[tuple[str, list[object]]] = []
-    active_browsers.add(1)
-    try:
-        async with AsyncWebCrawler(config=BROWSER_CONFIG) as crawler:
-            for url in urls:
-                try:
-                    items = await crawler.arun(url=url, config=config)
-                    items = items if isinstance(items, list) else [items]
-                    results.append((url, items))
-                except Exception:
-                    logger.exception("BFS crawl failed for %s", url)
-                    results.append((url, []))
-    finally:
-        active_browsers.add(-1)
-    return results
+    urls: list[str],
+    max_depth: int,
+    max_pages: int,
+    seen: set[str],
+    emit: Emit,
+    pages_crawled: int = 0,
+    on_page: PageCallback | None = None,
+) -> None:
+    """BFS-crawl all seed URLs concurrently through one tiered crawler.
+
+    Seeds share one visited set (pre-filled with `seen`) and one page budget
+    (minus `pages_crawled` already spent before a resume), so the phase takes
+    about as long as the slowest seed. Pages are emitted (slimmed) as fetched.
+    """
+    shared = SharedCrawlState(
+        max_pages=max_pages, visited=seen | set(urls), pages_crawled=pages_crawled
+    )
+    configs = [_build_bfs_config(max_depth, max_pages, shared) for _ in urls]
+
+    async with TieredCrawler(on_page, emit) as crawler:
+
+        async def crawl_seed(url: str, config: CrawlerRunConfig) -> None:
+            try:
+                await crawler.arun(url=url, config=config)
+            except Exception:
+                logger.exception("BFS crawl failed for %s", url)
+
+        await asyncio.gather(
+            *(crawl_seed(url, cfg) for url, cfg in zip(urls, configs, strict=True))
+        )
 
 
 async def _scrape_wiki_batch(
@@ -212,19 +324,13 @@ async def _scrape_wiki_batch(
     config: CrawlerRunConfig,
     now: datetime,
 ) -> list[RawDocument | None]:
-    """Scrape multiple Wikipedia pages reusing one browser."""
-    active_browsers.add(1)
-    try:
-        async with AsyncWebCrawler(config=BROWSER_CONFIG) as crawler:
-            results: list[RawDocument | None] = []
-            for title in titles:
-                doc = await _scrape_wiki_page(
-                    title, company, config, now, crawler=crawler
-                )
-                results.append(doc)
-            return results
-    finally:
-        active_browsers.add(-1)
+    """Scrape multiple Wikipedia pages reusing one tiered crawler."""
+    async with TieredCrawler() as crawler:
+        results: list[RawDocument | None] = []
+        for title in titles:
+            doc = await _scrape_wiki_page(title, company, config, now, crawler=crawler)
+            results.append(doc)
+        return results
 
 
 # --- Public functions (OTel spans + processing on main loop) ---
@@ -237,67 +343,83 @@ def _process_crawl_result(
     company: str,
     now: datetime,
 ) -> RawDocument | None:
-    attrs = {"source_type": source_type, "company": company}
-    raw_md = _extract_fit_markdown(result)
-    if not raw_md:
-        logger.debug("No markdown for %s", url)
-        pages_dropped.add(1, {**attrs, "reason": "no_markdown"})
-        return None
+    """Process one result in the calling thread (Wikipedia, on the crawler loop)."""
+    page = _page_text(result, url)
+    outcome = process_page(page, source_type, company, now)
+    record_outcome(page, outcome, source_type, company)
+    return outcome.document
 
-    cleaned = clean_text(raw_md)
-    if cleaned is None:
-        logger.debug("Content too short for %s (%d raw chars)", url, len(raw_md))
-        pages_dropped.add(1, {**attrs, "reason": "too_short"})
-        return None
 
-    if not is_english(cleaned):
-        logger.debug("Non-English content for %s", url)
-        pages_dropped.add(1, {**attrs, "reason": "not_english"})
-        return None
+def _page_text(result: object, url: str) -> PageText:
+    meta = getattr(result, "metadata", None)
+    title = meta.get("title", "") if isinstance(meta, dict) else ""
+    return PageText(url, title or "", extract_fit_markdown(result))
 
-    pages_scraped.add(1, attrs)
-    page_content_size.record(len(cleaned), attrs)
 
-    title = ""
-    meta = getattr(result, "metadata", None)
-    if isinstance(meta, dict):
-        title = meta.get("title", "")
-    if not title:
-        title = url
-
-    return RawDocument(
-        url=url,
-        title=title,
-        content=cleaned,
-        source_type=source_type,
-        company=company,
-        scraped_at=now,
-    )
+def _with_stored(
+    stored: list[PageResult], items: list[tuple[str, object]]
+) -> list[tuple[str, object]]:
+    """Checkpointed pages first, then fresh results for URLs not yet stored."""
+    done = {page.url for page in stored}
+    return [(page.url, page) for page in stored] + [
+        (url, result) for url, result in items if url not in done
+    ]
 
 
-async def scrape_website(url: str, company: str) -> tuple[list[RawDocument], list[str]]:
+async def scrape_website(
+    url: str,
+    company: str,
+    checkpoint: ScrapeCheckpoint | None = None,
+    on_document: DocumentSink | None = None,
+) -> tuple[list[RawDocument], list[str]]:
+    """BFS-crawl the company website from its homepage.
+
+    With a `checkpoint`, fetched pages and the BFS frontier are persisted as
+    the crawl goes, and a resumed crawl continues from the saved frontier.
+    With `on_document`, each document is also passed to it once cleaned.
+    """
     documents: list[RawDocument] = []
     errors: list[str] = []
     now = datetime.now(UTC)
+    processor = PageProcessor("website", company, now, on_document)
+    stored = checkpoint.stored_results("website") if checkpoint else []
 
     with logfire.span("scrape_website {company}", company=company, url=url) as span:
+        span.set_attribute("pages_resumed", len(stored))
         try:
-            config = _build_bfs_config(WEBSITE_MAX_DEPTH, WEBSITE_MAX_PAGES)
-            items = await run_in_crawler_thread(lambda: _crawl_pages(url, config))
+            config = _build_bfs_config(
+                WEBSITE_MAX_DEPTH,
+                WEBSITE_MAX_PAGES,
+                resume_state=checkpoint.bfs_state("website") if checkpoint else None,
+                on_state_change=checkpoint.bfs_state_saver("website")
+                if checkpoint
+                else None,
+                best_first=WEBSITE_BEST_FIRST,
+            )
+            on_page = checkpoint.page_recorder("website") if checkpoint else None
+            done = {page.url for page in stored}
+            fetched = 0
 
-            for result in items:
-                page_url = getattr(result, "url", url)
-                if not getattr(result, "success", False):
-                    err_msg = getattr(result, "error_message", "Unknown error")
-                    errors.append(f"{page_url}: {err_msg}")
+            def process(result: PageResult) -> None:
+                if not result.success:
+                    errors.append(f"{result.url}: {result.error_message}")
                     scrape_errors.add(
                         1, {"error_type": "crawl_error", "phase": "website_bfs"}
                     )
-                    continue
-
-                doc = _process_crawl_result(result, page_url, "website", company, now)
-                if doc:
-                    documents.append(doc)
+                    return
+                processor.add(_page_text(result, result.url))
+
+            for page in stored:
+                process(page)
+            # pages arrive as they are fetched and are processed while the
+            # crawl goes on; only the slim record crosses threads
+            async for result in stream_from_crawler_thread(
+                partial(_crawl_pages, url, config, on_page=on_page)
+            ):
+                fetched += 1
+                if result.url not in done:
+                    process(result)
+            span.set_attribute("pages_fetched", fetched)
         except asyncio.CancelledError:
             logger.warning("Website scrape cancelled for %s", url)
             errors.append(f"Website scrape cancelled for {url}")
@@ -307,6 +429,90 @@ async def scrape_website(url: str, company: str) -> tuple[list[RawDocument], lis
             errors.append(f"Website scrape failed for {url}")
             scrape_errors.add(1, {"error_type": "unknown", "phase": "website_bfs"})
 
+        documents = await processor.finish()
+        span.set_attribute("pages_scraped", len(documents))
+        span.set_attribute("error_count", len(errors))
+
+    return documents, errors
+
+
+async def discover_sitemap_urls(homepage_url: str) -> list[str]:
+    """Best sitemap-listed pages for the website phase ([] when there are none)."""
+    with logfire.span("discover_sitemap_urls", url=homepage_url) as span:
+        try:
+            entries = await run_in_crawler_thread(
+                lambda: collect_sitemap_entries(homepage_url)
+            )
+        except Exception:
+            logger.exception("Sitemap discovery failed for %s", homepage_url)
+            return []
+        urls = select_sitemap_urls(homepage_url, entries, WEBSITE_MAX_PAGES)
+        span.set_attribute("entries", len(entries))
+        span.set_attribute("selected", len(urls))
+        # the homepage is always selected; only sitemap picks count
+        picked = sum(1 for u in urls if u != homepage_url)
+        return urls if picked >= SITEMAP_MIN_URLS else []
+
+
+async def scrape_sitemap_pages(
+    urls: list[str],
+    company: str,
+    checkpoint: ScrapeCheckpoint | None = None,
+    on_document: DocumentSink | None = None,
+) -> tuple[list[RawDocument], list[str]]:
+    """Fetch sitemap-selected website pages in one flat concurrent batch.
+
+    Replaces the website deep crawl when the sitemap already names the pages
+    worth having, so no navigation pages are rendered just to find links.
+    """
+    documents: list[RawDocument] = []
+    errors: list[str] = []
+    now = datetime.now(UTC)
+    processor = PageProcessor("website", company, now, on_document)
+    stored = checkpoint.stored_results("website") if checkpoint else []
+    on_page = checkpoint.page_recorder("website") if checkpoint else None
+    done = {page.url for page in stored}
+    pending = [u for u in urls if u not in done]
+
+    with logfire.span(
+        "scrape_sitemap_pages {company}", company=company, url_count=len(urls)
+    ) as span:
+        config = _build_page_config()
+        try:
+            crawl_results = (
+                await run_in_crawler_thread(
+                    lambda: _crawl_urls_concurrently(
+                        pending,
+                        config,
+                        SEARCH_BATCH_TIMEOUT,
+                        on_page,
+                        limit=WEBSITE_MAX_PAGES,
+                    )
+                )
+                if pending
+                else []
+            )
+            for url, result in _with_stored(stored, crawl_results):
+                if not getattr(result, "success", False):
+                    err = getattr(result, "error_message", "Unknown")
+                    errors.append(f"{url}: {err}")
+                    scrape_errors.add(
+                        1, {"error_type": "crawl_error", "phase": "website_sitemap"}
+                    )
+                    continue
+                processor.add(_page_text(result, url))
+        except asyncio.CancelledError:
+            logger.warning("Sitemap page scrape cancelled for %s", company)
+            errors.append(f"Sitemap page scrape cancelled for {company}")
+            scrape_errors.add(
+                1, {"error_type": "cancelled", "phase": "website_sitemap"}
+            )
+        except Exception:
+            logger.exception("Sitemap page scrape failed for %s", company)
+            errors.append(f"Sitemap page scrape failed for {company}")
+            scrape_errors.add(1, {"error_type": "unknown", "phase": "website_sitemap"})
+
+        documents = await processor.finish()
         span.set_attribute("pages_scraped", len(documents))
         span.set_attribute("error_count", len(errors))
 
@@ -317,12 +523,20 @@ async def scrape_company_pages(
     urls: list[str],
     company: str,
     seen_urls: set[str] | None = None,
+    checkpoint: ScrapeCheckpoint | None = None,
+    on_document: DocumentSink | None = None,
 ) -> tuple[list[RawDocument], list[str]]:
-    """Shallow BFS crawl of company pages (about, newsroom, blog)."""
+    """Shallow BFS crawl of company pages (about, newsroom, blog).
+
+    With a `checkpoint`, pages fetched before an interruption are reused and
+    count against the page budget; only the rest is crawled again.
+    """
     documents: list[RawDocument] = []
     errors: list[str] = []
     now = datetime.now(UTC)
+    processor = PageProcessor("website", company, now, on_document)
     seen = seen_urls if seen_urls is not None else set()
+    stored = checkpoint.stored_results("company_pages") if checkpoint else []
 
     if not urls:
         return documents, errors
@@ -343,30 +557,37 @@ async def scrape_company_pages(
         company=company,
         url_count=len(seed_urls),
     ) as span:
-        config = _build_bfs_config(COMPANY_PAGES_MAX_DEPTH, COMPANY_PAGES_MAX_PAGES)
+        budget = COMPANY_PAGES_MAX_PAGES * len(seed_urls)
+        already_seen = seen | {page.url for page in stored}
+        on_page = checkpoint.page_recorder("company_pages") if checkpoint else None
+
+        def process(result: PageResult) -> None:
+            if result.url in seen:
+                return
+            seen.add(result.url)
+            if not result.success:
+                errors.append(f"{result.url}: {result.error_message or 'Unknown'}")
+                scrape_errors.add(
+                    1, {"error_type": "crawl_error", "phase": "company_pages"}
+                )
+                return
+            processor.add(_page_text(result, result.url))
+
         try:
-            batch_results = await run_in_crawler_thread(
-                lambda: _crawl_pages_batch(seed_urls, config)
-            )
-            for _seed_url, items in batch_results:
-                for result in items:
-                    page_url = getattr(result, "url", _seed_url)
-                    if page_url in seen:
-                        continue
-                    seen.add(page_url)
-                    if not getattr(result, "success", False):
-                        err = getattr(result, "error_message", "Unknown")
-                        errors.append(f"{page_url}: {err}")
-                        scrape_errors.add(
-                            1,
-                            {"error_type": "crawl_error", "phase": "company_pages"},
-                        )
-                        continue
-                    doc = _process_crawl_result(
-                        result, page_url, "website", company, now
-                    )
-                    if doc:
-                        documents.append(doc)
+            for page in stored:
+                process(page)
+            async for result in stream_from_crawler_thread(
+                partial(
+                    _crawl_pages_batch,
+                    seed_urls,
+                    COMPANY_PAGES_MAX_DEPTH,
+                    budget,
+                    already_seen,
+                    pages_crawled=len(stored),
+                    on_page=on_page,
+                )
+            ):
+                process(result)
         except asyncio.CancelledError:
             logger.warning("Company page crawl cancelled for %s", company)
             errors.append(f"Company page crawl cancelled for {company}")
@@ -376,13 +597,16 @@ async def scrape_company_pages(
             errors.append(f"Company page crawl failed for {company}")
             scrape_errors.add(1, {"error_type": "unknown", "phase": "company_pages"})
 
+        documents = await processor.finish()
         span.set_attribute("pages_scraped", len(documents))
         span.set_attribute("error_count", len(errors))
 
     return documents, errors
 
 
-async def _wikipedia_search(company: str) -> tuple[str | None, list[str]]:
+async def _wikipedia_search(
+    client: httpx.AsyncClient, company: str
+) -> tuple[str | None, list[str]]:
     """Return (primary_title, related_titles) from Wikipedia search."""
     params: dict[str, str | int] = {
         "action": "query",
@@ -391,10 +615,9 @@ async def _wikipedia_search(company: str) -> tuple[str | None, list[str]]:
         "format": "json",
         "srlimit": 5,
     }
-    async with httpx.AsyncClient(timeout=15, headers=_WIKIPEDIA_HEADERS) as client:
-        resp = await client.get(WIKIPEDIA_API, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+    resp = await client.get(WIKIPEDIA_API, params=params)
+    resp.raise_for_status()
+    data = resp.json()
 
     results = data.get("query", {}).get("search", [])
     if not results:
@@ -424,20 +647,28 @@ async def _wikipedia_search(company: str) -> tuple[str | None, list[str]]:
     return primary, related
 
 
-async def _wikipedia_official_url(title: str) -> str | None:
+async def _wikipedia_parse(
+    client: httpx.AsyncClient, title: str, section: int | None = None
+) -> str:
+    """Rendered article HTML (the contents of div#mw-content-text)."""
     params: dict[str, str | int] = {
         "action": "parse",
         "page": title,
         "prop": "text",
-        "section": 0,
+        "redirects": 1,
+        "disableeditsection": 1,
+        "disablelimitreport": 1,
         "format": "json",
     }
-    async with httpx.AsyncClient(timeout=15, headers=_WIKIPEDIA_HEADERS) as client:
-        resp = await client.get(WIKIPEDIA_API, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+    if section is not None:
+        params["section"] = section
+    resp = await client.get(WIKIPEDIA_API, params=params)
+    resp.raise_for_status()
+    data = resp.json()
+    return str(data.get("parse", {}).get("text", {}).get("*", ""))
 
-    html = data.get("parse", {}).get("text", {}).get("*", "")
+
+def _infobox_official_url(html: str) -> str | None:
     match = _WIKIPEDIA_INFOBOX_URL_RE.search(html)
     if match:
         url = match.group(1)
@@ -447,15 +678,17 @@ async def _wikipedia_official_url(title: str) -> str | None:
     return None
 
 
+async def _wikipedia_official_url(client: httpx.AsyncClient, title: str) -> str | None:
+    return _infobox_official_url(await _wikipedia_parse(client, title, section=0))
+
+
 def _is_social_or_wiki(url: str) -> bool:
     domain = urlparse(url).netloc.lower()
     return any(skip in domain for skip in SKIP_DOMAINS)
 
 
 def _extract_root_domain(url: str) -> str:
-    host = urlparse(url).netloc.lower()
-    parts = host.split(".")
-    return ".".join(parts[-2:]) if len(parts) >= 2 else host
+    return registered_domain(url)
 
 
 def _is_same_company(url: str, root_domain: str) -> bool:
@@ -467,21 +700,51 @@ def _is_homepage(url: str, root_domain: str) -> bool:
     return _extract_root_domain(url) == root_domain and parsed.path.strip("/") == ""
 
 
-def _collect_urls(
-    ddgs: DDGS,
-    queries: list[str],
-    seen: set[str],
-    max_results: int,
-) -> list[str]:
+# (kind, query, max_results) -> (fetched_at, result URLs)
+_ddg_cache: dict[tuple[str, str, int], tuple[float, list[str]]] = {}
+_ddg_cache_lock = threading.Lock()
+
+
+def _ddg_query(kind: str, query: str, max_results: int) -> list[str] | None:
+    """Run one DDG text/news query, served from the TTL cache when possible.
+
+    Returns None on failure; failures are not cached.
+    """
+    key = (kind, query, max_results)
+    with _ddg_cache_lock:
+        hit = _ddg_cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < DDG_CACHE_TTL:
+        return hit[1]
+
+    # DDGS keeps per-session state; one instance per query keeps threads apart
+    ddgs = DDGS()
+    try:
+        if kind == "news":
+            urls = [str(r["url"]) for r in ddgs.news(query, max_results=max_results)]
+        else:
+            urls = [str(r["href"]) for r in ddgs.text(query, max_results=max_results)]
+    except DuckDuckGoSearchException:
+        logger.warning("DDG %s search failed: %s", kind, query)
+        return None
+
+    now = time.monotonic()
+    with _ddg_cache_lock:
+        if len(_ddg_cache) >= DDG_CACHE_MAX_ENTRIES:
+            for k in [
+                k for k, (t, _) in _ddg_cache.items() if now - t >= DDG_CACHE_TTL
+            ]:
+                del _ddg_cache[k]
+            if len(_ddg_cache) >= DDG_CACHE_MAX_ENTRIES:
+                del _ddg_cache[next(iter(_ddg_cache))]
+        _ddg_cache[key] = (now, urls)
+    return urls
+
+
+def _merge_urls(result_lists: list[list[str] | None], seen: set[str]) -> list[str]:
+    """Dedupe query results in query order, so the merge is deterministic."""
     urls: list[str] = []
-    for query in queries:
-        try:
-            results = ddgs.text(query, max_results=max_results)
-        except DuckDuckGoSearchException:
-            logger.warning("DDG search failed: %s", query)
-            continue
-        for r in results:
-            url = str(r["href"])
+    for results in result_lists:
+        for url in results or []:
             if url in seen or _is_social_or_wiki(url):
                 continue
             seen.add(url)
@@ -489,43 +752,61 @@ def _collect_urls(
     return urls
 
 
-def _collect_news(
-    ddgs: DDGS, company: str, seen: set[str], max_results: int
-) -> list[str]:
-    urls: list[str] = []
+async def _resolves(host: str) -> bool:
     try:
-        results = ddgs.news(f"{company} company", max_results=max_results)
-    except DuckDuckGoSearchException:
-        logger.warning("DDG news search failed for %s", company)
-        return urls
-    for r in results:
-        url = str(r["url"])
-        if url in seen or _is_social_or_wiki(url):
-            continue
-        seen.add(url)
-        urls.append(url)
-    return urls
+        addrs = await asyncio.wait_for(
+            get_dns_cache().resolve(host), timeout=PROBE_DNS_TIMEOUT
+        )
+    except TimeoutError:
+        return False
+    return bool(addrs)
+
+
+async def _probe_url(client: httpx.AsyncClient, url: str) -> str | None:
+    """HEAD the URL, falling back to a streamed GET when HEAD is refused."""
+    try:
+        resp = await client.head(url)
+        if resp.status_code < 400:
+            return str(resp.url)
+        if resp.status_code not in PROBE_HEAD_FALLBACK_STATUSES:
+            return None
+    except (httpx.ConnectError, httpx.ConnectTimeout):
+        return None
+    except Exception:
+        pass
+    try:
+        async with client.stream("GET", url) as resp:
+            if resp.status_code < 400:
+                return str(resp.url)
+    except Exception:
+        pass
+    return None
 
 
 async def probe_company_subdomains(homepage_url: str) -> list[str]:
-    """Probe common company subdomains to discover pages DDG misses."""
+    """Probe common company subdomains to discover pages DDG misses.
+
+    Candidates are resolved first so NXDOMAIN hosts never cost an HTTP attempt;
+    the rest are probed concurrently, paced by the politeness scheduler since
+    they all share the company's registered domain.
+    """
     root = _extract_root_domain(homepage_url)
-    candidates = [f"https://{sub}.{root}" for sub in PROBE_SUBDOMAINS]
+    hosts = [f"{sub}.{root}" for sub in PROBE_SUBDOMAINS]
+    resolved = await asyncio.gather(*(_resolves(h) for h in hosts))
+    candidates = [f"https://{h}" for h, ok in zip(hosts, resolved, strict=True) if ok]
 
     found: list[str] = []
     with logfire.suppress_instrumentation():
         async with httpx.AsyncClient(
-            timeout=PROBE_TIMEOUT, follow_redirects=True, verify=False
+            timeout=PROBE_TIMEOUT,
+            follow_redirects=True,
+            transport=cached_dns_transport(verify=False),
+            event_hooks=paced_event_hooks(),
         ) as client:
-            for url in candidates:
-                try:
-                    async with client.stream("GET", url) as resp:
-                        if resp.status_code < 400:
-                            resolved = str(resp.url)
-                            if _extract_root_domain(resolved) == root:
-                                found.append(resolved)
-                except Exception:
-                    pass
+            results = await asyncio.gather(*(_probe_url(client, u) for u in candidates))
+    for final_url in results:
+        if final_url and _extract_root_domain(final_url) == root:
+            found.append(final_url)
     if found:
         logger.info("Subdomain probe for %s found: %s", root, found)
     return found
@@ -536,14 +817,22 @@ def search_company(
     known_homepage: str | None = None,
     max_results: int = DDG_MAX_RESULTS,
 ) -> SearchResults:
-    """Multi-query DDG search + news. Classifies URLs by company domain."""
+    """Multi-query DDG search + news. Classifies URLs by company domain.
+
+    Queries run in parallel threads; results are merged in query order.
+    """
     with logfire.span("search_company {company}", company=company) as span:
         seen: set[str] = set()
-        ddgs = DDGS()
+        jobs = [("text", q.format(company=company)) for q in DDG_SEARCH_QUERIES]
+        jobs.append(("news", f"{company} company"))
 
-        queries = [q.format(company=company) for q in DDG_SEARCH_QUERIES]
-        web_urls = _collect_urls(ddgs, queries, seen, max_results)
-        news_urls = _collect_news(ddgs, company, seen, max_results)
+        with ThreadPoolExecutor(max_workers=DDG_MAX_WORKERS) as pool:
+            results = list(
+                pool.map(lambda job: _ddg_query(job[0], job[1], max_results), jobs)
+            )
+
+        web_urls = _merge_urls(results[:-1], seen)
+        news_urls = _merge_urls(results[-1:], seen)
         all_urls = web_urls + news_urls
 
         logger.info(
@@ -593,12 +882,26 @@ def search_company(
 
 
 async def scrape_search_results(
-    urls: list[str], company: str
+    urls: list[str],
+    company: str,
+    concurrent: bool = SEARCH_CONCURRENT,
+    checkpoint: ScrapeCheckpoint | None = None,
+    on_document: DocumentSink | None = None,
 ) -> tuple[list[RawDocument], list[str]]:
-    """Scrape individual search result pages (no deep crawl)."""
+    """Scrape individual search result pages (no deep crawl).
+
+    In concurrent mode pages load in parallel tabs (bounded globally and per
+    host) and a batch deadline keeps the pages that already finished. URLs
+    already in the `checkpoint` are taken from it instead of being fetched.
+    """
     documents: list[RawDocument] = []
     errors: list[str] = []
     now = datetime.now(UTC)
+    processor = PageProcessor("search", company, now, on_document)
+    stored = checkpoint.stored_results("search") if checkpoint else []
+    on_page = checkpoint.page_recorder("search") if checkpoint else None
+    done = {page.url for page in stored}
+    pending = [u for u in urls if u not in done]
 
     if not urls:
         return documents, errors
@@ -610,22 +913,26 @@ async def scrape_search_results(
         company=company,
         url_count=len(urls),
     ) as span:
-        config = CrawlerRunConfig(
-            scraping_strategy=LXMLWebScrapingStrategy(),
-            markdown_generator=MARKDOWN_GENERATOR,
-            excluded_tags=EXCLUDED_TAGS,
-            check_robots_txt=True,
-            page_timeout=PAGE_TIMEOUT_MS,
-            cache_mode=CacheMode.BYPASS,
-        )
+        config = _build_page_config()
 
         try:
-            crawl_results = await asyncio.wait_for(
-                run_in_crawler_thread(lambda: _crawl_urls_sequentially(urls, config)),
-                timeout=SEARCH_BATCH_TIMEOUT,
-            )
+            if not pending:
+                crawl_results = []
+            elif concurrent:
+                crawl_results = await run_in_crawler_thread(
+                    lambda: _crawl_urls_concurrently(
+                        pending, config, SEARCH_BATCH_TIMEOUT, on_page
+                    )
+                )
+            else:
+                crawl_results = await asyncio.wait_for(
+                    run_in_crawler_thread(
+                        lambda: _crawl_urls_sequentially(pending, config, on_page)
+                    ),
+                    timeout=SEARCH_BATCH_TIMEOUT,
+                )
 
-            for url, result in crawl_results:
+            for url, result in _with_stored(stored, crawl_results):
                 if not getattr(result, "success", False):
                     err = getattr(result, "error_message", "Unknown")
                     logger.warning("Scrape failed %s: %s", url, err)
@@ -635,11 +942,7 @@ async def scrape_search_results(
                     )
                     continue
 
-                doc = _process_crawl_result(result, url, "search", company, now)
-                if doc:
-                    documents.append(doc)
-                else:
-                    logger.info("No usable content from %s", url)
+                processor.add(_page_text(result, url))
         except (TimeoutError, asyncio.CancelledError):
             logger.warning("Search results scrape timed out for %s", company)
             errors.append(f"Search results scrape timed out for {company}")
@@ -649,6 +952,7 @@ async def scrape_search_results(
             errors.append(f"Search results scrape failed for {company}")
             scrape_errors.add(1, {"error_type": "unknown", "phase": "search_results"})
 
+        documents = await processor.finish()
         span.set_attribute("pages_scraped", len(documents))
         span.set_attribute("error_count", len(errors))
 
@@ -660,9 +964,9 @@ async def _scrape_wiki_page(
     company: str,
     config: CrawlerRunConfig,
     now: datetime,
-    crawler: AsyncWebCrawler | None = None,
+    crawler: TieredCrawler | None = None,
 ) -> RawDocument | None:
-    wiki_url = f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+    wiki_url = _wiki_url(title)
     try:
         if crawler is not None:
             result = await _crawl_single_with_retry(wiki_url, config, crawler=crawler)
@@ -685,9 +989,100 @@ async def _scrape_wiki_page(
         return None
 
 
+def _wiki_url(title: str) -> str:
+    return f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+
+
+async def _fetch_wiki_article(
+    client: httpx.AsyncClient, title: str
+) -> tuple[str, str] | None:
+    """(title, html) for one article via action=parse, retried with backoff."""
+    delay = 2.0
+    for attempt in range(WIKIPEDIA_MAX_RETRIES):
+        try:
+            return title, await _wikipedia_parse(client, title)
+        except httpx.HTTPError:
+            logger.warning(
+                "Wikipedia parse failed for %s (attempt %d/%d)",
+                title,
+                attempt + 1,
+                WIKIPEDIA_MAX_RETRIES,
+            )
+        if attempt < WIKIPEDIA_MAX_RETRIES - 1:
+            await asyncio.sleep(delay)
+            delay *= 2
+    return None
+
+
+def _render_wiki_article(
+    title: str,
+    html: str,
+    company: str,
+    config: CrawlerRunConfig,
+    now: datetime,
+) -> RawDocument | None:
+    # Wrap the fragment so config.css_selector selects it like on the live page
+    page = f'<html><body><div id="mw-content-text">{html}</div></body></html>'
+    url = _wiki_url(title)
+    doc = _process_crawl_result(
+        render_html(url, page, config), url, "wikipedia", company, now
+    )
+    if doc:
+        doc.title = title
+    return doc
+
+
+async def _scrape_wiki_articles_via_api(
+    client: httpx.AsyncClient,
+    titles: list[str],
+    company: str,
+    config: CrawlerRunConfig,
+    now: datetime,
+) -> tuple[list[RawDocument | None], str | None]:
+    """Fetch all articles concurrently on one client and render them in-process.
+
+    Returns the documents in title order and the infobox URL of the first
+    (primary) article, so no separate infobox request is needed.
+    """
+    fetched = await asyncio.gather(
+        *(_fetch_wiki_article(client, title) for title in titles)
+    )
+
+    docs: list[RawDocument | None] = []
+    for title, article in zip(titles, fetched, strict=True):
+        if article is None:
+            scrape_errors.add(1, {"error_type": "api_error", "phase": "wikipedia"})
+            docs.append(None)
+            continue
+        try:
+            docs.append(
+                await asyncio.to_thread(
+                    _render_wiki_article, title, article[1], company, config, now
+                )
+            )
+        except Exception:
+            logger.exception("Wikipedia render failed for %s", title)
+            scrape_errors.add(1, {"error_type": "unknown", "phase": "wikipedia"})
+            docs.append(None)
+
+    primary = fetched[0] if fetched else None
+    official_url = _infobox_official_url(primary[1]) if primary else None
+    return docs, official_url
+
+
 async def scrape_wikipedia(company: str) -> WikipediaResult:
+    async with httpx.AsyncClient(
+        timeout=WIKIPEDIA_API_TIMEOUT,
+        headers=_WIKIPEDIA_HEADERS,
+        transport=cached_dns_transport(),
+        event_hooks=paced_event_hooks(),
+    ) as client:
+        return await _scrape_wikipedia(client, company)
+
+
+async def _scrape_wikipedia(client: httpx.AsyncClient, company: str) -> WikipediaResult:
     with logfire.span("scrape_wikipedia {company}", company=company) as span:
-        primary_title, related_titles = await _wikipedia_search(company)
+        primary_title, related_titles = await _wikipedia_search(client, company)
         if primary_title is None:
             logger.info("No Wikipedia article found for %s", company)
             span.set_attribute("found", False)
@@ -697,23 +1092,29 @@ async def scrape_wikipedia(company: str) -> WikipediaResult:
         if related_titles:
             span.set_attribute("related_titles", related_titles)
 
+        now = datetime.now(UTC)
+        config = _build_wikipedia_config()
+        all_titles = [primary_title, *related_titles]
+
         official_url: str | None = None
-        try:
-            official_url = await _wikipedia_official_url(primary_title)
-        except Exception:
-            logger.exception("Failed to extract official URL from Wikipedia infobox")
+        if WIKIPEDIA_VIA_API:
+            all_docs, official_url = await _scrape_wiki_articles_via_api(
+                client, all_titles, company, config, now
+            )
+        else:
+            try:
+                official_url = await _wikipedia_official_url(client, primary_title)
+            except Exception:
+                logger.exception(
+                    "Failed to extract official URL from Wikipedia infobox"
+                )
+            all_docs = await run_in_crawler_thread(
+                lambda: _scrape_wiki_batch(all_titles, company, config, now)
+            )
 
         if official_url:
             span.set_attribute("official_website", official_url)
 
-        now = datetime.now(UTC)
-        config = _build_wikipedia_config()
-
-        all_titles = [primary_title, *related_titles]
-        all_docs = await run_in_crawler_thread(
-            lambda: _scrape_wiki_batch(all_titles, company, config, now)
-        )
-
         primary_doc = all_docs[0] if all_docs else None
         related_docs = [d for d in all_docs[1:] if d is not None]
 
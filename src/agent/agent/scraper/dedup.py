@@ -0,0 +1,95 @@
+"""Near-duplicate detection over cleaned page content (SimHash + LSH bands).
+
+Each document gets a 64-bit SimHash of its word shingles. Two documents are
+near duplicates when their fingerprints differ in at most
+NEAR_DUP_MAX_DISTANCE bits. The index splits fingerprints into
+NEAR_DUP_MAX_DISTANCE + 1 bands: by pigeonhole, any pair within that distance
+agrees exactly on at least one band, so lookups only compare against documents
+sharing a band instead of every document seen so far.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+from agent.scraper.config import NEAR_DUP_MAX_DISTANCE, NEAR_DUP_SHINGLE_WORDS
+from agent.scraper.metrics import pages_dropped
+from agent.scraper.models import RawDocument
+
+_WORD_RE = re.compile(r"\w+")
+_BITS = 64
+
+
+def simhash(text: str, shingle_words: int = NEAR_DUP_SHINGLE_WORDS) -> int:
+    """64-bit SimHash of the text's lower-cased word shingles."""
+    words = _WORD_RE.findall(text.lower())
+    shingles = {
+        " ".join(words[i : i + shingle_words])
+        for i in range(max(1, len(words) - shingle_words + 1))
+    }
+    digests = int.from_bytes(
+        b"".join(hashlib.blake2b(s.encode(), digest_size=8).digest() for s in shingles),
+        "big",
+    )
+    # bit 0 of every digest; shifted, it selects one bit column at a time
+    column = int.from_bytes(b"\0\0\0\0\0\0\0\1" * len(shingles), "big")
+    fingerprint = 0
+    for bit in range(_BITS):
+        # a bit is set when most shingles set it
+        if (digests & (column << bit)).bit_count() * 2 > len(shingles):
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class NearDuplicateIndex:
+    """Fingerprints of the documents kept so far in one scrape job."""
+
+    def __init__(self, max_distance: int = NEAR_DUP_MAX_DISTANCE) -> None:
+        self.max_distance = max_distance
+        self._band_bits = _BITS // (max_distance + 1)
+        self._bands: list[dict[int, list[int]]] = [{} for _ in range(max_distance + 1)]
+        self._urls: dict[int, str] = {}
+
+    def _band_keys(self, fingerprint: int) -> list[int]:
+        mask = (1 << self._band_bits) - 1
+        return [
+            (fingerprint >> (i * self._band_bits)) & mask
+            for i in range(len(self._bands))
+        ]
+
+    def find(self, fingerprint: int) -> str | None:
+        """URL of a kept document within max_distance bits, if any."""
+        for band, key in zip(self._bands, self._band_keys(fingerprint), strict=True):
+            for other in band.get(key, ()):
+                if (fingerprint ^ other).bit_count() <= self.max_distance:
+                    return self._urls[other]
+        return None
+
+    def add(self, fingerprint: int, url: str) -> None:
+        self._urls.setdefault(fingerprint, url)
+        for band, key in zip(self._bands, self._band_keys(fingerprint), strict=True):
+            band.setdefault(key, []).append(fingerprint)
+
+    def filter(self, docs: list[RawDocument]) -> list[RawDocument]:
+        """Keep documents that do not nearly duplicate one already kept.
+
+        The first copy wins, so earlier phases (Wikipedia, the website) take
+        precedence over later ones (company pages, search results).
+        """
+        kept: list[RawDocument] = []
+        for doc in docs:
+            fingerprint = simhash(doc.content)
+            if self.find(fingerprint) is not None:
+                pages_dropped.add(
+                    1,
+                    {
+                        "source_type": doc.source_type,
+                        "company": doc.company,
+                        "reason": "near_duplicate",
+                    },
+                )
+                continue
+            self.add(fingerprint, doc.url)
+            kept.append(doc)
+        return kept
@@ -0,0 +1,425 @@
+"""Tiered page fetching: plain HTTP first, pooled headless browser as fallback.
+
+Most corporate, news and reference pages are server-rendered, so fetching them
+with httpx and running crawl4ai's LXML scraper and markdown generator
+in-process yields the same markdown as Playwright at a fraction of the cost.
+A page is handed to the browser only when the HTTP result looks JS-rendered;
+the tier that worked is remembered per host. Successful results are kept in
+the persistent page cache (page_cache.py) and revalidated with conditional GETs.
+Every network request, on either tier, is paced by the per-domain politeness
+scheduler (politeness.py).
+
+Everything here runs on the crawler loop (see _compat.py).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+import lxml.html
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+from crawl4ai.models import MarkdownGenerationResult
+
+from agent.scraper._compat import run_in_crawler_thread, stop_crawler_loop
+from agent.scraper.browser_pool import BROWSER_CONFIG, BrowserLease, get_browser_pool
+from agent.scraper.cleaner import clean_text
+from agent.scraper.config import (
+    HTTP_FIRST,
+    HTTP_MAX_BYTES,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MIN_TEXT_CHARS,
+    HTTP_PER_HOST_CONCURRENCY,
+    HTTP_SHELL_MAX_TEXT_CHARS,
+    HTTP_TIMEOUT,
+    POLITENESS_BACKOFF_STATUSES,
+)
+from agent.scraper.metrics import fetch_tier, page_cache_events
+from agent.scraper.netcache import (
+    cached_dns_transport,
+    get_robots_cache,
+    save_net_caches,
+)
+from agent.scraper.page_cache import (
+    CachedPage,
+    cache_key,
+    close_page_cache,
+    get_page_cache,
+)
+from agent.scraper.politeness import get_scheduler
+from agent.scraper.postprocess import shutdown_postprocess_pool
+
+logger = logging.getLogger(__name__)
+
+_NOSCRIPT_SHELL = re.compile(
+    r"<noscript[^>]*>[^<]{0,300}?\b(?:enable|requires?|turn on)\b[^<]{0,40}?javascript",
+    re.IGNORECASE,
+)
+
+_host_tiers: dict[str, HostTier] = {}
+_client: httpx.AsyncClient | None = None
+
+
+@dataclass
+class HostTier:
+    """Which tier produced usable content for a host so far."""
+
+    http_ok: int = 0
+    js_shells: int = 0
+
+    @property
+    def prefers_browser(self) -> bool:
+        return self.js_shells >= 2 and self.js_shells > self.http_ok
+
+
+@dataclass
+class PageResult:
+    """The subset of crawl4ai's CrawlResult that our pipeline reads."""
+
+    url: str
+    success: bool
+    markdown: Any = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    links: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    status_code: int | None = None
+    error_message: str = ""
+    response_headers: dict[str, str] = field(default_factory=dict)
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+            headers={
+                "User-Agent": BROWSER_CONFIG.user_agent,
+                "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+            transport=cached_dns_transport(
+                limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS)
+            ),
+        )
+    return _client
+
+
+def _select_css(html: str, css_selector: str) -> str:
+    """Mirror crawl4ai's browser-side css_selector: keep matching elements only."""
+    doc = lxml.html.fromstring(html)
+    parts = [
+        lxml.html.tostring(el, encoding="unicode")
+        for selector in css_selector.split(",")
+        for el in doc.cssselect(selector.strip())
+    ]
+    return "<div class='crawl4ai-result'>\n" + "\n".join(parts) + "\n</div>"
+
+
+def _from_cache(entry: CachedPage) -> PageResult:
+    return PageResult(
+        url=entry.url,
+        success=True,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=entry.markdown.get("raw_markdown", ""),
+            markdown_with_citations="",
+            references_markdown="",
+            fit_markdown=entry.markdown.get("fit_markdown") or None,
+        ),
+        metadata=entry.metadata,
+        links=entry.links,
+        status_code=entry.status_code,
+    )
+
+
+def extract_fit_markdown(result: object) -> str | None:
+    """Fit markdown of a crawl result, falling back to raw markdown."""
+    md = getattr(result, "markdown", None)
+    if md is None:
+        return None
+    if hasattr(md, "fit_markdown") and md.fit_markdown:
+        return str(md.fit_markdown)
+    if isinstance(md, str):
+        return md
+    raw = getattr(md, "raw_markdown", None)
+    return str(raw) if raw else None
+
+
+def slim_result(result: Any) -> PageResult:
+    """Reduce a crawl result to what the pipeline reads.
+
+    Drops raw/cleaned HTML and the markdown variants we never use; keeps links
+    for deep-crawl link discovery, which releases them afterwards.
+    """
+    meta = getattr(result, "metadata", None) or {}
+    return PageResult(
+        url=str(getattr(result, "url", "")),
+        success=bool(getattr(result, "success", False)),
+        markdown=extract_fit_markdown(result),
+        metadata={"title": str(meta.get("title") or "")},
+        links=getattr(result, "links", None) or {},
+        status_code=getattr(result, "status_code", None),
+        error_message=str(getattr(result, "error_message", "") or ""),
+    )
+
+
+def render_html(url: str, html: str, config: CrawlerRunConfig) -> PageResult:
+    """Run the configured scraping strategy and markdown generator in-process.
+
+    CPU-bound; call it via asyncio.to_thread from async code.
+    """
+    if config.css_selector:
+        html = _select_css(html, config.css_selector)
+    params = config.__dict__.copy()
+    params.pop("url", None)
+    scraped = config.scraping_strategy.scrap(url, html, **params)
+    markdown = config.markdown_generator.generate_markdown(
+        input_html=scraped.cleaned_html, base_url=url
+    )
+    return PageResult(
+        url=url,
+        success=True,
+        markdown=markdown,
+        metadata=dict(scraped.metadata or {}),
+        links=scraped.links.model_dump(),
+        status_code=200,
+    )
+
+
+def _looks_js_rendered(html: str, result: PageResult) -> bool:
+    cleaned = clean_text(str(result.markdown.raw_markdown or ""))
+    if cleaned is None or len(cleaned) < HTTP_MIN_TEXT_CHARS:
+        return True
+    return bool(
+        len(cleaned) < HTTP_SHELL_MAX_TEXT_CHARS and _NOSCRIPT_SHELL.search(html)
+    )
+
+
+async def _http_fetch(
+    url: str, config: CrawlerRunConfig, validators: dict[str, str] | None = None
+) -> tuple[PageResult | None, str]:
+    """Fetch over plain HTTP. Returns (None, reason) when the browser should try.
+
+    With `validators` (If-None-Match / If-Modified-Since) a 304 yields
+    (None, "not_modified") and the caller reuses its cached copy.
+    """
+    scheduler = get_scheduler()
+    await scheduler.acquire(url)
+    try:
+        async with _get_client().stream("GET", url, headers=validators) as resp:
+            scheduler.record(url, resp.status_code, resp.headers.get("retry-after"))
+            if resp.status_code in POLITENESS_BACKOFF_STATUSES:
+                # Throttled: a browser retry would only hit the host again
+                return PageResult(
+                    url=url,
+                    success=False,
+                    status_code=resp.status_code,
+                    error_message=f"HTTP {resp.status_code}",
+                ), "throttled"
+            if resp.status_code == 304 and validators:
+                return None, "not_modified"
+            if resp.status_code in (404, 410):
+                return PageResult(
+                    url=url,
+                    success=False,
+                    status_code=resp.status_code,
+                    error_message=f"HTTP {resp.status_code}",
+                ), "not_found"
+            if resp.status_code >= 400:
+                return None, "http_status"
+            if "html" not in resp.headers.get("content-type", "html"):
+                return None, "content_type"
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body += chunk
+                if len(body) > HTTP_MAX_BYTES:
+                    break
+            html = body.decode(resp.encoding or "utf-8", errors="replace")
+            headers = dict(resp.headers)
+    except httpx.HTTPError:
+        return None, "http_error"
+
+    try:
+        result = await asyncio.to_thread(render_html, url, html, config)
+    except Exception:
+        logger.debug("In-process render failed for %s", url, exc_info=True)
+        return None, "render_error"
+    if _looks_js_rendered(html, result):
+        return None, "js_shell"
+    result.response_headers = headers
+    return result, "ok"
+
+
+async def _robots_allows(url: str) -> bool:
+    allowed, crawl_delay = await get_robots_cache().check(url)
+    get_scheduler().set_crawl_delay(url, crawl_delay)
+    return allowed
+
+
+class TieredCrawler:
+    """Crawler facade: HTTP tier first, a lazily leased pooled browser second.
+
+    Implements the `arun` / `arun_many` subset that our helpers and crawl4ai's
+    deep-crawl strategies call, so BFS itself runs over plain HTTP and only
+    JS-rendered pages touch Chromium. `on_page` is called with every
+    successful single-page result (fetched or cached), e.g. to checkpoint it.
+
+    With `emit`, every single-page result is slimmed (`slim_result`) as soon as
+    it is fetched and passed to `emit` without its links. The caller gets it
+    back without markdown: deep-crawl strategies only need its links, so page
+    content is handed over once instead of living until the crawl ends.
+    """
+
+    def __init__(
+        self,
+        on_page: Callable[[Any], None] | None = None,
+        emit: Callable[[PageResult], None] | None = None,
+    ) -> None:
+        self._on_page = on_page
+        self._emit = emit
+        # deep-crawl strategies need not collect results: pages are emitted
+        self.streaming = emit is not None
+        self._lease_cm: Any = None
+        self._lease: BrowserLease | None = None
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> TieredCrawler:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._lease_cm is not None:
+            await self._lease_cm.__aexit__(*exc_info)
+            self._lease_cm = self._lease = None
+
+    async def _browser(self) -> BrowserLease:
+        async with self._lock:
+            if self._lease is None:
+                self._lease_cm = get_browser_pool().lease()
+                self._lease = await self._lease_cm.__aenter__()
+        assert self._lease is not None
+        return self._lease
+
+    async def arun(self, url: str, config: CrawlerRunConfig) -> Any:
+        if config.deep_crawl_strategy is not None:
+            return await config.deep_crawl_strategy.arun(
+                start_url=url, crawler=self, config=config
+            )
+        result = await self._fetch(url, config)
+        if self._emit is not None:
+            result = slim_result(result)
+            self._emit(replace(result, links={}, metadata=dict(result.metadata)))
+        if self._on_page is not None and getattr(result, "success", False):
+            self._on_page(result)
+        if self._emit is not None:
+            result.markdown = None  # emitted (and checkpointed) already
+        return result
+
+    async def _fetch(self, url: str, config: CrawlerRunConfig) -> Any:
+        cache = get_page_cache()
+        key = cache_key(url, config)
+        cached = cache.get(key) if cache is not None else None
+        if cache is not None and cached is None:
+            page_cache_events.add(1, {"event": "miss"})
+        elif cached is not None and cached.is_fresh:
+            page_cache_events.add(1, {"event": "fresh"})
+            return _from_cache(cached)
+        validators = cached.validators if cached is not None else {}
+
+        if config.check_robots_txt and not await _robots_allows(url):
+            fetch_tier.add(1, {"tier": "http", "reason": "robots"})
+            return PageResult(
+                url=url,
+                success=False,
+                status_code=403,
+                error_message="Access denied by robots.txt",
+            )
+
+        tier = _host_tiers.setdefault(urlparse(url).netloc.lower(), HostTier())
+        if not HTTP_FIRST and not validators:
+            reason = "disabled"
+        elif tier.prefers_browser and not validators:
+            reason = "remembered"
+        else:
+            # Stale entries are always revalidated over HTTP: a 304 skips the
+            # browser even on hosts that otherwise need one.
+            result, reason = await _http_fetch(url, config, validators)
+            if reason == "not_modified" and cache is not None and cached is not None:
+                cache.touch(key)
+                page_cache_events.add(1, {"event": "revalidated"})
+                return _from_cache(cached)
+            if cached is not None:
+                page_cache_events.add(1, {"event": "stale"})
+            if result is not None:
+                if result.success:
+                    tier.http_ok += 1
+                    if cache is not None:
+                        cache.put(key, url, result)
+                fetch_tier.add(1, {"tier": "http", "reason": reason})
+                return result
+
+        lease = await self._browser()
+        crawler: AsyncWebCrawler = lease.crawler
+        scheduler = get_scheduler()
+        await scheduler.acquire(url)
+        # robots.txt was already checked against the shared cache above; we
+        # only keep text, so never pay for screenshots, PDFs or MHTML
+        result = await crawler.arun(
+            url=url,
+            config=config.clone(
+                check_robots_txt=False,
+                screenshot=False,
+                pdf=False,
+                capture_mhtml=False,
+            ),
+        )
+        lease.pages += 1
+        headers = getattr(result, "response_headers", None) or {}
+        scheduler.record(
+            url, getattr(result, "status_code", None), headers.get("retry-after")
+        )
+        fetch_tier.add(1, {"tier": "browser", "reason": reason})
+        if getattr(result, "success", False):
+            if reason == "js_shell":
+                tier.js_shells += 1
+            if cache is not None:
+                cache.put(key, url, result)
+        return result
+
+    async def arun_many(self, urls: list[str], config: CrawlerRunConfig) -> list[Any]:
+        host_slots: dict[str, asyncio.Semaphore] = {}
+
+        async def run(url: str) -> Any:
+            host = urlparse(url).netloc.lower()
+            slot = host_slots.setdefault(
+                host, asyncio.Semaphore(HTTP_PER_HOST_CONCURRENCY)
+            )
+            async with slot:
+                return await self.arun(url=url, config=config)
+
+        return list(await asyncio.gather(*(run(url) for url in urls)))
+
+
+async def _close_crawler_resources() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    await get_browser_pool().close()
+    await get_robots_cache().aclose()
+    save_net_caches()
+    close_page_cache()
+
+
+async def shutdown_crawler() -> None:
+    """Close the pooled HTTP client and browsers, then stop the crawler loop.
+
+    Also stops the post-processing worker processes.
+    """
+    await run_in_crawler_thread(_close_crawler_resources)
+    stop_crawler_loop()
+    shutdown_postprocess_pool()
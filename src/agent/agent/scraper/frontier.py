@@ -0,0 +1,246 @@
+"""Deep-crawl strategies: shared multi-seed BFS and a best-first frontier."""
+
+from __future__ import annotations
+
+import heapq
+import re
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any
+from urllib.parse import urlparse
+
+from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
+from crawl4ai.utils import normalize_url_for_deep_crawl
+
+from agent.scraper.config import (
+    FRONTIER_BATCH_SIZE,
+    FRONTIER_DEPTH_PENALTY,
+    FRONTIER_HIGH_VALUE_KEYWORDS,
+    FRONTIER_LOW_VALUE_KEYWORDS,
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class SharedCrawlState:
+    """Visited set and page budget shared by concurrent seed crawls."""
+
+    max_pages: int
+    visited: set[str] = field(default_factory=set)
+    pages_crawled: int = 0
+
+
+class LeanBFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
+    """BFS that releases each page's links once they have been expanded.
+
+    crawl4ai's batch BFS returns every result when the crawl ends. Under a
+    streaming TieredCrawler pages reach the caller as they are fetched, so
+    the results it still collects are bare records (URL, status, depth).
+    """
+
+    async def link_discovery(
+        self,
+        result: Any,
+        source_url: str,
+        current_depth: int,
+        visited: set[str],
+        next_level: list[tuple[str, str | None]],
+        depths: dict[str, int],
+    ) -> None:
+        await super().link_discovery(
+            result, source_url, current_depth, visited, next_level, depths
+        )
+        result.links = {}  # only needed for discovery
+
+
+class SharedBFSDeepCrawlStrategy(LeanBFSDeepCrawlStrategy):
+    """BFS whose visited set and page budget live in a SharedCrawlState.
+
+    Sibling crawls running on the same loop see each other's discoveries, so a
+    page linked from several seeds is fetched once, and together they stop at
+    `shared.max_pages`.
+    """
+
+    def __init__(self, shared: SharedCrawlState, **kwargs: Any) -> None:
+        self._shared = shared
+        crawled = shared.pages_crawled
+        super().__init__(max_pages=shared.max_pages, **kwargs)
+        shared.pages_crawled = crawled  # the base __init__ resets the counter
+
+    # BFSDeepCrawlStrategy counts pages in `_pages_crawled` and compares it
+    # with `max_pages`; routing it to the shared state makes the budget global.
+    @property
+    def _pages_crawled(self) -> int:
+        return self._shared.pages_crawled
+
+    @_pages_crawled.setter
+    def _pages_crawled(self, value: int) -> None:
+        self._shared.pages_crawled = value
+
+    async def link_discovery(
+        self,
+        result: Any,
+        source_url: str,
+        current_depth: int,
+        visited: set[str],  # noqa: ARG002
+        next_level: list[tuple[str, str | None]],
+        depths: dict[str, int],
+    ) -> None:
+        await super().link_discovery(
+            result, source_url, current_depth, self._shared.visited, next_level, depths
+        )
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def score_link(url: str, anchor_text: str, depth: int) -> float:
+    """Expected value of fetching a link: path and anchor keywords, minus depth.
+
+    Path keywords weigh twice as much as anchor text, since navigation labels
+    ("Learn more", "Read") are often generic.
+    """
+    parsed = urlparse(url)
+    path = _tokens(parsed.path)
+    anchor = _tokens(anchor_text)
+    score = 0.0
+    if path & FRONTIER_HIGH_VALUE_KEYWORDS:
+        score += 2
+    if anchor & FRONTIER_HIGH_VALUE_KEYWORDS:
+        score += 1
+    if path & FRONTIER_LOW_VALUE_KEYWORDS:
+        score -= 2
+    if anchor & FRONTIER_LOW_VALUE_KEYWORDS:
+        score -= 1
+    if parsed.query:
+        score -= 1  # listings, filters, pagination
+    return score - FRONTIER_DEPTH_PENALTY * depth
+
+
+class BestFirstDeepCrawlStrategy(BFSDeepCrawlStrategy):
+    """Priority-queue crawl: always fetch the highest-scoring known link next.
+
+    Links are ranked with `score_link()` (URL path and anchor text keywords,
+    depth penalty) and fetched FRONTIER_BATCH_SIZE at a time, so the page
+    budget goes to about/investor/press pages before careers or legal ones.
+    A link found again with a better anchor is re-ranked.
+
+    crawl4ai's BestFirstCrawlingStrategy scores URLs only and needs a
+    streaming arun_many; this one runs on TieredCrawler's batch arun_many and
+    emits the same resumable state shape (``strategy_type="best_first"``).
+    Under a streaming crawler pages are handed over as they are fetched and
+    the returned list stays empty.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        # url -> (score, depth, parent_url); the heap may hold stale scores
+        self._pending: dict[str, tuple[float, int, str | None]] = {}
+
+    async def _discover(
+        self, result: Any, source_url: str, depth: int, visited: set[str]
+    ) -> list[tuple[str, float]]:
+        if depth + 1 > self.max_depth:
+            return []
+        links = list(result.links.get("internal", []))
+        if self.include_external:
+            links += result.links.get("external", [])
+        found: dict[str, float] = {}
+        for link in links:
+            href = link.get("href")
+            if not href:
+                continue
+            url = normalize_url_for_deep_crawl(href, source_url)
+            if url in visited and url not in self._pending:
+                continue
+            if url not in found and not await self.can_process_url(url, depth + 1):
+                self.stats.urls_skipped += 1
+                continue
+            anchor = str(link.get("text") or link.get("title") or "")
+            score = score_link(url, anchor, depth + 1)
+            found[url] = max(score, found.get(url, score))
+        return list(found.items())
+
+    def _state(self, visited: set[str], depths: dict[str, int]) -> dict[str, Any]:
+        return {
+            "strategy_type": "best_first",
+            "visited": list(visited),
+            "queue_items": [
+                {"score": score, "depth": depth, "url": url, "parent_url": parent}
+                for url, (score, depth, parent) in self._pending.items()
+            ],
+            "depths": depths,
+            "pages_crawled": self._pages_crawled,
+        }
+
+    async def _arun_batch(self, start_url: str, crawler: Any, config: Any) -> list[Any]:
+        state = self._resume_state
+        self._pending = {}
+        if state and state.get("strategy_type") == "best_first":
+            visited = set(state.get("visited", []))
+            depths: dict[str, int] = dict(state.get("depths", {}))
+            self._pages_crawled = state.get("pages_crawled", 0)
+            for item in state.get("queue_items", []):
+                self._pending[item["url"]] = (
+                    item["score"],
+                    item["depth"],
+                    item["parent_url"],
+                )
+        else:
+            visited = {start_url}
+            depths = {start_url: 0}
+            self._pending[start_url] = (0.0, 0, None)
+
+        seq = count()
+        heap = [
+            (-score, next(seq), url) for url, (score, _, _) in self._pending.items()
+        ]
+        heapq.heapify(heap)
+        results: list[Any] = []
+        collect = not getattr(crawler, "streaming", False)
+
+        while heap and not self._cancel_event.is_set():
+            remaining = self.max_pages - self._pages_crawled
+            if remaining <= 0:
+                self.logger.info("Max pages limit (%s) reached", self.max_pages)
+                break
+            batch: list[tuple[str, float, int, str | None]] = []
+            while heap and len(batch) < min(FRONTIER_BATCH_SIZE, remaining):
+                neg_score, _, url = heapq.heappop(heap)
+                entry = self._pending.get(url)
+                if entry is None or entry[0] != -neg_score:
+                    continue  # already fetched, or re-ranked since
+                del self._pending[url]
+                batch.append((url, *entry))
+            if not batch:
+                break
+
+            batch_config = config.clone(deep_crawl_strategy=None, stream=False)
+            fetched = await crawler.arun_many(
+                urls=[url for url, *_ in batch], config=batch_config
+            )
+            for (url, score, depth, parent), result in zip(batch, fetched, strict=True):
+                result.metadata = result.metadata or {}
+                result.metadata.update(depth=depth, parent_url=parent, score=score)
+                if collect:
+                    results.append(result)
+                if not result.success:
+                    continue
+                self._pages_crawled += 1
+                discovered = await self._discover(result, url, depth, visited)
+                result.links = {}  # only needed for discovery
+                for link, link_score in discovered:
+                    queued = self._pending.get(link)
+                    if queued is not None and queued[0] >= link_score:
+                        continue
+                    visited.add(link)
+                    depths.setdefault(link, depth + 1)
+                    self._pending[link] = (link_score, depths[link], url)
+                    heapq.heappush(heap, (-link_score, next(seq), link))
+                if self._on_state_change:
+                    self._last_state = self._state(visited, depths)
+                    await self._on_state_change(self._last_state)
+
+        return results
@@ -0,0 +1,180 @@
+"""English detection for crawled documents: sampled, seeded and cached per host.
+
+langdetect scores random n-gram draws, so by default the same page can get a
+different verdict on every run, and its cost grows with the text it is given.
+Here it only sees a few fixed windows of the document and runs with a fixed
+seed. Most English pages never reach it: a share of English function words
+above LANGID_STOPWORD_RATIO settles them first. Once LANGID_DOMAIN_MIN_PAGES
+pages of a site section agree, later pages of that section reuse the verdict.
+A section is the host, plus the first path segment when it looks like a
+locale (``/de/``, ``/fr-ca/``), so translated sections are learned apart.
+
+The host cache lives in the process doing the detection (a post-processing
+worker, see postprocess.py), so each worker learns hosts on its own.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Literal
+from urllib.parse import urlparse
+
+from langdetect import LangDetectException
+from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+
+from agent.scraper.config import (
+    LANGID_DOMAIN_CACHE_SIZE,
+    LANGID_DOMAIN_MIN_PAGES,
+    LANGID_SEED,
+    LANGID_STOPWORD_MIN_WORDS,
+    LANGID_STOPWORD_RATIO,
+    LANGID_WINDOW_CHARS,
+    LANGID_WINDOWS,
+)
+
+Method = Literal["stopwords", "detector", "domain_cache"]
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+# de, fr-ca, pt_BR, zh-hans
+_LOCALE_SEGMENT_RE = re.compile(r"[a-z]{2}(?:[-_][a-z]{2,4})?", re.IGNORECASE)
+# Frequent in English prose and rare as words in other Latin-script languages
+_ENGLISH_STOPWORDS = frozenset(
+    [
+        "the",
+        "and",
+        "of",
+        "to",
+        "is",
+        "that",
+        "for",
+        "with",
+        "are",
+        "this",
+        "our",
+        "we",
+        "you",
+        "your",
+        "from",
+        "have",
+        "has",
+        "was",
+        "which",
+        "will",
+        "be",
+        "by",
+        "it",
+        "their",
+        "more",
+        "can",
+        "about",
+        "an",
+        "were",
+        "been",
+        "they",
+        "its",
+    ]
+)
+
+
+@dataclass(frozen=True)
+class Verdict:
+    language: str  # ISO 639-1 code; "" when the text has no detectable language
+    method: Method
+
+
+@lru_cache(maxsize=1)
+def _factory() -> Any:
+    factory = DetectorFactory()
+    factory.load_profile(PROFILES_DIRECTORY)
+    factory.set_seed(LANGID_SEED)
+    return factory
+
+
+def sample_text(text: str) -> str:
+    """LANGID_WINDOWS evenly spaced windows of the text (all of it if short)."""
+    size = LANGID_WINDOW_CHARS
+    if len(text) <= size * LANGID_WINDOWS:
+        return text
+    step = (len(text) - size) // max(LANGID_WINDOWS - 1, 1)
+    return "\n".join(text[i * step : i * step + size] for i in range(LANGID_WINDOWS))
+
+
+def _stopword_ratio(sample: str) -> float:
+    words = _WORD_RE.findall(sample.lower())
+    if len(words) < LANGID_STOPWORD_MIN_WORDS:
+        return 0.0
+    return sum(word in _ENGLISH_STOPWORDS for word in words) / len(words)
+
+
+def detect_language(text: str) -> Verdict:
+    """Language of the text, from its sampled windows."""
+    sample = sample_text(text)
+    if _stopword_ratio(sample) >= LANGID_STOPWORD_RATIO:
+        return Verdict("en", "stopwords")
+    detector = _factory().create()
+    detector.append(sample)
+    try:
+        return Verdict(str(detector.detect()), "detector")
+    except LangDetectException:
+        return Verdict("", "detector")
+
+
+class _HostLanguages:
+    """Per-host verdict history; a host is trusted once its pages agree."""
+
+    def __init__(self, min_pages: int, max_hosts: int) -> None:
+        self.min_pages = min_pages
+        self.max_hosts = max_hosts
+        # host -> (language, agreeing pages); language None once pages disagree
+        self._hosts: OrderedDict[str, tuple[str | None, int]] = OrderedDict()
+
+    def known(self, host: str) -> str | None:
+        entry = self._hosts.get(host)
+        if entry is None or entry[0] is None or entry[1] < self.min_pages:
+            return None
+        self._hosts.move_to_end(host)
+        return entry[0]
+
+    def record(self, host: str, language: str) -> None:
+        language_seen, pages = self._hosts.get(host, (language, 0))
+        if language_seen == language:
+            self._hosts[host] = (language, pages + 1)
+        else:
+            self._hosts[host] = (None, 0)  # mixed-language host: always detect
+        self._hosts.move_to_end(host)
+        while len(self._hosts) > self.max_hosts:
+            self._hosts.popitem(last=False)
+
+    def clear(self) -> None:
+        self._hosts.clear()
+
+
+_hosts = _HostLanguages(LANGID_DOMAIN_MIN_PAGES, LANGID_DOMAIN_CACHE_SIZE)
+
+
+def site_section(url: str) -> str:
+    """Cache key of a URL: host, plus a locale-like first path segment."""
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    if not host:
+        return ""
+    first = parsed.path.lstrip("/").partition("/")[0]
+    if _LOCALE_SEGMENT_RE.fullmatch(first):
+        return f"{host}/{first.lower()}"
+    return host
+
+
+def identify(text: str, url: str = "") -> Verdict:
+    """Language of a document, reusing the verdict of a consistent section."""
+    section = site_section(url) if url else ""
+    if section:
+        known = _hosts.known(section)
+        if known is not None:
+            return Verdict(known, "domain_cache")
+    verdict = detect_language(text)
+    if section and verdict.language:
+        _hosts.record(section, verdict.language)
+    return verdict
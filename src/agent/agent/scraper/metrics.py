@@ -33,5 +33,67 @@ page_content_size = meter.create_histogram(
 
 active_browsers = meter.create_up_down_counter(
     "scraper.active_browsers",
-    description="Currently active browser sessions",
+    description="Pooled browsers by state (leased, idle) and crawls waiting for one",
+)
+
+browser_wait_time = meter.create_histogram(
+    "scraper.browser_wait_time",
+    description="Time spent waiting for a browser from the pool",
+    unit="s",
+)
+
+politeness_wait = meter.create_histogram(
+    "scraper.politeness_wait",
+    description="Time a request waited for its domain's politeness slot",
+    unit="s",
+)
+
+net_cache_lookups = meter.create_counter(
+    "scraper.net_cache",
+    description="Robots.txt and DNS cache lookups by cache and result (hit, miss)",
+)
+
+page_cache_events = meter.create_counter(
+    "scraper.page_cache",
+    description="Page cache lookups (fresh, revalidated, stale, miss) and evictions",
+)
+
+browser_blocked_requests = meter.create_counter(
+    "scraper.browser_blocked_requests",
+    description="Browser subresource requests aborted by the lean profile, by reason",
+)
+
+browser_bytes_saved_estimate = meter.create_counter(
+    "scraper.browser_bytes_saved_estimate",
+    description="Estimate, not a measurement: typical sizes of aborted browser "
+    "requests (BROWSER_BLOCKED_BYTES_ESTIMATE), by reason",
+    unit="By",
+)
+
+language_detections = meter.create_counter(
+    "scraper.language_detections",
+    description="Language verdicts by method (stopwords, detector, domain_cache)",
+)
+
+language_detection_rate = meter.create_histogram(
+    "scraper.language_detection_rate",
+    description="Language identification throughput per post-processing batch",
+    unit="{doc}/s",
+)
+
+raw_compression_ratio = meter.create_histogram(
+    "scraper.raw_compression_ratio",
+    description="Body bytes over stored bytes per raw store write, by codec",
+    unit="1",
+)
+
+raw_load_throughput = meter.create_histogram(
+    "scraper.raw_load_throughput",
+    description="Body bytes decoded per second when loading a raw store, by codec",
+    unit="By/s",
+)
+
+fetch_tier = meter.create_counter(
+    "scraper.fetch_tier",
+    description="Pages fetched per tier (http, browser) and fallback reason",
 )
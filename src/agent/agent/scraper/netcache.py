@@ -0,0 +1,367 @@
+"""Process-wide robots.txt and DNS caches shared by every fetch path.
+
+Both caches are bounded LRUs with TTLs, are persisted as JSON next to the page
+cache, and report hits/misses on `scraper.net_cache`. The DNS cache plugs into
+httpx through a network backend (`cached_dns_transport()`), so pooled clients,
+subdomain probes and the Wikipedia API all resolve each host once per TTL.
+Robots rules are parsed once per origin; `check()` answers both "allowed?" and
+Crawl-delay from the parsed rules. robots.txt fetches are paced by the
+politeness scheduler like any other request to the domain.
+
+Chromium resolves names itself; browser fetches share the robots cache only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+from urllib.robotparser import RobotFileParser
+
+import httpcore
+import httpx
+
+from agent.scraper.browser_pool import BROWSER_CONFIG
+from agent.scraper.config import (
+    DNS_CACHE_MAX_ENTRIES,
+    DNS_CACHE_NEGATIVE_TTL,
+    DNS_CACHE_TTL,
+    NET_CACHE_FILE,
+    PAGE_CACHE_DIR,
+    ROBOTS_CACHE_ERROR_TTL,
+    ROBOTS_CACHE_MAX_ENTRIES,
+    ROBOTS_CACHE_TTL,
+    ROBOTS_TIMEOUT,
+)
+from agent.scraper.metrics import net_cache_lookups
+from agent.scraper.politeness import paced_event_hooks
+
+logger = logging.getLogger(__name__)
+
+
+class DnsCache:
+    """host -> resolved addresses. Thread-safe; resolves on the caller's loop."""
+
+    def __init__(self, max_entries: int = DNS_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, host: str) -> list[str] | None:
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None or entry[0] < time.time():
+                return None
+            self._entries.move_to_end(host)
+            return entry[1]
+
+    def _put(self, host: str, addrs: list[str]) -> None:
+        ttl = DNS_CACHE_TTL if addrs else DNS_CACHE_NEGATIVE_TTL
+        with self._lock:
+            self._entries[host] = (time.time() + ttl, addrs)
+            self._entries.move_to_end(host)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def resolve(self, host: str, port: int = 443) -> list[str]:
+        """Addresses for `host` ([] when it does not resolve)."""
+        host = host.lower()
+        cached = self._get(host)
+        if cached is not None:
+            net_cache_lookups.add(1, {"cache": "dns", "result": "hit"})
+            return cached
+        net_cache_lookups.add(1, {"cache": "dns", "result": "miss"})
+
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            addrs: list[str] = []
+        else:
+            addrs = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        self._put(host, addrs)
+        return addrs
+
+    def dump(self) -> dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {h: e for h, e in self._entries.items() if e[0] > now}
+
+    def load(self, data: dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            for host, (expires, addrs) in data.items():
+                if expires > now:
+                    self._entries[host] = (expires, list(addrs))
+
+
+class _CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """Resolves through the DnsCache, then connects to the first reachable IP.
+
+    TLS still uses the original hostname (httpcore passes it to start_tls).
+    """
+
+    def __init__(self) -> None:
+        self._inner = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Any = None,
+    ) -> httpcore.AsyncNetworkStream:
+        addrs = await get_dns_cache().resolve(host, port)
+        if not addrs:
+            raise httpcore.ConnectError(f"Name does not resolve: {host}")
+        last_exc: Exception | None = None
+        for addr in addrs:
+            try:
+                return await self._inner.connect_tcp(
+                    addr, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                last_exc = exc
+        assert last_exc is not None
+        raise last_exc
+
+    async def connect_unix_socket(
+        self, path: str, timeout: float | None = None, socket_options: Any = None
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._inner.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+class _DirectTransport(httpx.AsyncHTTPTransport):
+    # httpx has no public hook for the network backend; swap its pool for one
+    # built with the same settings (the httpx version is locked in uv.lock)
+    def __init__(self, verify: bool, limits: httpx.Limits) -> None:
+        super().__init__(verify=verify, limits=limits)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(verify=verify),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_CachedDNSBackend(),
+        )
+
+
+class _CachedDNSTransport(httpx.AsyncBaseTransport):
+    """Direct connections resolve through the DnsCache.
+
+    A client given its own transport ignores proxy environment variables, so
+    this transport applies them itself: URLs that HTTP_PROXY / HTTPS_PROXY /
+    ALL_PROXY cover (and NO_PROXY does not exempt) go through httpx's proxy
+    transport, where the proxy resolves names.
+    """
+
+    def __init__(self, verify: bool, limits: httpx.Limits) -> None:
+        self._verify = verify
+        self._limits = limits
+        self._direct = _DirectTransport(verify, limits)
+        self._env_proxies = getproxies()
+        self._proxied: dict[str, httpx.AsyncHTTPTransport] = {}
+
+    def _proxy_for(self, url: httpx.URL) -> str | None:
+        proxy = self._env_proxies.get(url.scheme) or self._env_proxies.get("all")
+        if proxy is None or proxy_bypass(url.host):
+            return None
+        return proxy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        proxy = self._proxy_for(request.url)
+        if proxy is None:
+            return await self._direct.handle_async_request(request)
+        transport = self._proxied.get(proxy)
+        if transport is None:
+            transport = self._proxied[proxy] = httpx.AsyncHTTPTransport(
+                verify=self._verify, limits=self._limits, proxy=proxy
+            )
+        return await transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._direct.aclose()
+        for transport in self._proxied.values():
+            await transport.aclose()
+
+
+def cached_dns_transport(
+    verify: bool = True, limits: httpx.Limits | None = None
+) -> httpx.AsyncBaseTransport:
+    """An httpx transport whose direct connections resolve through the DNS cache.
+
+    Proxy environment variables are honoured as with httpx's default transport.
+    """
+    return _CachedDNSTransport(verify=verify, limits=limits or httpx.Limits())
+
+
+@dataclass
+class _RobotsEntry:
+    expires_at: float
+    rules: str | None  # None: no usable robots.txt, everything allowed
+    parser: RobotFileParser | None = field(default=None, repr=False)
+
+    def parsed(self) -> RobotFileParser | None:
+        if self.rules is None:
+            return None
+        if self.parser is None:
+            self.parser = RobotFileParser()
+            self.parser.parse(self.rules.splitlines())
+            self.parser.modified()  # can_fetch() denies everything until set
+        return self.parser
+
+
+class RobotsCache:
+    """origin -> parsed robots.txt. Fetches on the crawler loop.
+
+    `_entries` is locked because dump()/load() run on the main loop.
+    """
+
+    def __init__(
+        self, user_agent: str, max_entries: int = ROBOTS_CACHE_MAX_ENTRIES
+    ) -> None:
+        self.user_agent = user_agent
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _RobotsEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Task[_RobotsEntry]] = {}
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=ROBOTS_TIMEOUT,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent},
+                transport=cached_dns_transport(),
+                event_hooks=paced_event_hooks(),
+            )
+        return self._client
+
+    async def _fetch(self, origin: str) -> _RobotsEntry:
+        try:
+            resp = await self._get_client().get(f"{origin}/robots.txt")
+        except httpx.HTTPError:
+            return _RobotsEntry(time.time() + ROBOTS_CACHE_ERROR_TTL, None)
+        if resp.status_code == 200:
+            return _RobotsEntry(time.time() + ROBOTS_CACHE_TTL, resp.text)
+        # 4xx: no restrictions (RFC 9309); 5xx: allow but re-check sooner
+        ttl = ROBOTS_CACHE_TTL if resp.status_code < 500 else ROBOTS_CACHE_ERROR_TTL
+        return _RobotsEntry(time.time() + ttl, None)
+
+    async def _entry(self, url: str) -> _RobotsEntry:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}".lower()
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry is not None and entry.expires_at > time.time():
+                self._entries.move_to_end(origin)
+            else:
+                entry = None
+        if entry is not None:
+            net_cache_lookups.add(1, {"cache": "robots", "result": "hit"})
+            return entry
+        net_cache_lookups.add(1, {"cache": "robots", "result": "miss"})
+
+        task = self._inflight.get(origin)
+        if task is None:
+            task = asyncio.create_task(self._fetch(origin))
+            self._inflight[origin] = task
+            task.add_done_callback(lambda _: self._inflight.pop(origin, None))
+        entry = await asyncio.shield(task)
+        with self._lock:
+            self._entries[origin] = entry
+            self._entries.move_to_end(origin)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    async def check(self, url: str) -> tuple[bool, float | None]:
+        """(allowed, crawl_delay) for our user agent."""
+        parser = (await self._entry(url)).parsed()
+        if parser is None:
+            return True, None
+        delay = parser.crawl_delay(self.user_agent)
+        return (
+            parser.can_fetch(self.user_agent, url),
+            float(delay) if delay is not None else None,
+        )
+
+    async def sitemaps(self, url: str) -> list[str]:
+        """`Sitemap:` URLs listed in the origin's robots.txt."""
+        parser = (await self._entry(url)).parsed()
+        return list(parser.site_maps() or []) if parser is not None else []
+
+    def dump(self) -> dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                o: [e.expires_at, e.rules]
+                for o, e in self._entries.items()
+                if e.expires_at > now
+            }
+
+    def load(self, data: dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            for origin, (expires_at, rules) in data.items():
+                if expires_at > now:
+                    self._entries[origin] = _RobotsEntry(expires_at, rules)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+@lru_cache(maxsize=1)
+def get_dns_cache() -> DnsCache:
+    return DnsCache()
+
+
+@lru_cache(maxsize=1)
+def get_robots_cache() -> RobotsCache:
+    return RobotsCache(BROWSER_CONFIG.user_agent)
+
+
+_cache_file: Path | None = None
+
+
+def load_net_caches(data_dir: Path) -> None:
+    """Restore persisted robots/DNS entries once per data directory."""
+    global _cache_file
+    path = data_dir / PAGE_CACHE_DIR / NET_CACHE_FILE
+    if path == _cache_file:
+        return
+    _cache_file = path
+    if not path.exists():
+        return
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        get_dns_cache().load(data.get("dns", {}))
+        get_robots_cache().load(data.get("robots", {}))
+    except (OSError, ValueError, TypeError):
+        logger.warning("Ignoring unreadable net cache %s", path, exc_info=True)
+
+
+def save_net_caches() -> None:
+    if _cache_file is None:
+        return
+    data = {"dns": get_dns_cache().dump(), "robots": get_robots_cache().dump()}
+    _cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _cache_file.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    tmp.replace(_cache_file)
@@ -0,0 +1,252 @@
+"""Persistent page cache shared by scrape jobs.
+
+Stores the rendered output of a page (markdown, metadata, links) together with
+its ETag / Last-Modified validators in a SQLite file under the data directory.
+Entries younger than PAGE_CACHE_TTL are reused as-is; older ones are revalidated
+with a conditional request and reused on 304. The file is kept under
+PAGE_CACHE_MAX_BYTES by evicting least recently used entries.
+
+Keys combine the canonical URL with the render settings that shape the output
+(css_selector, excluded tags/selector), so Wikipedia's content-only render and a
+full-page render of the same URL never collide.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from crawl4ai import CrawlerRunConfig
+
+from agent.scraper.config import (
+    PAGE_CACHE_DIR,
+    PAGE_CACHE_ENABLED,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_TTL,
+)
+from agent.scraper.metrics import page_cache_events
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    validated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL for cache lookups (case, default port, fragment, query)."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith(_TRACKING_PARAMS)
+        )
+    )
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def cache_key(url: str, config: CrawlerRunConfig) -> str:
+    variant = json.dumps(
+        [
+            config.css_selector or "",
+            config.excluded_selector or "",
+            sorted(config.excluded_tags or []),
+        ]
+    )
+    digest = hashlib.sha1(variant.encode(), usedforsecurity=False).hexdigest()[:12]
+    return f"{digest}:{canonical_url(url)}"
+
+
+@dataclass
+class CachedPage:
+    """A cached render of one page plus its HTTP validators."""
+
+    url: str
+    markdown: dict[str, str]
+    metadata: dict[str, Any] = field(default_factory=dict)
+    links: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    status_code: int | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    validated_at: float = 0.0
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() - self.validated_at < PAGE_CACHE_TTL
+
+    @property
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _header(headers: dict[str, Any], name: str) -> str | None:
+    for key, value in headers.items():
+        if key.lower() == name:
+            return str(value)
+    return None
+
+
+class PageCache:
+    """SQLite-backed LRU page cache. Thread-safe; every call is a short query."""
+
+    def __init__(self, path: Path, max_bytes: int = PAGE_CACHE_MAX_BYTES) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        self._total_bytes: int = row[0]
+
+    def get(self, key: str) -> CachedPage | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, payload, etag, last_modified, validated_at "
+                "FROM pages WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+        url, payload, etag, last_modified, validated_at = row
+        data = json.loads(payload)
+        return CachedPage(
+            url=url,
+            markdown=data["markdown"],
+            metadata=data["metadata"],
+            links=data["links"],
+            status_code=data["status_code"],
+            etag=etag,
+            last_modified=last_modified,
+            validated_at=validated_at,
+        )
+
+    def put(self, key: str, url: str, result: Any) -> None:
+        """Store a successful crawl result (PageResult or crawl4ai CrawlResult)."""
+        md = getattr(result, "markdown", None)
+        headers = getattr(result, "response_headers", None) or {}
+        payload = json.dumps(
+            {
+                "markdown": {
+                    "raw_markdown": str(getattr(md, "raw_markdown", "") or ""),
+                    "fit_markdown": str(getattr(md, "fit_markdown", "") or ""),
+                },
+                "metadata": getattr(result, "metadata", None) or {},
+                "links": getattr(result, "links", None) or {},
+                "status_code": getattr(result, "status_code", None),
+            },
+            default=str,
+        )
+        size = len(payload)
+        now = time.time()
+        with self._lock:
+            old = self._db.execute(
+                "SELECT size FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    payload,
+                    _header(headers, "etag"),
+                    _header(headers, "last-modified"),
+                    now,
+                    now,
+                    size,
+                ),
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as just revalidated (after a 304)."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE pages SET validated_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+
+    def _evict(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for key, size in self._db.execute(
+            "SELECT key, size FROM pages ORDER BY accessed_at"
+        ).fetchall():
+            if self._total_bytes <= target:
+                break
+            self._db.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self._total_bytes -= size
+            evicted += 1
+        page_cache_events.add(evicted, {"event": "evicted"})
+        logger.info("Evicted %d cached pages from %s", evicted, self.path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_cache: PageCache | None = None
+
+
+def open_page_cache(data_dir: Path) -> PageCache | None:
+    """Open (or reuse) the cache under `data_dir`; None when caching is off."""
+    global _cache
+    if not PAGE_CACHE_ENABLED:
+        return None
+    path = data_dir / PAGE_CACHE_DIR / "pages.sqlite3"
+    if _cache is None or _cache.path != path:
+        if _cache is not None:
+            _cache.close()
+        _cache = PageCache(path)
+    return _cache
+
+
+def get_page_cache() -> PageCache | None:
+    return _cache
+
+
+def close_page_cache() -> None:
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -3,21 +3,31 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from collections.abc import Awaitable, Callable
+from functools import partial
 from pathlib import Path
 
 import logfire
 
+from agent.scraper.checkpoint import ScrapeCheckpoint
+from agent.scraper.config import CHECKPOINT_ENABLED, NEAR_DUP_ENABLED, SITEMAP_ENABLED
 from agent.scraper.crawl import (
+    discover_sitemap_urls,
     probe_company_subdomains,
     scrape_company_pages,
     scrape_search_results,
+    scrape_sitemap_pages,
     scrape_website,
     scrape_wikipedia,
     search_company,
 )
+from agent.scraper.dedup import NearDuplicateIndex
 from agent.scraper.metrics import phase_duration
-from agent.scraper.models import RawDocument, ScrapeResult
-from agent.scraper.storage import save_raw_documents, wipe_raw_data
+from agent.scraper.models import RawDocument, ScrapeResult, WikipediaResult
+from agent.scraper.netcache import load_net_caches, save_net_caches
+from agent.scraper.page_cache import open_page_cache
+from agent.scraper.postprocess import DocumentSink
+from agent.scraper.storage import save_raw_documents
 
 logger = logging.getLogger(__name__)
 
@@ -30,26 +40,123 @@ async def _empty_scrape_result() -> tuple[list[RawDocument], list[str]]:
     return [], []
 
 
+async def _publish(
+    queue: asyncio.Queue[RawDocument | None] | None, docs: list[RawDocument]
+) -> None:
+    if queue is None:
+        return
+    for doc in docs:
+        await queue.put(doc)
+
+
+def _unique(
+    dedup: NearDuplicateIndex | None, docs: list[RawDocument]
+) -> list[RawDocument]:
+    return dedup.filter(docs) if dedup is not None else docs
+
+
+def _dedupe_wikipedia(
+    dedup: NearDuplicateIndex | None, result: WikipediaResult
+) -> list[RawDocument]:
+    """Drop near-duplicate related articles; returns the documents kept."""
+    docs = _unique(dedup, [result.document] if result.document else [])
+    result.related_documents = _unique(dedup, result.related_documents)
+    return docs + result.related_documents
+
+
+async def _published(
+    queue: asyncio.Queue[RawDocument | None] | None,
+    phase: Callable[..., Awaitable[tuple[list[RawDocument], list[str]]]],
+    dedup: NearDuplicateIndex | None = None,
+) -> tuple[list[RawDocument], list[str]]:
+    """Run `phase(on_document=...)`, publishing each document once cleaned.
+
+    Returns the documents that passed the near-duplicate check, plus the
+    phase's own errors.
+    """
+    kept: list[RawDocument] = []
+
+    async def on_document(doc: RawDocument) -> None:
+        if _unique(dedup, [doc]):
+            kept.append(doc)
+            await _publish(queue, [doc])
+
+    _, errors = await phase(on_document=on_document)
+    return kept, errors
+
+
+async def _scrape_website_pages(
+    homepage_url: str,
+    company: str,
+    checkpoint: ScrapeCheckpoint | None,
+    on_document: DocumentSink | None = None,
+) -> tuple[list[RawDocument], list[str]]:
+    """Fetch the sitemap's best pages directly; crawl links only without one."""
+    urls = await discover_sitemap_urls(homepage_url) if SITEMAP_ENABLED else []
+    if urls:
+        logger.info("Using %d sitemap pages for %s", len(urls), company)
+        return await scrape_sitemap_pages(urls, company, checkpoint, on_document)
+    return await scrape_website(homepage_url, company, checkpoint, on_document)
+
+
 async def scrape_company(
     company: str,
     data_dir: Path,
+    queue: asyncio.Queue[RawDocument | None] | None = None,
+    generation: int | None = None,
 ) -> ScrapeResult:
+    """Scrape all sources for a company and save them as raw files.
+
+    With `queue`, each document is also put on it as soon as it is cleaned,
+    so a consumer (ingestion) can work while crawling continues.
+    The caller owns the queue and its end-of-stream sentinel.
+
+    Progress is checkpointed under the company directory; if the job dies,
+    the next call for the same company resumes instead of starting over.
+
+    Documents are saved into a new raw generation, so readers keep seeing the
+    previous one until the new set is complete. With `generation` (from
+    `new_generation`) it is only staged, and the caller publishes it once the
+    vectors are ready; without it the new generation is published on save.
+
+    Documents whose content nearly duplicates one already kept (localized
+    copies, print views, syndicated press releases) are dropped before they
+    are published or saved.
+    """
     company = _normalize_company(company)
+    dedup = NearDuplicateIndex() if NEAR_DUP_ENABLED else None
+
+    async def wikipedia_phase() -> WikipediaResult:
+        result = await scrape_wikipedia(company)
+        await _publish(queue, _dedupe_wikipedia(dedup, result))
+        return result
 
     with logfire.span("scrape_company {company}", company=company) as span:
-        wipe_raw_data(company, data_dir)
+        open_page_cache(data_dir)
+        load_net_caches(data_dir)
+        checkpoint = (
+            ScrapeCheckpoint.load(company, data_dir) if CHECKPOINT_ENABLED else None
+        )
+        restored = checkpoint.discovery() if checkpoint else None
+        span.set_attribute("resumed", checkpoint is not None and checkpoint.resumed)
 
         all_docs: list[RawDocument] = []
         all_errors: list[str] = []
         seen_urls: set[str] = set()
 
         # --- Phase 1: Wikipedia + DDG search in parallel ---
-        t0 = time.monotonic()
-        wiki_result, search_results = await asyncio.gather(
-            scrape_wikipedia(company),
-            asyncio.to_thread(search_company, company),
-        )
-        phase_duration.record(time.monotonic() - t0, {"phase": "discovery"})
+        if restored is not None:
+            wiki_result, search_results = restored
+            await _publish(queue, _dedupe_wikipedia(dedup, wiki_result))
+        else:
+            t0 = time.monotonic()
+            wiki_result, search_results = await asyncio.gather(
+                wikipedia_phase(),
+                asyncio.to_thread(search_company, company),
+            )
+            phase_duration.record(time.monotonic() - t0, {"phase": "discovery"})
+            if checkpoint is not None:
+                checkpoint.save_discovery(wiki_result, search_results)
 
         if wiki_result.document:
             all_docs.append(wiki_result.document)
@@ -65,17 +172,23 @@ async def scrape_company(
         homepage_url = wiki_result.official_website or search_results.homepage_url
         span.set_attribute("homepage_url", homepage_url or "")
 
-        # --- Phase 2: Website BFS + subdomain probing ---
+        # --- Phase 2: Website (sitemap or crawl) + subdomain probing ---
         website_docs: list[RawDocument] = []
         if homepage_url:
             t1 = time.monotonic()
-            website_docs, website_errors = await scrape_website(homepage_url, company)
+            (website_docs, website_errors), probed = await asyncio.gather(
+                _published(
+                    queue,
+                    partial(_scrape_website_pages, homepage_url, company, checkpoint),
+                    dedup,
+                ),
+                probe_company_subdomains(homepage_url),
+            )
             all_docs.extend(website_docs)
             all_errors.extend(website_errors)
             seen_urls.update(d.url for d in website_docs)
             phase_duration.record(time.monotonic() - t1, {"phase": "website_bfs"})
 
-            probed = await probe_company_subdomains(homepage_url)
             for u in probed:
                 if u not in seen_urls and u not in search_results.company_urls:
                     search_results.company_urls.append(u)
@@ -88,10 +201,20 @@ async def scrape_company(
 
         t2 = time.monotonic()
         co_result, search_result = await asyncio.gather(
-            scrape_company_pages(co_urls, company, seen_urls)
+            _published(
+                queue,
+                partial(scrape_company_pages, co_urls, company, seen_urls, checkpoint),
+                dedup,
+            )
             if co_urls
             else _empty_scrape_result(),
-            scrape_search_results(extra_urls, company),
+            _published(
+                queue,
+                partial(
+                    scrape_search_results, extra_urls, company, checkpoint=checkpoint
+                ),
+                dedup,
+            ),
         )
         phase_duration.record(time.monotonic() - t2, {"phase": "pages_and_search"})
 
@@ -102,7 +225,10 @@ async def scrape_company(
         all_docs.extend(search_docs)
         all_errors.extend(search_errors)
 
-        saved = save_raw_documents(company, all_docs, data_dir)
+        saved = save_raw_documents(company, all_docs, data_dir, generation)
+        save_net_caches()
+        if checkpoint is not None:
+            checkpoint.clear()
 
         wiki_count = (1 if wiki_result.document else 0) + len(
             wiki_result.related_documents
@@ -0,0 +1,155 @@
+"""Per-domain request pacing shared by every crawl.
+
+Each registered domain (``newsroom.acme.com`` and ``www.acme.com`` share
+``acme.com``; ``bbc.co.uk`` and ``tesco.co.uk`` do not share ``co.uk``) gets
+its own token bucket: requests are spaced MEAN_DELAY apart with a small burst
+allowance, or by the robots.txt ``Crawl-delay`` when that is longer. 429/503
+responses double the domain's interval (honouring ``Retry-After``) and
+successes decay it back. Unrelated domains never wait on each other, so
+throughput grows with the number of hosts, not jobs.
+
+Reservations are synchronous and locked, so the scheduler is shared by tasks
+on the crawler loop (see _compat.py) and httpx clients on the main loop alike;
+`paced_event_hooks()` paces a client's every request, redirects included.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import httpx
+import tldextract
+
+from agent.scraper.config import (
+    DELAY_JITTER,
+    MEAN_DELAY,
+    POLITENESS_BACKOFF_STATUSES,
+    POLITENESS_BURST,
+    POLITENESS_MAX_INTERVAL,
+)
+from agent.scraper.metrics import politeness_wait
+
+
+@lru_cache(maxsize=1)
+def _public_suffixes() -> tldextract.TLDExtract:
+    # the list snapshot shipped with tldextract: no download, no disk cache
+    return tldextract.TLDExtract(
+        suffix_list_urls=(), cache_dir=None, include_psl_private_domains=True
+    )
+
+
+@lru_cache(maxsize=4096)
+def _registered_host(host: str) -> str:
+    return _public_suffixes()(host).top_domain_under_public_suffix or host
+
+
+def registered_domain(url: str) -> str:
+    """The public-suffix-aware registrable domain of `url` (its host if none)."""
+    return _registered_host((urlparse(url).hostname or "").lower())
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _DomainBucket:
+    crawl_delay: float = 0.0
+    penalty: float = 1.0  # multiplier raised by 429/503, decayed by successes
+    tat: float = 0.0  # theoretical arrival time of the next request (GCRA)
+
+    @property
+    def interval(self) -> float:
+        base = max(MEAN_DELAY, self.crawl_delay)
+        return min(base * self.penalty, POLITENESS_MAX_INTERVAL)
+
+
+class PolitenessScheduler:
+    def __init__(self) -> None:
+        self._buckets: dict[str, _DomainBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> _DomainBucket:
+        return self._buckets.setdefault(registered_domain(url), _DomainBucket())
+
+    def set_crawl_delay(self, url: str, delay: float | None) -> None:
+        if delay is not None:
+            with self._lock:
+                self._bucket(url).crawl_delay = min(delay, POLITENESS_MAX_INTERVAL)
+
+    def _reserve(self, url: str) -> float:
+        """Book the next slot for the URL's domain; returns seconds to wait."""
+        with self._lock:
+            bucket = self._bucket(url)
+            now = time.monotonic()
+            interval = bucket.interval
+            tat = max(bucket.tat, now)
+            start = max(now, tat - (POLITENESS_BURST - 1) * interval)
+            bucket.tat = max(tat, start) + interval
+            return start - now
+
+    async def acquire(self, url: str) -> None:
+        """Wait until the URL's domain may receive another request."""
+        delay = self._reserve(url)
+        if delay > 0:
+            delay += random.uniform(0, DELAY_JITTER)
+            await asyncio.sleep(delay)
+        politeness_wait.record(max(delay, 0.0))
+
+    def record(
+        self, url: str, status_code: int | None, retry_after: str | None = None
+    ) -> None:
+        """Adapt the domain's pace to a response status."""
+        wait = _retry_after_seconds(retry_after)
+        with self._lock:
+            bucket = self._bucket(url)
+            if status_code in POLITENESS_BACKOFF_STATUSES:
+                bucket.penalty = min(bucket.penalty * 2, POLITENESS_MAX_INTERVAL)
+                if wait is not None:
+                    # _reserve lets a request start up to (burst - 1) intervals
+                    # before the TAT; none may start before Retry-After ends
+                    until = time.monotonic() + min(wait, POLITENESS_MAX_INTERVAL)
+                    bucket.tat = max(
+                        bucket.tat, until + (POLITENESS_BURST - 1) * bucket.interval
+                    )
+            elif status_code is not None and status_code < 400:
+                bucket.penalty = max(1.0, bucket.penalty * 0.75)
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> PolitenessScheduler:
+    return PolitenessScheduler()
+
+
+def paced_event_hooks() -> dict[str, list[Callable[..., Awaitable[None]]]]:
+    """httpx `event_hooks` that take a slot before, and report after, each request."""
+    scheduler = get_scheduler()
+
+    async def before(request: httpx.Request) -> None:
+        await scheduler.acquire(str(request.url))
+
+    async def after(response: httpx.Response) -> None:
+        scheduler.record(
+            str(response.request.url),
+            response.status_code,
+            response.headers.get("retry-after"),
+        )
+
+    return {"request": [before], "response": [after]}
@@ -0,0 +1,218 @@
+"""Page post-processing: cleaning, language detection and RawDocument creation.
+
+`clean_text` and langdetect are CPU-bound (regex passes over up to 50k chars,
+n-gram scoring), so pages are processed in batches in a process pool rather
+than on the event loop that also serves chat requests. Workers only compute;
+metrics are recorded in the parent process, where the OTel exporters live.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+from agent.scraper.cleaner import clean_text
+from agent.scraper.config import POSTPROCESS_BATCH_SIZE, POSTPROCESS_WORKERS
+from agent.scraper.langid import identify
+from agent.scraper.metrics import (
+    language_detection_rate,
+    language_detections,
+    page_content_size,
+    pages_dropped,
+    pages_scraped,
+)
+from agent.scraper.models import RawDocument, SourceType
+
+logger = logging.getLogger(__name__)
+
+# receives each document of a phase as soon as it is cleaned
+DocumentSink = Callable[[RawDocument], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class PageText:
+    """What a worker needs from a crawled page."""
+
+    url: str
+    title: str
+    markdown: str | None
+
+
+@dataclass(frozen=True)
+class Outcome:
+    document: RawDocument | None
+    drop_reason: str | None = None
+    langid_method: str | None = None  # None when dropped before detection
+    langid_seconds: float = 0.0
+
+
+def process_page(
+    page: PageText, source_type: SourceType, company: str, now: datetime
+) -> Outcome:
+    """Clean one page and build its document, or say why it was dropped."""
+    if not page.markdown:
+        return Outcome(None, "no_markdown")
+    cleaned = clean_text(page.markdown)
+    if cleaned is None:
+        return Outcome(None, "too_short")
+    t0 = time.perf_counter()
+    verdict = identify(cleaned, page.url)
+    elapsed = time.perf_counter() - t0
+    if verdict.language not in ("en", ""):
+        return Outcome(None, "not_english", verdict.method, elapsed)
+    return Outcome(
+        RawDocument(
+            url=page.url,
+            title=page.title or page.url,
+            content=cleaned,
+            source_type=source_type,
+            company=company,
+            scraped_at=now,
+        ),
+        langid_method=verdict.method,
+        langid_seconds=elapsed,
+    )
+
+
+def _process_batch(
+    pages: list[PageText], source_type: SourceType, company: str, now: datetime
+) -> list[Outcome]:
+    return [process_page(page, source_type, company, now) for page in pages]
+
+
+def record_outcome(
+    page: PageText, outcome: Outcome, source_type: SourceType, company: str
+) -> None:
+    attrs = {"source_type": source_type, "company": company}
+    if outcome.langid_method is not None:
+        language_detections.add(1, {"method": outcome.langid_method})
+    if outcome.document is None:
+        logger.debug("Dropped %s: %s", page.url, outcome.drop_reason)
+        pages_dropped.add(1, {**attrs, "reason": outcome.drop_reason or "unknown"})
+        return
+    pages_scraped.add(1, attrs)
+    page_content_size.record(len(outcome.document.content), attrs)
+
+
+def _record_langid_rate(outcomes: list[Outcome]) -> None:
+    detected = [o for o in outcomes if o.langid_method is not None]
+    seconds = sum(o.langid_seconds for o in detected)
+    if seconds > 0:
+        language_detection_rate.record(len(detected) / seconds)
+
+
+@lru_cache(maxsize=1)
+def get_postprocess_pool() -> ProcessPoolExecutor | None:
+    """Process-wide worker pool, or None when POSTPROCESS_WORKERS is 0.
+
+    Workers are spawned rather than forked: the parent runs the crawler loop
+    thread, and forking a threaded process can copy held locks.
+    """
+    if POSTPROCESS_WORKERS <= 0:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=POSTPROCESS_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_postprocess_pool() -> None:
+    if get_postprocess_pool.cache_info().currsize:
+        pool = get_postprocess_pool()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        get_postprocess_pool.cache_clear()
+
+
+class PageProcessor:
+    """Collects crawled pages of one phase and turns them into documents.
+
+    `add` only queues the page; every POSTPROCESS_BATCH_SIZE pages a batch is
+    handed to the pool, so processing overlaps with the crawl. Each batch is
+    collected as soon as its worker is done: with `on_document`, every kept
+    document is passed to it right away, in page order. `finish` waits for
+    the outstanding batches and returns the documents in page order.
+    """
+
+    def __init__(
+        self,
+        source_type: SourceType,
+        company: str,
+        now: datetime,
+        on_document: DocumentSink | None = None,
+    ) -> None:
+        self.source_type = source_type
+        self.company = company
+        self.now = now
+        self.on_document = on_document
+        self._batch: list[PageText] = []
+        self._collected: list[asyncio.Task[list[RawDocument]]] = []
+
+    def add(self, page: PageText) -> None:
+        self._batch.append(page)
+        if len(self._batch) >= POSTPROCESS_BATCH_SIZE:
+            self._submit()
+
+    def _submit(self) -> None:
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        loop = asyncio.get_running_loop()
+        args = (batch, self.source_type, self.company, self.now)
+        pool = get_postprocess_pool()
+        future: asyncio.Future[list[Outcome]] | None = None
+        if pool is not None:
+            try:
+                future = loop.run_in_executor(pool, _process_batch, *args)
+            except BrokenProcessPool:
+                logger.warning("Post-processing pool is broken; restarting it")
+                shutdown_postprocess_pool()
+        if future is None:
+            future = loop.create_future()
+            future.set_result(_process_batch(*args))
+        previous = self._collected[-1] if self._collected else None
+        self._collected.append(
+            asyncio.create_task(self._collect(batch, future, previous))
+        )
+
+    async def _collect(
+        self,
+        batch: list[PageText],
+        future: asyncio.Future[list[Outcome]],
+        previous: asyncio.Task[list[RawDocument]] | None,
+    ) -> list[RawDocument]:
+        try:
+            outcomes = await future
+        except BrokenProcessPool:
+            # a worker died (e.g. OOM-killed); redo its batch here
+            logger.warning("Post-processing worker died; processing inline")
+            shutdown_postprocess_pool()
+            outcomes = _process_batch(batch, self.source_type, self.company, self.now)
+        if previous is not None:
+            # keeps documents (and the dedup "first copy wins") in page order
+            await asyncio.wait([previous])
+        _record_langid_rate(outcomes)
+        documents: list[RawDocument] = []
+        for page, outcome in zip(batch, outcomes, strict=True):
+            record_outcome(page, outcome, self.source_type, self.company)
+            if outcome.document is not None:
+                documents.append(outcome.document)
+                if self.on_document is not None:
+                    await self.on_document(outcome.document)
+        return documents
+
+    async def finish(self) -> list[RawDocument]:
+        self._submit()
+        collected, self._collected = self._collected, []
+        documents: list[RawDocument] = []
+        for task in collected:
+            documents.extend(await task)
+        return documents
@@ -0,0 +1,177 @@
+"""Sitemap-driven page discovery.
+
+Collects sitemap locations from robots.txt ``Sitemap:`` lines (falling back
+to ``/sitemap.xml``), follows sitemap indexes, and parses every file as a
+stream with XMLPullParser, so multi-megabyte (and gzipped) sitemaps never sit
+in memory whole. The entries are ranked with the same path-keyword scoring as
+the best-first frontier, newest ``lastmod`` first among equals.
+
+Runs on the crawler loop (see _compat.py): requests share the robots cache
+and the per-domain politeness scheduler with page fetches.
+"""
+
+from __future__ import annotations
+
+import logging
+import zlib
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from urllib.parse import urljoin, urlparse
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+import httpx
+
+from agent.scraper.browser_pool import BROWSER_CONFIG
+from agent.scraper.config import (
+    SITEMAP_MAX_BYTES,
+    SITEMAP_MAX_FILES,
+    SITEMAP_MAX_URLS,
+    SITEMAP_TIMEOUT,
+)
+from agent.scraper.frontier import score_link
+from agent.scraper.netcache import cached_dns_transport, get_robots_cache
+from agent.scraper.politeness import get_scheduler, registered_domain
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class SitemapEntry:
+    url: str
+    lastmod: datetime | None = None
+    is_sitemap: bool = False  # a child sitemap listed in a sitemap index
+
+
+def _parse_lastmod(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+async def _iter_sitemap(
+    client: httpx.AsyncClient, url: str
+) -> AsyncGenerator[SitemapEntry]:
+    """Stream one sitemap file (plain or gzipped), yielding its entries."""
+    scheduler = get_scheduler()
+    await scheduler.acquire(url)
+    parser: XMLPullParser[Element] = XMLPullParser(events=("end",))
+    received = 0
+    try:
+        async with client.stream("GET", url) as resp:
+            scheduler.record(url, resp.status_code, resp.headers.get("retry-after"))
+            if resp.status_code != 200:
+                return
+            inflate: zlib._Decompress | None = None
+            first = True
+            async for chunk in resp.aiter_bytes():
+                if first:
+                    first = False
+                    if chunk.startswith(_GZIP_MAGIC):
+                        inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                data = inflate.decompress(chunk) if inflate else chunk
+                received += len(data)
+                if received > SITEMAP_MAX_BYTES:
+                    logger.info("Sitemap %s exceeds %d bytes", url, SITEMAP_MAX_BYTES)
+                    return
+                parser.feed(data)
+                for event in parser.read_events():
+                    el = event[-1]
+                    if not isinstance(el, Element):
+                        continue
+                    kind = _local(el.tag)
+                    if kind not in ("url", "sitemap"):
+                        continue
+                    fields = {_local(child.tag): (child.text or "") for child in el}
+                    el.clear()
+                    loc = fields.get("loc", "").strip()
+                    if loc:
+                        yield SitemapEntry(
+                            url=loc,
+                            lastmod=_parse_lastmod(fields.get("lastmod")),
+                            is_sitemap=kind == "sitemap",
+                        )
+    except (httpx.HTTPError, ParseError, zlib.error):
+        logger.debug("Unreadable sitemap %s", url, exc_info=True)
+
+
+async def _sitemap_locations(homepage_url: str) -> list[str]:
+    robots = get_robots_cache()
+    listed = await robots.sitemaps(homepage_url)
+    return listed or [urljoin(homepage_url, "/sitemap.xml")]
+
+
+async def collect_sitemap_entries(homepage_url: str) -> list[SitemapEntry]:
+    """Page entries from the site's sitemaps, on the homepage's domain.
+
+    Sitemap indexes are followed up to SITEMAP_MAX_FILES files, most relevant
+    (by path keywords) and most recently modified children first; at most
+    SITEMAP_MAX_URLS page entries are read.
+    """
+    domain = registered_domain(homepage_url)
+    queue = await _sitemap_locations(homepage_url)
+    fetched: set[str] = set()
+    pages: dict[str, SitemapEntry] = {}
+
+    async with httpx.AsyncClient(
+        timeout=SITEMAP_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": BROWSER_CONFIG.user_agent},
+        transport=cached_dns_transport(),
+    ) as client:
+        while queue and len(fetched) < SITEMAP_MAX_FILES:
+            url = queue.pop(0)
+            if url in fetched or registered_domain(url) != domain:
+                continue
+            fetched.add(url)
+            children: list[SitemapEntry] = []
+            async with aclosing(_iter_sitemap(client, url)) as entries:
+                async for entry in entries:
+                    if entry.is_sitemap:
+                        children.append(entry)
+                    elif registered_domain(entry.url) == domain:
+                        pages.setdefault(entry.url, entry)
+                        if len(pages) >= SITEMAP_MAX_URLS:
+                            break
+            if len(pages) >= SITEMAP_MAX_URLS:
+                break
+            children.sort(key=_rank, reverse=True)
+            queue.extend(child.url for child in children)
+
+    logger.info(
+        "Sitemaps for %s: %d files, %d page entries",
+        homepage_url,
+        len(fetched),
+        len(pages),
+    )
+    return list(pages.values())
+
+
+def _path_depth(url: str) -> int:
+    return max(0, len([p for p in urlparse(url).path.split("/") if p]) - 1)
+
+
+def _rank(entry: SitemapEntry) -> tuple[float, float]:
+    score = score_link(entry.url, "", _path_depth(entry.url))
+    return score, entry.lastmod.timestamp() if entry.lastmod else 0.0
+
+
+def select_sitemap_urls(
+    homepage_url: str, entries: list[SitemapEntry], limit: int
+) -> list[str]:
+    """Homepage plus the best-ranked entries with a positive keyword score."""
+    candidates = [entry for entry in entries if _rank(entry)[0] > 0]
+    candidates.sort(key=_rank, reverse=True)
+    urls = [homepage_url] + [e.url for e in candidates if e.url != homepage_url]
+    return urls[:limit]
@@ -1,32 +1,345 @@
+"""Raw document storage under ``data_dir/<company>/``.
+
+Every scrape writes a new generation directory, ``raw.<generation>/``, while
+readers keep using the published one; `publish_generation` then switches
+readers by atomically replacing the RAW_CURRENT_FILE pointer, and
+`remove_stale_generations` deletes the older directories. A company without a
+pointer is read from the unversioned ``raw/`` directory (older data, the
+golden test data).
+
+Two layouts are read; RAW_STORE_FORMAT picks the one written:
+
+- ``records``: all bodies of a company back to back in one append-only file
+  (RAW_RECORDS_FILE), plus a small JSON index (RAW_INDEX_FILE) holding each
+  document's metadata and the (offset, length) of its body. Listing and
+  metadata reads never touch the bodies; RecordStore memory-maps the record
+  file and decodes a body only when it is asked for. Bodies are
+  zstd-compressed one by one when RAW_COMPRESSION allows (see
+  `agent.scraper.compression`); the index names the codec and dictionary.
+- ``markdown``: one ``{source_type}_{idx:03d}.md`` file per document with a
+  frontmatter block (the original layout, still used by the golden test data).
+
+`convert_markdown_store` rewrites a markdown company directory as records,
+`recompress_raw_store` rewrites a store with the current codec.
+
+Publishing and wiping keep the catalog (`agent.scraper.catalog`) in step, so
+`list_companies` reads one file instead of scanning every company directory.
+"""
+
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import mmap
+import os
 import shutil
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from pathlib import Path
+from types import TracebackType
+from typing import Any
 
-from agent.scraper.models import RawDocument
+from agent.scraper.catalog import CatalogEntry, edit_catalog, read_catalog
+from agent.scraper.compression import (
+    NO_COMPRESSION,
+    Codec,
+    compressor,
+    decompressor,
+    default_codec,
+    train_dictionary,
+)
+from agent.scraper.config import (
+    RAW_CURRENT_FILE,
+    RAW_DICT_MAX_SAMPLES,
+    RAW_DICT_MIN_SAMPLES,
+    RAW_DICT_SAMPLE_BYTES,
+    RAW_INDEX_FILE,
+    RAW_RECORDS_FILE,
+    RAW_STORE_FORMAT,
+)
+from agent.scraper.metrics import raw_compression_ratio, raw_load_throughput
+from agent.scraper.models import RawDocument, SourceType
 
 logger = logging.getLogger(__name__)
 
+_INDEX_VERSION = 2  # 1: uncompressed, without "size" and codec fields
+_SOURCE_TYPES = ("website", "wikipedia", "search")
+
+
+def current_generation(company: str, base_dir: Path) -> int | None:
+    """The published generation, or None when readers use ``raw/``."""
+    try:
+        return int((base_dir / company / RAW_CURRENT_FILE).read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _raw_dir(company: str, base_dir: Path, generation: int | None = None) -> Path:
+    """Directory of `generation`, or of the published one by default."""
+    if generation is None:
+        generation = current_generation(company, base_dir)
+    if generation is None:
+        return base_dir / company / "raw"
+    return base_dir / company / f"raw.{generation}"
+
+
+def _generations(company: str, base_dir: Path) -> list[int]:
+    company_dir = base_dir / company
+    if not company_dir.is_dir():
+        return []
+    found = []
+    for path in company_dir.glob("raw.*"):
+        suffix = path.name.removeprefix("raw.")
+        if path.is_dir() and suffix.isdigit():
+            found.append(int(suffix))
+    return found
+
+
+def new_generation(company: str, base_dir: Path) -> int:
+    """Create an empty staging directory and return its generation.
+
+    Generations are millisecond timestamps, bumped past any existing one, so
+    they also order generations across companies (the vector store tags points
+    with them).
+    """
+    latest = max(_generations(company, base_dir), default=0)
+    generation = max(time.time_ns() // 1_000_000, latest + 1)
+    _raw_dir(company, base_dir, generation).mkdir(parents=True)
+    return generation
+
+
+def publish_generation(
+    company: str, base_dir: Path, generation: int, ingested: bool = False
+) -> None:
+    """Switch readers to `generation` with an atomic pointer replace.
+
+    `ingested` says its documents are already in the vector store; otherwise
+    the catalog marks the company's ingestion pending (unless the content is
+    unchanged).
+    """
+    pointer = base_dir / company / RAW_CURRENT_FILE
+    tmp = pointer.with_suffix(".tmp")
+    tmp.write_text(str(generation))
+    os.replace(tmp, pointer)
+    logger.info("Published raw generation %d for '%s'", generation, company)
+    _catalog_publish(company, base_dir, ingested)
+
+
+def remove_stale_generations(company: str, base_dir: Path) -> int:
+    """Delete generations older than the published one (and ``raw/``).
+
+    Newer unpublished directories are left alone: they may belong to a scrape
+    that is still staging.
+    """
+    current = current_generation(company, base_dir)
+    if current is None:
+        return 0
+    stale = [
+        _raw_dir(company, base_dir, g)
+        for g in _generations(company, base_dir)
+        if g < current
+    ]
+    legacy = base_dir / company / "raw"
+    if legacy.is_dir():
+        stale.append(legacy)
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+    if stale:
+        logger.info("Removed %d stale raw generations for '%s'", len(stale), company)
+    return len(stale)
+
+
+def has_raw_data(company: str, base_dir: Path) -> bool:
+    return _raw_dir(company, base_dir).is_dir()
 
-def _raw_dir(company: str, base_dir: Path) -> Path:
-    return base_dir / company / "raw"
+
+@dataclass(frozen=True)
+class DocumentRecord:
+    """Index entry: a document's metadata and where its body is stored."""
+
+    url: str
+    title: str
+    source_type: SourceType
+    company: str
+    scraped_at: str  # ISO 8601
+    offset: int
+    length: int  # bytes stored in the record file
+    size: int  # bytes of UTF-8 body
+    content_hash: str = ""  # of the UTF-8 body; "" in stores written before
+
+
+def _content_hash(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _read_index(raw: Path) -> tuple[Codec, list[DocumentRecord]] | None:
+    """Codec and index entries, or None when the directory has no record store."""
+    try:
+        data = json.loads((raw / RAW_INDEX_FILE).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    version = data.get("version")
+    if version == 1:
+        entries = [entry | {"size": entry["length"]} for entry in data["documents"]]
+        return NO_COMPRESSION, [DocumentRecord(**entry) for entry in entries]
+    if version != _INDEX_VERSION:
+        raise ValueError(f"Unsupported raw index version in {raw}")
+    codec = Codec(data["codec"], data["dictionary"])
+    return codec, [DocumentRecord(**entry) for entry in data["documents"]]
+
+
+def _write_index(raw: Path, codec: Codec, records: list[DocumentRecord]) -> None:
+    path = raw / RAW_INDEX_FILE
+    tmp = path.with_suffix(".tmp")
+    payload = {
+        "version": _INDEX_VERSION,
+        "codec": codec.name,
+        "dictionary": codec.dictionary,
+        "documents": [asdict(r) for r in records],
+    }
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _base_dir(raw: Path) -> Path:
+    """data_dir of a ``<data_dir>/<company>/raw*`` directory."""
+    return raw.parent.parent
+
+
+class RecordStore:
+    """Read access to one company's record file; bodies are decoded lazily."""
+
+    def __init__(
+        self, raw: Path, records: list[DocumentRecord], codec: Codec = NO_COMPRESSION
+    ) -> None:
+        self.raw = raw
+        self.records = records
+        self.codec = codec
+        self._decompress = decompressor(codec, _base_dir(raw))
+        self._file = open(raw / RAW_RECORDS_FILE, "rb")  # noqa: SIM115
+        size = os.fstat(self._file.fileno()).st_size
+        # an empty file cannot be mapped
+        self._map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        )
+
+    @classmethod
+    def open(cls, raw: Path) -> RecordStore | None:
+        index = _read_index(raw)
+        if index is None:
+            return None
+        codec, records = index
+        return cls(raw, records, codec)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __enter__(self) -> RecordStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def content(self, record: DocumentRecord) -> str:
+        if self._map is None or not record.length:
+            return ""
+        body = self._map[record.offset : record.offset + record.length]
+        if self._decompress is not None:
+            body = self._decompress(body)
+        return body.decode("utf-8")
+
+    def document(self, record: DocumentRecord) -> RawDocument:
+        return RawDocument(
+            url=record.url,
+            title=record.title,
+            content=self.content(record),
+            source_type=record.source_type,
+            company=record.company,
+            scraped_at=datetime.fromisoformat(record.scraped_at),
+        )
+
+    def documents(self) -> Iterator[RawDocument]:
+        for record in self.records:
+            yield self.document(record)
 
 
 def wipe_raw_data(company: str, base_dir: Path) -> None:
-    target = _raw_dir(company, base_dir)
-    if target.exists():
-        shutil.rmtree(target)
-        logger.info("Wiped raw data at %s", target)
+    """Delete every generation of a company's raw data and its pointer."""
+    company_dir = base_dir / company
+    targets = [_raw_dir(company, base_dir, g) for g in _generations(company, base_dir)]
+    targets.append(company_dir / "raw")
+    for target in targets:
+        if target.exists():
+            shutil.rmtree(target)
+            logger.info("Wiped raw data at %s", target)
+    (company_dir / RAW_CURRENT_FILE).unlink(missing_ok=True)
+    with edit_catalog(base_dir, lambda: _scan_catalog(base_dir)) as entries:
+        entries.pop(company, None)
 
 
-def save_raw_documents(
-    company: str, documents: list[RawDocument], base_dir: Path
-) -> int:
-    target = _raw_dir(company, base_dir)
-    target.mkdir(parents=True, exist_ok=True)
+def _append_records(raw: Path, documents: list[RawDocument]) -> int:
+    """Append bodies to the record file, then publish them in the index.
+
+    The index is replaced atomically after the bodies are on disk, so a crash
+    leaves at most unreferenced bytes at the end of the record file. A new
+    store gets the default codec; appends keep the store's own.
+    """
+    index = _read_index(raw)
+    codec, records = index or (default_codec(_base_dir(raw)), [])
+    compress = compressor(codec, _base_dir(raw))
+    size = stored = 0
+    with open(raw / RAW_RECORDS_FILE, "ab") as f:
+        offset = f.tell()
+        for doc in documents:
+            body = doc.content.encode("utf-8")
+            data = compress(body) if compress is not None else body
+            f.write(data)
+            records.append(
+                DocumentRecord(
+                    url=doc.url,
+                    title=doc.title,
+                    source_type=doc.source_type,
+                    company=doc.company,
+                    scraped_at=doc.scraped_at.isoformat(),
+                    offset=offset,
+                    length=len(data),
+                    size=len(body),
+                    content_hash=_content_hash(body),
+                )
+            )
+            offset += len(data)
+            size += len(body)
+            stored += len(data)
+        f.flush()
+        os.fsync(f.fileno())
+    _write_index(raw, codec, records)
+    if stored:
+        ratio = size / stored
+        raw_compression_ratio.record(ratio, {"codec": codec.name})
+        logger.info(
+            "Stored %d body bytes in %d (%s, ratio %.2f)",
+            size,
+            stored,
+            codec.name,
+            ratio,
+        )
+    return len(documents)
+
 
+def _write_markdown(raw: Path, documents: list[RawDocument]) -> int:
     counters: dict[str, int] = {"website": 0, "search": 0, "wikipedia": 0}
     count = 0
 
@@ -45,19 +358,42 @@ def save_raw_documents(
             f"---\n\n"
         )
 
-        path = target / filename
+        path = raw / filename
         path.write_text(frontmatter + doc.content, encoding="utf-8")
         count += 1
+    return count
+
+
+def save_raw_documents(
+    company: str,
+    documents: list[RawDocument],
+    base_dir: Path,
+    generation: int | None = None,
+) -> int:
+    """Write documents into a staged generation.
+
+    Without `generation`, a new one is created, written and published right
+    away, replacing the company's previous raw data.
+    """
+    publish = generation is None
+    if generation is None:
+        generation = new_generation(company, base_dir)
+    target = _raw_dir(company, base_dir, generation)
+    target.mkdir(parents=True, exist_ok=True)
+
+    if RAW_STORE_FORMAT == "markdown":
+        count = _write_markdown(target, documents)
+    else:
+        count = _append_records(target, documents)
 
     logger.info("Saved %d documents to %s", count, target)
+    if publish:
+        publish_generation(company, base_dir, generation)
+        remove_stale_generations(company, base_dir)
     return count
 
 
-def load_raw_documents(company: str, base_dir: Path) -> list[RawDocument]:
-    raw = _raw_dir(company, base_dir)
-    if not raw.exists():
-        return []
-
+def _load_markdown(raw: Path, company: str) -> list[RawDocument]:
     docs: list[RawDocument] = []
     for path in sorted(raw.glob("*.md")):
         text = path.read_text(encoding="utf-8")
@@ -84,8 +420,8 @@ def load_raw_documents(company: str, base_dir: Path) -> list[RawDocument]:
         except ValueError:
             scraped_at = datetime.now(UTC)
 
-        source_type = meta.get("source_type", "website")
-        if source_type not in ("website", "wikipedia", "search"):
+        source_type: Any = meta.get("source_type", "website")
+        if source_type not in _SOURCE_TYPES:
             source_type = "website"
 
         docs.append(
@@ -93,25 +429,205 @@ def load_raw_documents(company: str, base_dir: Path) -> list[RawDocument]:
                 url=meta.get("url", ""),
                 title=meta.get("title", ""),
                 content=body,
-                source_type=source_type,  # type: ignore[arg-type]
+                source_type=source_type,
                 company=meta.get("company", company),
                 scraped_at=scraped_at,
             )
         )
+    return docs
+
+
+def load_raw_documents(
+    company: str, base_dir: Path, generation: int | None = None
+) -> list[RawDocument]:
+    """Documents of `generation`, or of the published generation by default."""
+    raw = _raw_dir(company, base_dir, generation)
+    if not raw.exists():
+        return []
+
+    store = RecordStore.open(raw)
+    if store is not None:
+        t0 = time.perf_counter()
+        with store:
+            docs = list(store.documents())
+        seconds = time.perf_counter() - t0
+        if seconds > 0:
+            size = sum(r.size for r in store.records)
+            raw_load_throughput.record(size / seconds, {"codec": store.codec.name})
+    else:
+        docs = _load_markdown(raw, company)
 
     logger.info("Loaded %d raw documents for '%s'", len(docs), company)
     return docs
 
 
+def _summarize(company: str, base_dir: Path) -> CatalogEntry | None:
+    """Catalog entry for the published data; None when there is none.
+
+    Reads only the index, unless the store predates content hashes (or is
+    markdown) and the bodies have to be hashed.
+    """
+    generation = current_generation(company, base_dir)
+    raw = _raw_dir(company, base_dir, generation)
+    if not raw.is_dir():
+        return None
+    index = _read_index(raw)
+    if index is not None:
+        codec, records = index
+        records_file = raw / RAW_RECORDS_FILE
+        stored = records_file.stat().st_size if records_file.exists() else 0
+        if all(r.content_hash for r in records):
+            hashes = [r.content_hash for r in records]
+        else:
+            with RecordStore(raw, records, codec) as store:
+                hashes = [_content_hash(store.content(r).encode()) for r in records]
+        urls = [r.url for r in records]
+        size = sum(r.size for r in records)
+        times = [datetime.fromisoformat(r.scraped_at) for r in records]
+    else:
+        docs = _load_markdown(raw, company)
+        stored = sum(path.stat().st_size for path in raw.glob("*.md"))
+        bodies = [doc.content.encode("utf-8") for doc in docs]
+        hashes = [_content_hash(body) for body in bodies]
+        urls = [doc.url for doc in docs]
+        size = sum(len(body) for body in bodies)
+        times = [doc.scraped_at for doc in docs]
+
+    digest = hashlib.blake2b(digest_size=16)
+    for url, content_hash in sorted(zip(urls, hashes, strict=True)):
+        digest.update(f"{url}\0{content_hash}\n".encode())
+    return CatalogEntry(
+        company=company,
+        generation=generation,
+        documents=len(hashes),
+        bytes=size,
+        stored_bytes=stored,
+        scraped_at=max(times).isoformat() if times else "",
+        content_hash=digest.hexdigest(),
+    )
+
+
+def _scan_catalog(base_dir: Path) -> dict[str, CatalogEntry]:
+    """Catalog rebuilt from the company directories (no catalog file yet)."""
+    entries: dict[str, CatalogEntry] = {}
+    if base_dir.is_dir():
+        for path in sorted(base_dir.iterdir()):
+            entry = _summarize(path.name, base_dir) if path.is_dir() else None
+            if entry is not None:
+                entry.ingestion = "unknown"
+                entries[entry.company] = entry
+    logger.info("Rebuilt catalog of %d companies in %s", len(entries), base_dir)
+    return entries
+
+
+def _catalog_publish(company: str, base_dir: Path, ingested: bool) -> None:
+    entry = _summarize(company, base_dir)
+    with edit_catalog(base_dir, lambda: _scan_catalog(base_dir)) as entries:
+        previous = entries.pop(company, None)
+        if entry is None:
+            return
+        if ingested:
+            entry.ingestion = "ingested"
+            entry.ingested_at = datetime.now(UTC).isoformat()
+        elif previous is not None and previous.content_hash == entry.content_hash:
+            entry.ingestion = previous.ingestion
+            entry.ingested_at = previous.ingested_at
+        entries[company] = entry
+
+
+def mark_ingested(company: str, base_dir: Path) -> None:
+    """Record that the published documents are in the vector store.
+
+    Only an existing catalog entry is updated; data directories without a
+    catalog (the golden test data) are left untouched.
+    """
+    if read_catalog(base_dir) is None:
+        return
+    with edit_catalog(base_dir, lambda: _scan_catalog(base_dir)) as entries:
+        entry = entries.get(company)
+        if entry is not None:
+            entry.ingestion = "ingested"
+            entry.ingested_at = datetime.now(UTC).isoformat()
+
+
 def list_companies(base_dir: Path) -> list[dict[str, str | int]]:
+    """Published companies with document counts, size and ingestion status.
+
+    Answered from the catalog; the first call on a data directory without one
+    builds it by scanning the company directories.
+    """
     if not base_dir.exists():
         return []
+    entries = read_catalog(base_dir)
+    if entries is None:
+        with edit_catalog(base_dir, lambda: _scan_catalog(base_dir)) as rebuilt:
+            entries = rebuilt
+    return [entries[name].listing() for name in sorted(entries)]
 
-    result: list[dict[str, str | int]] = []
-    for entry in sorted(base_dir.iterdir()):
-        raw = entry / "raw"
-        if raw.is_dir():
-            files = list(raw.glob("*.md"))
-            result.append({"company": entry.name, "files": len(files)})
 
-    return result
+def convert_markdown_store(company: str, base_dir: Path) -> int:
+    """Rewrite a company's markdown files as a record store.
+
+    Returns the number of documents converted (0 when there is nothing to
+    convert). The markdown files are removed only after the index is written.
+    """
+    raw = _raw_dir(company, base_dir)
+    if not raw.is_dir() or _read_index(raw) is not None:
+        return 0
+    markdown = sorted(raw.glob("*.md"))
+    if not markdown:
+        return 0
+    docs = _load_markdown(raw, company)
+    (raw / RAW_RECORDS_FILE).unlink(missing_ok=True)  # unindexed leftovers
+    _append_records(raw, docs)
+    for path in markdown:
+        path.unlink()
+    _catalog_publish(company, base_dir, ingested=False)
+    logger.info("Converted %d markdown documents for '%s'", len(docs), company)
+    return len(docs)
+
+
+def _dictionary_samples(documents: list[RawDocument]) -> list[bytes]:
+    step = RAW_DICT_SAMPLE_BYTES
+    samples = [
+        body[i : i + step]
+        for body in (doc.content.encode("utf-8") for doc in documents)
+        for i in range(0, len(body), step)
+    ]
+    if len(samples) > RAW_DICT_MAX_SAMPLES:
+        stride = len(samples) / RAW_DICT_MAX_SAMPLES
+        samples = [samples[int(i * stride)] for i in range(RAW_DICT_MAX_SAMPLES)]
+    return samples
+
+
+def train_raw_dictionary(base_dir: Path) -> int | None:
+    """Train the shared compression dictionary on every published document.
+
+    Returns its ID, or None when the corpus has fewer than
+    RAW_DICT_MIN_SAMPLES samples. Only stores written afterwards use it;
+    `recompress_raw_store` rewrites older ones.
+    """
+    documents = [
+        doc
+        for entry in list_companies(base_dir)
+        for doc in load_raw_documents(str(entry["company"]), base_dir)
+    ]
+    samples = _dictionary_samples(documents)
+    if len(samples) < RAW_DICT_MIN_SAMPLES:
+        logger.info("Too few samples (%d) to train a dictionary", len(samples))
+        return None
+    return train_dictionary(samples, base_dir)
+
+
+def recompress_raw_store(company: str, base_dir: Path) -> int:
+    """Rewrite the published store with the default codec, as a new generation.
+
+    Returns the number of documents rewritten (0 when the store already uses
+    the default codec). Readers switch over when the generation is published.
+    """
+    raw = _raw_dir(company, base_dir)
+    index = _read_index(raw)
+    if index is None or index[0] == default_codec(base_dir):
+        return 0
+    documents = load_raw_documents(company, base_dir)
+    return save_raw_documents(company, documents, base_dir)
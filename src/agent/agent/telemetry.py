@@ -52,6 +52,20 @@ def configure_telemetry() -> None:
                 boundaries=[100, 500, 1000, 5000, 10000, 25000, 50000]
             ),
         ),
+        View(
+            instrument_type=Histogram,
+            instrument_name="scraper.browser_wait_time",
+            aggregation=ExplicitBucketHistogramAggregation(
+                boundaries=[0.1, 0.5, 1, 5, 10, 30, 60, 120]
+            ),
+        ),
+        View(
+            instrument_type=Histogram,
+            instrument_name="scraper.politeness_wait",
+            aggregation=ExplicitBucketHistogramAggregation(
+                boundaries=[0.1, 0.5, 1, 2, 5, 10, 30, 60]
+            ),
+        ),
         View(
             instrument_type=Histogram,
             aggregation=ExplicitBucketHistogramAggregation(),
@@ -1,22 +1,51 @@
+"""Qdrant access: hybrid search plus generation-tagged writes.
+
+Ingestion writes every point with a ``generation`` payload field (and a point
+ID derived from it, so a new generation never overwrites the live one).
+GENERATIONS_COLLECTION records each company's live generation, and
+`publish_generation` sets an indexed ``live`` flag on that generation's points
+(clearing it on the ones it replaces). Searches filter on the flag alone, so
+their cost does not grow with the number of companies; a re-ingest stays
+invisible until it is published, and the previous generation is deleted
+afterwards with `delete_stale_generations`. Points without a generation
+(written before generations existed) stay live until their company publishes
+one.
+
+Points also carry ``doc_hash``/``chunk_hash``. Incremental ingestion reads
+them with `live_chunks` and, instead of re-embedding unchanged chunks, adds
+their existing points to the staged generation with `carry_over` (the field
+then holds both generations until the old one is retired).
+"""
+
 from __future__ import annotations
 
 import logging
+import uuid
 from dataclasses import dataclass, field
 from functools import lru_cache
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
+    Condition,
     Distance,
+    ExtendedPointId,
     FieldCondition,
     Filter,
     Fusion,
     FusionQuery,
+    IsEmptyCondition,
+    MatchAny,
     MatchValue,
     NamedSparseVector,
     NamedVector,
+    PayloadField,
     PayloadSchemaType,
+    PointIdsList,
     PointStruct,
     Prefetch,
+    Range,
+    SetPayload,
+    SetPayloadOperation,
     SparseVector,
     SparseVectorParams,
     VectorParams,
@@ -30,6 +59,7 @@ from agent.vectorstore.config import (
     DENSE_DIM,
     DENSE_SCORE_THRESHOLD,
     DENSE_VECTOR_NAME,
+    GENERATIONS_COLLECTION,
     SEARCH_DENSE_LIMIT,
     SEARCH_FUSION_LIMIT,
     SEARCH_SPARSE_LIMIT,
@@ -40,9 +70,65 @@ from agent.vectorstore.config import (
 logger = logging.getLogger(__name__)
 
 
+_GENERATION = "generation"
+_LIVE = "live"
+
+
+def _point_id(chunk_id: str, generation: int | None) -> str:
+    if generation is None:
+        return chunk_id
+    return str(uuid.uuid5(uuid.UUID(chunk_id), str(generation)))
+
+
+def _company_key(company: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"company:{company}"))
+
+
+def _company_is(company: str) -> FieldCondition:
+    return FieldCondition(key="company", match=MatchValue(value=company))
+
+
+_UNVERSIONED = IsEmptyCondition(is_empty=PayloadField(key=_GENERATION))
+_IS_LIVE = FieldCondition(key=_LIVE, match=MatchValue(value=True))
+_UNFLAGGED = IsEmptyCondition(is_empty=PayloadField(key=_LIVE))
+
+
+def _stale(company: str, live: int) -> Filter:
+    """Points of `company` that only belong to generations before `live`.
+
+    Newer generations may be staged by a gather still running, so they are
+    kept, like `remove_stale_generations` keeps newer raw directories. Points
+    carried over into `live` also hold an older generation and are kept too.
+    """
+    return Filter(
+        must=[
+            _company_is(company),
+            Filter(
+                should=[
+                    FieldCondition(key=_GENERATION, range=Range(lt=live)),
+                    _UNVERSIONED,
+                ]
+            ),
+        ],
+        must_not=[FieldCondition(key=_GENERATION, match=MatchValue(value=live))],
+    )
+
+
+@dataclass(frozen=True)
+class StoredChunk:
+    """A live point and the content hashes it was embedded from."""
+
+    point_id: str
+    url: str
+    chunk_index: int
+    doc_hash: str
+    chunk_hash: str
+
+
 @dataclass
 class VectorStoreService:
     _client: QdrantClient = field(init=False)
+    _live: dict[str, int] = field(init=False, default_factory=dict)
 
     def __post_init__(self) -> None:
         settings = get_settings()
@@ -51,10 +137,17 @@ class VectorStoreService:
             api_key=settings.qdrant_api_key,
         )
         self._ensure_collection()
+        self._load_generations()
+        self._flag_legacy_points()
 
     def _ensure_collection(self) -> None:
         collections = [c.name for c in self._client.get_collections().collections]
+        if GENERATIONS_COLLECTION not in collections:
+            self._client.create_collection(
+                collection_name=GENERATIONS_COLLECTION, vectors_config={}
+            )
         if COLLECTION_NAME in collections:
+            self._ensure_generation_index()
             return
 
         self._client.create_collection(
@@ -79,13 +172,112 @@ class VectorStoreService:
             field_name="source_type",
             field_schema=PayloadSchemaType.KEYWORD,
         )
+        self._ensure_generation_index()
         logger.info("Created Qdrant collection '%s'", COLLECTION_NAME)
 
+    def _ensure_generation_index(self) -> None:
+        # idempotent; collections created before generations lack them
+        self._client.create_payload_index(
+            collection_name=COLLECTION_NAME,
+            field_name=_GENERATION,
+            field_schema=PayloadSchemaType.INTEGER,
+        )
+        self._client.create_payload_index(
+            collection_name=COLLECTION_NAME,
+            field_name=_LIVE,
+            field_schema=PayloadSchemaType.BOOL,
+        )
+
+    def _load_generations(self) -> None:
+        offset = None
+        while True:
+            records, offset = self._client.scroll(
+                collection_name=GENERATIONS_COLLECTION,
+                limit=256,
+                offset=offset,
+                with_payload=True,
+            )
+            for record in records:
+                payload = record.payload or {}
+                self._live[str(payload["company"])] = int(payload[_GENERATION])
+            if offset is None:
+                break
+
+    def _set_live(self, selector: Filter | PointIdsList, live: bool) -> None:
+        self._client.set_payload(
+            collection_name=COLLECTION_NAME, payload={_LIVE: live}, points=selector
+        )
+
+    def _flag_legacy_points(self) -> None:
+        """Flag points written before the ``live`` flag existed (idempotent)."""
+        for company, live in self._live.items():
+            self._set_live(
+                Filter(
+                    must=[
+                        _company_is(company),
+                        FieldCondition(key=_GENERATION, match=MatchValue(value=live)),
+                        _UNFLAGGED,
+                    ]
+                ),
+                True,
+            )
+        published: list[Condition] = (
+            [FieldCondition(key="company", match=MatchAny(any=list(self._live)))]
+            if self._live
+            else []
+        )
+        self._set_live(
+            Filter(must=[_UNVERSIONED, _UNFLAGGED], must_not=published), True
+        )
+
+    def _writes_live(self, company: str, generation: int | None) -> bool:
+        """Whether points written now into `generation` are searchable."""
+        return generation is None or self._live.get(company) == generation
+
+    def live_generation(self, company: str) -> int | None:
+        return self._live.get(company)
+
+    def publish_generation(self, company: str, generation: int) -> None:
+        """Make `generation` the one searches see for the company.
+
+        The new points are flagged before the old ones are unflagged, so
+        searches briefly see both rather than neither.
+        """
+        self._client.upsert(
+            collection_name=GENERATIONS_COLLECTION,
+            points=[
+                PointStruct(
+                    id=_company_key(company),
+                    vector={},
+                    payload={"company": company, _GENERATION: generation},
+                )
+            ],
+        )
+        # before flagging: an upsert_chunks racing with this sees one or the
+        # other, and flags its own points if it missed the publish
+        self._live[company] = generation
+        in_generation = FieldCondition(
+            key=_GENERATION, match=MatchValue(value=generation)
+        )
+        self._set_live(Filter(must=[_company_is(company), in_generation]), True)
+        self._set_live(
+            Filter(must=[_company_is(company), _IS_LIVE], must_not=[in_generation]),
+            False,
+        )
+        logger.info("Published vector generation %d for '%s'", generation, company)
+
+    def _visible(self, company: str | None) -> Filter:
+        """Live points of `company` (all companies when None)."""
+        if company is None:
+            return Filter(must=[_IS_LIVE])
+        return Filter(must=[_company_is(company), _IS_LIVE])
+
     def upsert_chunks(
         self,
         chunks: list[Chunk],
         dense_vectors: list[list[float]],
         sparse_vectors: list[EmbedSparseVector],
+        generation: int | None = None,
     ) -> int:
         points: list[PointStruct] = []
         for chunk, dense, sparse in zip(
@@ -93,7 +285,7 @@ class VectorStoreService:
         ):
             points.append(
                 PointStruct(
-                    id=chunk.id,
+                    id=_point_id(chunk.id, generation),
                     vector={
                         DENSE_VECTOR_NAME: NamedVector(
                             name=DENSE_VECTOR_NAME, vector=dense
@@ -113,7 +305,11 @@ class VectorStoreService:
                         "source_type": chunk.metadata.source_type,
                         "chunk_index": chunk.metadata.chunk_index,
                         "scraped_at": chunk.metadata.scraped_at.isoformat(),
-                    },
+                        "doc_hash": chunk.metadata.doc_hash,
+                        "chunk_hash": chunk.metadata.chunk_hash,
+                        _LIVE: self._writes_live(chunk.metadata.company, generation),
+                    }
+                    | ({_GENERATION: generation} if generation is not None else {}),
                 )
             )
 
@@ -123,9 +319,89 @@ class VectorStoreService:
             self._client.upsert(collection_name=COLLECTION_NAME, points=batch)
             total += len(batch)
 
+        # the generation may have been published while these were written
+        missed: list[ExtendedPointId] = [
+            point.id
+            for point in points
+            if point.payload is not None
+            and not point.payload[_LIVE]
+            and self._writes_live(str(point.payload["company"]), generation)
+        ]
+        if missed:
+            self._set_live(PointIdsList(points=missed), True)
+
         logger.info("Upserted %d points to Qdrant", total)
         return total
 
+    def live_chunks(self, company: str) -> list[StoredChunk]:
+        """The company's live points with their hashes (payload only).
+
+        Empty when the company has no live generation: unversioned points
+        cannot be carried over without becoming invisible until publish.
+        """
+        if company not in self._live:
+            return []
+        chunks: list[StoredChunk] = []
+        offset = None
+        while True:
+            records, offset = self._client.scroll(
+                collection_name=COLLECTION_NAME,
+                scroll_filter=self._visible(company),
+                limit=1024,
+                offset=offset,
+                with_payload=["url", "chunk_index", "doc_hash", "chunk_hash"],
+                with_vectors=False,
+            )
+            for record in records:
+                p = record.payload or {}
+                chunks.append(
+                    StoredChunk(
+                        point_id=str(record.id),
+                        url=str(p.get("url", "")),
+                        chunk_index=int(p.get("chunk_index", -1)),
+                        doc_hash=str(p.get("doc_hash", "")),
+                        chunk_hash=str(p.get("chunk_hash", "")),
+                    )
+                )
+            if offset is None:
+                break
+        return chunks
+
+    def carry_over(
+        self,
+        company: str,
+        point_ids: list[str],
+        generation: int,
+        payload: dict[str, str],
+        moved: dict[str, int] | None = None,
+    ) -> int:
+        """Add live points to the staged `generation` without re-embedding.
+
+        They stay visible in the live generation meanwhile, and survive
+        `delete_stale_generations` once `generation` is published. `payload`
+        updates fields that may differ in the new generation (hash, date);
+        `moved` maps points whose chunk now sits elsewhere to its new index.
+        """
+        live = self._live[company]
+        self._client.set_payload(
+            collection_name=COLLECTION_NAME,
+            payload={_GENERATION: [live, generation], **payload},
+            points=list(point_ids),
+        )
+        if moved:
+            self._client.batch_update_points(
+                collection_name=COLLECTION_NAME,
+                update_operations=[
+                    SetPayloadOperation(
+                        set_payload=SetPayload(
+                            payload={"chunk_index": index}, points=[point_id]
+                        )
+                    )
+                    for point_id, index in moved.items()
+                ],
+            )
+        return len(point_ids)
+
     def search(
         self,
         dense_vector: list[float],
@@ -133,15 +409,7 @@ class VectorStoreService:
         company: str | None = None,
         limit: int = SEARCH_FUSION_LIMIT,
     ) -> list[dict[str, str]]:
-        query_filter = None
-        if company:
-            query_filter = Filter(
-                must=[
-                    FieldCondition(
-                        key="company", match=MatchValue(value=company.strip().lower())
-                    )
-                ]
-            )
+        query_filter = self._visible(company.strip().lower() if company else None)
 
         response = self._client.query_points(
             collection_name=COLLECTION_NAME,
@@ -183,26 +451,36 @@ class VectorStoreService:
         logger.info("Hybrid search returned %d results", len(results))
         return results
 
-    def delete_company(self, company: str) -> int:
-        result = self._client.count(
-            collection_name=COLLECTION_NAME,
-            count_filter=Filter(
-                must=[FieldCondition(key="company", match=MatchValue(value=company))]
-            ),
-        )
-        count = result.count
-
+    def _delete(self, selector: Filter) -> int:
+        count = self._client.count(
+            collection_name=COLLECTION_NAME, count_filter=selector
+        ).count
         if count > 0:
             self._client.delete(
-                collection_name=COLLECTION_NAME,
-                points_selector=Filter(
-                    must=[
-                        FieldCondition(key="company", match=MatchValue(value=company))
-                    ]
-                ),
+                collection_name=COLLECTION_NAME, points_selector=selector
             )
+        return count
+
+    def delete_stale_generations(self, company: str) -> int:
+        """Delete the company's points older than its live generation."""
+        live = self._live.get(company)
+        if live is None:
+            return 0
+        count = self._delete(_stale(company, live))
+        if count > 0:
+            logger.info("Deleted %d stale points for company '%s'", count, company)
+        return count
+
+    def delete_company(self, company: str) -> int:
+        count = self._delete(Filter(must=[_company_is(company)]))
+        if count > 0:
             logger.info("Deleted %d points for company '%s'", count, company)
 
+        if self._live.pop(company, None) is not None:
+            self._client.delete(
+                collection_name=GENERATIONS_COLLECTION,
+                points_selector=[_company_key(company)],
+            )
         return count
 
 
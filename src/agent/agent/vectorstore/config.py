@@ -1,4 +1,5 @@
 COLLECTION_NAME = "company_intel"
+GENERATIONS_COLLECTION = "company_intel_generations"  # company -> live generation
 DENSE_VECTOR_NAME = "dense"
 SPARSE_VECTOR_NAME = "sparse"
 DENSE_DIM = 384
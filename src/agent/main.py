@@ -13,8 +13,9 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from agent.app import create_agent
-from agent.backoffice import create_backoffice_agent
+from agent.backoffice import create_backoffice_agent, resume_interrupted_scrapes
 from agent.eval import router as eval_router
+from agent.settings import get_settings
 from agent.telemetry import configure_telemetry
 
 configure_telemetry()
@@ -25,11 +26,16 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     from agent.embedder import get_embedder
+    from agent.scraper.fetcher import shutdown_crawler
 
     logger.info("Agent service started")
     get_embedder()
+    resumed = resume_interrupted_scrapes(get_settings().data_dir)
+    if resumed:
+        logger.info("Resumed %d interrupted scrape jobs: %s", len(resumed), resumed)
     yield
     logger.info("Agent service shutting down")
+    await shutdown_crawler()
 
 
 app = FastAPI(title="Company Intelligence Agent", lifespan=lifespan)
@@ -0,0 +1,83 @@
+"""Check the line-based cleaner against the old regex passes, then time both.
+
+Usage (from src/agent):
+
+    uv run python scripts/bench_cleaner.py [--fuzz N] [--repeat N]
+
+The corpus is the golden PayPal pages, hand-written edge cases (cookie
+sections, multi-line images, combining marks, CRLF, whitespace runs) and
+random pages assembled from the same tokens, shared with tests/test_cleaner.py
+(which checks a smaller seeded corpus). Any output that differs from
+`legacy_clean_text` fails the run before anything is timed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from agent.scraper.cleaner import clean_text  # noqa: E402
+from tests.test_cleaner import (  # noqa: E402
+    EDGE_CASES,
+    FILLER,
+    fuzz_pages,
+    golden_pages,
+    legacy_clean_text,
+)
+
+
+def _check(pages: list[str]) -> int:
+    mismatches = 0
+    for i, page in enumerate(pages):
+        expected, actual = legacy_clean_text(page), clean_text(page)
+        if expected != actual:
+            mismatches += 1
+            print(f"MISMATCH page {i}: {page[:120]!r}")
+    return mismatches
+
+
+def _time(fn: Callable[[str], str | None], pages: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            fn(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fuzz", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    golden = golden_pages()
+    corpus = golden + EDGE_CASES + fuzz_pages(args.fuzz)
+    mismatches = _check(corpus)
+    print(f"equivalence: {len(corpus) - mismatches}/{len(corpus)} pages identical")
+    if mismatches:
+        return 1
+
+    page = "\n\n".join(golden)
+    workloads = {
+        "golden pages": golden,
+        "large page (x40 golden)": [page * 40],
+        "many unclosed '!['": [FILLER * 50 + "![" * 20_000],
+        "cookie headings": [("## Cookie settings\n" + FILLER + "\n") * 2_000],
+    }
+    print(f"{'workload':<26}{'legacy':>10}{'clean_text':>12}{'speedup':>9}")
+    for name, pages in workloads.items():
+        old = _time(legacy_clean_text, pages, args.repeat)
+        new = _time(clean_text, pages, args.repeat)
+        print(f"{name:<26}{old * 1e3:>8.1f}ms{new * 1e3:>10.1f}ms{old / new:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
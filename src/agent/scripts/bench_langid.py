@@ -0,0 +1,136 @@
+"""Time language identification: full-text langdetect vs agent.scraper.langid.
+
+Usage (from src/agent):
+
+    uv run python scripts/bench_langid.py [--repeat N]
+
+Reports documents per second for both, how often the verdicts agree, and
+whether the new verdicts are identical across runs (langdetect unseeded is
+not). The corpus is the golden PayPal pages plus short non-English pages.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from langdetect import LangDetectException, detect  # noqa: E402
+
+from agent.scraper import langid  # noqa: E402
+
+GOLDEN_DIR = Path(__file__).resolve().parents[1] / "tests" / "golden"
+
+NON_ENGLISH = {
+    "de": (
+        "PayPal ist ein Online-Zahlungsdienst, mit dem Kunden weltweit Geld "
+        "senden und empfangen können. Das Unternehmen wurde im Jahr 1998 "
+        "gegründet und hat seinen Sitz in San José in Kalifornien. "
+    ),
+    "fr": (
+        "PayPal est un service de paiement en ligne qui permet aux clients "
+        "d'envoyer et de recevoir de l'argent dans le monde entier. La société "
+        "a été fondée en 1998 et son siège se trouve en Californie. "
+    ),
+    "es": (
+        "PayPal es un servicio de pagos en línea que permite a los clientes "
+        "enviar y recibir dinero en todo el mundo. La empresa fue fundada en "
+        "1998 y tiene su sede en San José, California. "
+    ),
+    "uk": (
+        "PayPal — це онлайн-сервіс платежів, який дозволяє клієнтам "
+        "надсилати та отримувати гроші по всьому світу. Компанію засновано "
+        "у 1998 році, її штаб-квартира розташована в Каліфорнії. "
+    ),
+}
+
+
+def legacy_language(text: str) -> str:
+    """What is_english used to run: langdetect on the whole, unseeded."""
+    try:
+        return str(detect(text))
+    except LangDetectException:
+        return ""
+
+
+def _corpus() -> list[tuple[str, str]]:
+    """(url, text) pairs; golden pages are English, one host per source."""
+    pages = []
+    for path in sorted(GOLDEN_DIR.rglob("*.md")):
+        text = path.read_text(encoding="utf-8").split("---", 2)[-1]
+        pages.append(
+            (f"https://{path.stem.split('_')[0]}.paypal.test/{path.stem}", text)
+        )
+    for lang, text in NON_ENGLISH.items():
+        for i in range(4):
+            pages.append((f"https://{lang}.paypal.test/{i}", text * (i + 2)))
+    return pages
+
+
+def _run(fn: Callable[[str, str], str], pages: list[tuple[str, str]]) -> list[str]:
+    return [fn(url, text) for url, text in pages]
+
+
+def _rate(
+    fn: Callable[[str, str], str],
+    pages: list[tuple[str, str]],
+    repeat: int,
+    reset: Callable[[], None],
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        reset()
+        start = time.perf_counter()
+        _run(fn, pages)
+        best = min(best, time.perf_counter() - start)
+    return len(pages) / best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = _corpus()
+    langid._factory()  # load the profiles outside the timings
+    legacy_language("warm up")
+
+    def new(url: str, text: str) -> str:
+        return langid.identify(text, url).language
+
+    def new_uncached(_url: str, text: str) -> str:
+        return langid.detect_language(text).language
+
+    def old(_url: str, text: str) -> str:
+        return legacy_language(text)
+
+    langid._hosts.clear()
+    first = _run(new, pages)
+    langid._hosts.clear()
+    deterministic = first == _run(new, pages)
+    legacy = _run(old, pages)
+    agree = sum(a == b for a, b in zip(first, legacy, strict=True))
+    methods = Counter(
+        langid.identify(text, url).method for url, text in pages
+    )  # host cache warm
+
+    print(f"pages: {len(pages)}; verdicts agree with legacy: {agree}/{len(pages)}")
+    print(f"deterministic across runs: {deterministic}")
+    print(f"methods with a warm host cache: {dict(methods)}")
+    rates = {
+        "legacy (full text)": _rate(old, pages, args.repeat, lambda: None),
+        "sampled, no host cache": _rate(new_uncached, pages, args.repeat, lambda: None),
+        "sampled + host cache": _rate(new, pages, args.repeat, langid._hosts.clear),
+    }
+    for name, rate in rates.items():
+        print(f"{name:<24}{rate:>10.1f} docs/sec")
+    return 0 if deterministic else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Compression ratio and load throughput of the raw record store, per codec.
+
+Usage (from src/agent):
+
+    uv run --extra zstd python scripts/bench_raw_store.py [DATA_DIR] [--repeat N]
+
+Benchmarks the published documents of every company under DATA_DIR, or the
+golden PayPal pages without it. The dictionary is trained on every other
+document and measured on the rest, so the ratio is not flattered by
+compressing the training samples. Each codec writes the held-out documents to
+a temporary store; the report gives stored bytes, the ratio against the UTF-8
+bodies, and the best-of-N rate of `load_raw_documents`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from agent.scraper import compression  # noqa: E402
+from agent.scraper.config import RAW_RECORDS_FILE  # noqa: E402
+from agent.scraper.models import RawDocument  # noqa: E402
+from agent.scraper.storage import (  # noqa: E402
+    _dictionary_samples,
+    load_raw_documents,
+    save_raw_documents,
+)
+
+GOLDEN_DIR = Path(__file__).resolve().parents[1] / "tests" / "golden"
+
+
+def _corpus(data_dir: Path) -> list[RawDocument]:
+    # a directory walk rather than list_companies, which would leave a catalog
+    # in the golden data
+    return [
+        doc
+        for path in sorted(data_dir.iterdir())
+        if path.is_dir()
+        for doc in load_raw_documents(path.name, data_dir)
+    ]
+
+
+def _measure(
+    name: str, documents: list[RawDocument], base_dir: Path, repeat: int
+) -> None:
+    save_raw_documents("bench", documents, base_dir)
+    stored = sum(p.stat().st_size for p in base_dir.glob(f"*/*/{RAW_RECORDS_FILE}"))
+    size = sum(len(doc.content.encode("utf-8")) for doc in documents)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loaded = load_raw_documents("bench", base_dir)
+        best = min(best, time.perf_counter() - start)
+    assert loaded == documents, f"{name}: documents changed on the round trip"
+    print(
+        f"{name:<16}{stored:>12,} B{size / stored:>8.2f}x"
+        f"{len(documents) / best:>12,.0f} docs/s{size / best / 1e6:>10.1f} MB/s"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("data_dir", type=Path, nargs="?", default=GOLDEN_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    if compression.zstandard is None:
+        print("zstandard is not installed (install the zstd extra)")
+        return 1
+
+    corpus = _corpus(args.data_dir)
+    train, held_out = corpus[::2], corpus[1::2]
+    samples = _dictionary_samples(train)
+    size = sum(len(doc.content.encode("utf-8")) for doc in held_out)
+    print(
+        f"documents: {len(corpus)} ({len(held_out)} measured, {size:,} B);"
+        f" dictionary samples: {len(samples)}"
+    )
+    codecs = {"none": "none", "zstd": "zstd", "zstd + dict": "zstd"}
+    for name, codec in codecs.items():
+        compression.RAW_COMPRESSION = codec
+        with tempfile.TemporaryDirectory() as tmp:
+            if name == "zstd + dict":
+                compression.train_dictionary(samples, Path(tmp))
+            _measure(name, held_out, Path(tmp), args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Convert markdown raw directories to the record store.
+
+Usage (from src/agent):
+
+    uv run python scripts/convert_raw_store.py DATA_DIR [COMPANY ...]
+
+Without company names every company under DATA_DIR is converted. Companies
+that already have a record store are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from agent.scraper.storage import convert_markdown_store  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("data_dir", type=Path)
+    parser.add_argument("companies", nargs="*")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    companies = args.companies or sorted(
+        p.name for p in args.data_dir.iterdir() if (p / "raw").is_dir()
+    )
+    total = 0
+    for company in companies:
+        total += convert_markdown_store(company, args.data_dir)
+    print(f"Converted {total} documents in {len(companies)} companies")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Train the shared zstd dictionary for raw documents.
+
+Usage (from src/agent):
+
+    uv run --extra zstd python scripts/train_raw_dictionary.py DATA_DIR [--recompress]
+
+Trains on the published documents of every company under DATA_DIR and makes
+the dictionary current for new stores. With --recompress, stores written with
+another codec or dictionary are rewritten as new generations; run it while no
+scrape is in progress.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from agent.scraper.storage import (  # noqa: E402
+    list_companies,
+    recompress_raw_store,
+    train_raw_dictionary,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("data_dir", type=Path)
+    parser.add_argument("--recompress", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    dict_id = train_raw_dictionary(args.data_dir)
+    if dict_id is None:
+        print("Corpus too small, no dictionary trained")
+        return 1
+    print(f"Trained dictionary {dict_id}")
+    if args.recompress:
+        total = sum(
+            recompress_raw_store(str(entry["company"]), args.data_dir)
+            for entry in list_companies(args.data_dir)
+        )
+        print(f"Recompressed {total} documents")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
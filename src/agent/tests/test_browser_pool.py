@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent.scraper import browser_pool
+from agent.scraper.browser_pool import _block_reason, _filter_request
+from agent.scraper.config import BROWSER_BLOCKED_BYTES_ESTIMATE
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self.added: list[tuple[int, dict[str, str]]] = []
+
+    def add(self, amount: int, attributes: dict[str, str]) -> None:
+        self.added.append((amount, attributes))
+
+
+class _Route:
+    def __init__(self, url: str, resource_type: str) -> None:
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = ""
+
+    async def continue_(self) -> None:
+        self.outcome = "continued"
+
+    async def abort(self) -> None:
+        self.outcome = "aborted"
+
+
+def test_block_reasons() -> None:
+    assert _block_reason("https://acme.com/", "document") is None
+    assert _block_reason("https://acme.com/app.js", "script") is None
+    assert _block_reason("https://acme.com/logo.png", "image") == "image"
+    assert _block_reason("https://www.google-analytics.com/g.js", "script") == (
+        "tracker"
+    )
+
+
+def test_aborted_requests_report_estimated_bytes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    saved = _Counter()
+    monkeypatch.setattr(browser_pool, "browser_bytes_saved_estimate", saved)
+    image = _Route("https://acme.com/logo.png", "image")
+    script = _Route("https://acme.com/app.js", "script")
+
+    async def route() -> None:
+        await _filter_request(image)
+        await _filter_request(script)
+
+    asyncio.run(route())
+
+    assert (image.outcome, script.outcome) == ("aborted", "continued")
+    assert saved.added == [
+        (BROWSER_BLOCKED_BYTES_ESTIMATE["image"], {"reason": "image"})
+    ]
@@ -0,0 +1,156 @@
+import random
+import re
+import unicodedata
+from pathlib import Path
+
+import pytest
+
+from agent.scraper.cleaner import MAX_LENGTH, MIN_LENGTH, clean_text
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+
+_MULTI_NEWLINE = re.compile(r"\n{3,}")
+_MULTI_SPACE = re.compile(r"[ \t]{2,}")
+_MD_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_BARE_URL = re.compile(r"(?<!\()\bhttps?://\S+")
+_WIKI_EDIT = re.compile(r"\[edit\]")
+_WIKI_CITE = re.compile(r"\[\d+\]")
+_SKIP_LINE = re.compile(r"^Skip to main content$", re.MULTILINE)
+_SLIDE_INDICATOR = re.compile(r"Slide \d+ of \d+")
+_COOKIE_BLOCK = re.compile(
+    r"(?:^|\n)#{1,3} Cookie (?:policy|settings).*?(?=\n#|\Z)", re.DOTALL
+)
+
+
+def legacy_clean_text(raw: str) -> str | None:
+    """The page-level regex passes clean_text replaced (reference)."""
+    text = unicodedata.normalize("NFC", raw)
+    text = _MD_IMAGE.sub("", text)
+    text = _BARE_URL.sub("", text)
+    text = _WIKI_EDIT.sub("", text)
+    text = _WIKI_CITE.sub("", text)
+    text = _SKIP_LINE.sub("", text)
+    text = _SLIDE_INDICATOR.sub("", text)
+    text = _COOKIE_BLOCK.sub("", text)
+    text = _MULTI_NEWLINE.sub("\n\n", text)
+    text = _MULTI_SPACE.sub(" ", text)
+    text = text.strip()
+    if len(text) < MIN_LENGTH:
+        return None
+    if len(text) > MAX_LENGTH:
+        text = text[:MAX_LENGTH]
+    return text
+
+
+FILLER = "PayPal operates a worldwide online payments system for consumers. "
+
+EDGE_CASES = [
+    "",
+    "\n\n\n",
+    "# Cookie policy\nWe use cookies.\n# About\n" + FILLER * 2,
+    FILLER + "\n## Cookie settings\nAccept all\n\nReject\n### Next\n" + FILLER,
+    FILLER + "\n## Cookie settings\n" + FILLER * 3,
+    FILLER + "\n#### Cookie policy\n" + FILLER,
+    FILLER + "\n# Cookie policy\n# Cookie settings\ntext\n#tag\n" + FILLER,
+    FILLER + "\n[1]## Cookie policy\nx\n## Kept\n" + FILLER,
+    "![logo\nspanning](img.png\nlines)" + FILLER + "![a](b)![c](d)",
+    FILLER + "![" * 200 + "]" + "![x](" * 50 + FILLER,
+    FILLER + "![x]" + "(" + FILLER,
+    "e![img](x.png)\u0301 " + FILLER + "Cafe\u0301 [12]\u0301",
+    "Skip to main content\n" + FILLER + "\nSkip to main content \n",
+    FILLER + " Slide 1 of 5 Slide 22 of 30\n\t\t  \t" + FILLER,
+    FILLER + "\r\n\r\n\r\n\r\n" + FILLER + "\n \n\n\n \n",
+    "See (https://example.com/a) and https://example.com/b[edit]\n" + FILLER,
+    "[ed[1]it] [edit][2] [[3]edit]\n" + FILLER,
+    "\u00a0  " + FILLER + "\u2028\n\u0085",
+    (FILLER * 10 + "\n\n\n\n") * 200,
+    "  " + "x" * (MAX_LENGTH - 1) + "   \n\n   " + FILLER,
+    "x" * (MAX_LENGTH - 3) + "  \t  " + "y" * 10,
+    "x" * (MAX_LENGTH - 5) + "\n\n\n\n\n" + "y" * 10,
+]
+
+_TOKENS = [
+    "word",
+    "Payments",
+    " ",
+    "  ",
+    "\t",
+    "\n",
+    "\n\n\n",
+    "\r",
+    "# ",
+    "## Cookie policy",
+    "### Cookie settings",
+    "#### Cookie policy",
+    "#",
+    "![",
+    "](",
+    "]",
+    "(",
+    ")",
+    "[edit]",
+    "[",
+    "[7]",
+    "12",
+    "https://paypal.com/x",
+    "http://",
+    "Skip to main content",
+    "Slide 3 of 9",
+    "Slide ",
+    "e\u0301",
+    "\u0301",
+    "\u00e9",
+    "\u00a0",
+    "\u2028",
+]
+
+
+def fuzz_pages(count: int, seed: int = 7) -> list[str]:
+    """Random pages assembled from tokens the cleaner treats specially."""
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(_TOKENS) for _ in range(rng.randint(1, 400)))
+        for _ in range(count)
+    ]
+
+
+def golden_pages() -> list[str]:
+    return [p.read_text(encoding="utf-8") for p in sorted(GOLDEN_DIR.rglob("*.md"))]
+
+
+@pytest.mark.parametrize("page", EDGE_CASES, ids=range(len(EDGE_CASES)))
+def test_edge_cases_match_the_legacy_passes(page: str) -> None:
+    assert clean_text(page) == legacy_clean_text(page)
+
+
+def test_golden_pages_match_the_legacy_passes() -> None:
+    pages = golden_pages()
+
+    assert pages
+    assert [clean_text(p) for p in pages] == [legacy_clean_text(p) for p in pages]
+
+
+def test_seeded_corpus_matches_the_legacy_passes() -> None:
+    mismatches = [
+        page
+        for page in fuzz_pages(2_000)
+        if clean_text(page) != legacy_clean_text(page)
+    ]
+
+    assert mismatches == []
+
+
+def test_cleaning_removes_boilerplate() -> None:
+    page = (
+        "Skip to main content\n"
+        "# About ![logo](a.png)\n"
+        "Founded in 1998.[3] See https://acme.com/x Slide 1 of 4\n"
+        "## Cookie settings\nAccept all\n"
+        "## Team\n" + FILLER
+    )
+
+    assert clean_text(page) == (
+        "# About \nFounded in 1998. See \n## Team\n" + FILLER.rstrip()
+    )
+    assert clean_text("too short") is None
+    assert len(clean_text(FILLER * 1_000) or "") == MAX_LENGTH
@@ -0,0 +1,77 @@
+import random
+from datetime import UTC, datetime
+
+from agent.scraper.dedup import NearDuplicateIndex, simhash
+from agent.scraper.models import RawDocument
+
+WORDS = [f"word{i}" for i in range(400)]
+
+
+def _text(seed: int, length: int = 600) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def _doc(url: str, content: str) -> RawDocument:
+    return RawDocument(
+        url=url,
+        title="",
+        content=content,
+        source_type="website",
+        company="acme",
+        scraped_at=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+
+
+def _flip(fingerprint: int, bits: list[int]) -> int:
+    for bit in bits:
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+def test_simhash_ignores_case_and_punctuation() -> None:
+    assert simhash("Acme, builds ROCKETS!") == simhash("acme builds rockets")
+    assert simhash(_text(1)) == simhash(_text(1))
+    assert 0 <= simhash(_text(1)) < 1 << 64
+
+
+def test_small_edit_stays_close_and_other_text_does_not() -> None:
+    text = _text(1)
+    edited = text.replace(text.split()[300], "changed", 1)
+
+    assert (simhash(text) ^ simhash(edited)).bit_count() <= 6
+    assert (simhash(text) ^ simhash(_text(2))).bit_count() > 6
+
+
+def test_bands_find_every_fingerprint_within_distance() -> None:
+    index = NearDuplicateIndex(max_distance=6)
+    rng = random.Random(0)
+    kept = rng.getrandbits(64)
+    index.add(kept, "https://acme.com/")
+
+    for _ in range(500):
+        near = _flip(kept, rng.sample(range(64), rng.randint(0, 6)))
+        assert index.find(near) == "https://acme.com/"
+    for _ in range(500):
+        far = _flip(kept, rng.sample(range(64), 7))
+        assert index.find(far) is None
+
+
+def test_filter_keeps_the_first_copy() -> None:
+    text = _text(1)
+    docs = [
+        _doc("https://acme.com/about", text),
+        _doc("https://acme.com/de/about", text + " extra"),
+        _doc("https://acme.com/news", _text(2)),
+        _doc("https://news.example/acme", text),
+    ]
+
+    kept = NearDuplicateIndex().filter(docs)
+
+    assert [d.url for d in kept] == ["https://acme.com/about", "https://acme.com/news"]
+
+
+def test_filter_remembers_across_calls() -> None:
+    index = NearDuplicateIndex()
+    assert index.filter([_doc("https://acme.com/", _text(3))])
+    assert index.filter([_doc("https://mirror.example/", _text(3))]) == []
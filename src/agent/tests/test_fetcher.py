@@ -0,0 +1,43 @@
+import asyncio
+from collections import Counter
+from typing import Any
+
+from crawl4ai import CrawlerRunConfig
+
+from agent.scraper.config import HTTP_PER_HOST_CONCURRENCY
+from agent.scraper.fetcher import TieredCrawler
+
+
+class _Recorder(TieredCrawler):
+    """Records how many fetches run at once, per host and overall."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.running: Counter[str] = Counter()
+        self.peak: Counter[str] = Counter()
+
+    async def arun(self, url: str, config: CrawlerRunConfig) -> Any:  # noqa: ARG002
+        host = url.split("/")[2]
+        self.running[host] += 1
+        self.peak[host] = max(self.peak[host], self.running[host])
+        self.peak["all"] = max(self.peak["all"], self.running.total())
+        await asyncio.sleep(0.01)
+        self.running[host] -= 1
+        return url
+
+
+def test_arun_many_limits_concurrency_per_host() -> None:
+    crawler = _Recorder()
+    urls = [
+        f"https://{host}/{i}" for host in ("a.example", "b.example") for i in range(6)
+    ]
+
+    results = asyncio.run(crawler.arun_many(urls, CrawlerRunConfig()))
+
+    assert results == urls
+    # each host is capped, but the hosts do not wait on each other
+    assert crawler.peak == {
+        "a.example": HTTP_PER_HOST_CONCURRENCY,
+        "b.example": HTTP_PER_HOST_CONCURRENCY,
+        "all": 2 * HTTP_PER_HOST_CONCURRENCY,
+    }
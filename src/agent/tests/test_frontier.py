@@ -0,0 +1,124 @@
+import asyncio
+from typing import Any
+
+from crawl4ai import CrawlerRunConfig
+
+from agent.scraper.config import FRONTIER_DEPTH_PENALTY
+from agent.scraper.fetcher import PageResult
+from agent.scraper.frontier import BestFirstDeepCrawlStrategy, score_link
+
+SITE = {
+    "https://acme.com/": [
+        ("https://acme.com/careers", "Careers"),
+        ("https://acme.com/products", "Products"),
+        ("https://acme.com/company", "Company"),
+    ],
+    "https://acme.com/company": [
+        ("https://acme.com/company/about", "About us"),
+        ("https://acme.com/company/investors", "Investors"),
+    ],
+}
+
+
+class _FakeCrawler:
+    """Serves SITE; records the fetch order."""
+
+    def __init__(self, streaming: bool = True) -> None:
+        self.streaming = streaming
+        self.fetched: list[str] = []
+
+    async def arun_many(self, urls: list[str], config: Any) -> list[PageResult]:  # noqa: ARG002
+        self.fetched += urls
+        return [
+            PageResult(
+                url=url,
+                success=True,
+                links={
+                    "internal": [
+                        {"href": href, "text": text} for href, text in SITE.get(url, [])
+                    ]
+                },
+            )
+            for url in urls
+        ]
+
+
+def _crawl(
+    crawler: _FakeCrawler, max_pages: int, resume_state: dict[str, Any] | None = None
+) -> tuple[list[Any], list[dict[str, Any]]]:
+    states: list[dict[str, Any]] = []
+
+    async def on_state_change(state: dict[str, Any]) -> None:
+        states.append(state)
+
+    strategy = BestFirstDeepCrawlStrategy(
+        max_depth=2,
+        max_pages=max_pages,
+        resume_state=resume_state,
+        on_state_change=on_state_change,
+    )
+    results = asyncio.run(
+        strategy._arun_batch("https://acme.com/", crawler, CrawlerRunConfig())
+    )
+    return results, states
+
+
+def test_keywords_rank_links() -> None:
+    about = score_link("https://acme.com/about", "", 1)
+    neutral = score_link("https://acme.com/products/widget", "", 1)
+    careers = score_link("https://acme.com/careers", "", 1)
+    assert about > neutral > careers
+
+
+def test_path_outweighs_anchor() -> None:
+    by_path = score_link("https://acme.com/investors", "Read more", 1)
+    by_anchor = score_link("https://acme.com/p/123", "Investors", 1)
+    assert by_path > by_anchor > score_link("https://acme.com/p/123", "Read", 1)
+
+
+def test_query_and_depth_cost() -> None:
+    plain = score_link("https://acme.com/news", "", 1)
+    assert score_link("https://acme.com/news?page=2", "", 1) == plain - 1
+    assert score_link("https://acme.com/news", "", 3) == plain - 2 * (
+        FRONTIER_DEPTH_PENALTY
+    )
+
+
+def test_valuable_pages_are_fetched_first() -> None:
+    crawler = _FakeCrawler()
+    _crawl(crawler, max_pages=3)
+
+    # the budget leaves room for two of the homepage's three links
+    assert crawler.fetched == [
+        "https://acme.com/",
+        "https://acme.com/company",
+        "https://acme.com/products",
+    ]
+
+
+def test_streaming_crawl_collects_nothing() -> None:
+    streamed, _ = _crawl(_FakeCrawler(streaming=True), max_pages=10)
+    collected, _ = _crawl(_FakeCrawler(streaming=False), max_pages=10)
+
+    assert streamed == []
+    assert len(collected) == 6
+    assert all(result.links == {} for result in collected)
+
+
+def test_resumed_crawl_continues_from_saved_frontier() -> None:
+    first = _FakeCrawler()
+    _, states = _crawl(first, max_pages=2)
+
+    resumed = _FakeCrawler()
+    _crawl(resumed, max_pages=10, resume_state=states[-1])
+
+    assert states[-1]["strategy_type"] == "best_first"
+    assert not set(first.fetched) & set(resumed.fetched)
+    assert set(first.fetched) | set(resumed.fetched) == {
+        "https://acme.com/",
+        "https://acme.com/careers",
+        "https://acme.com/products",
+        "https://acme.com/company",
+        "https://acme.com/company/about",
+        "https://acme.com/company/investors",
+    }
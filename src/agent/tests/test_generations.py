@@ -0,0 +1,222 @@
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+
+from agent.scraper.models import RawDocument
+from agent.scraper.storage import (
+    current_generation,
+    load_raw_documents,
+    new_generation,
+    publish_generation,
+    remove_stale_generations,
+    save_raw_documents,
+)
+from agent.vectorstore.client import VectorStoreService
+from agent.vectorstore.config import COLLECTION_NAME, GENERATIONS_COLLECTION
+
+
+def _doc(content: str) -> RawDocument:
+    return RawDocument(
+        url="https://acme.com/",
+        title="Acme",
+        content=content,
+        source_type="website",
+        company="acme",
+        scraped_at=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+
+
+# -- raw generations --
+
+
+def test_staged_generation_is_invisible_until_published(tmp_path: Path) -> None:
+    save_raw_documents("acme", [_doc("old")], tmp_path)
+    generation = new_generation("acme", tmp_path)
+    save_raw_documents("acme", [_doc("new")], tmp_path, generation)
+
+    assert load_raw_documents("acme", tmp_path)[0].content == "old"
+
+    publish_generation("acme", tmp_path, generation)
+    assert current_generation("acme", tmp_path) == generation
+    assert load_raw_documents("acme", tmp_path)[0].content == "new"
+
+
+def test_new_generations_always_increase(tmp_path: Path) -> None:
+    first = new_generation("acme", tmp_path)
+    second = new_generation("acme", tmp_path)
+    assert second > first
+
+
+def test_stale_removal_keeps_newer_staged_generations(tmp_path: Path) -> None:
+    old = new_generation("acme", tmp_path)
+    live = new_generation("acme", tmp_path)
+    staged = new_generation("acme", tmp_path)
+    (tmp_path / "acme" / "raw").mkdir()  # pre-generation layout
+    publish_generation("acme", tmp_path, live)
+
+    assert remove_stale_generations("acme", tmp_path) == 2
+
+    remaining = sorted(p.name for p in (tmp_path / "acme").glob("raw*"))
+    assert remaining == [f"raw.{live}", f"raw.{staged}"]
+    assert not (tmp_path / "acme" / f"raw.{old}").exists()
+
+
+# -- vector generations --
+
+
+@pytest.fixture
+def store() -> VectorStoreService:
+    service = VectorStoreService.__new__(VectorStoreService)
+    service._client = QdrantClient(":memory:")
+    service._live = {}
+    for name in (COLLECTION_NAME, GENERATIONS_COLLECTION):
+        service._client.create_collection(collection_name=name, vectors_config={})
+    return service
+
+
+def _point_id(name: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+
+def _put(
+    store: VectorStoreService,
+    name: str,
+    company: str,
+    generation: object = None,
+) -> None:
+    """Write a point flagged as upsert_chunks (or carry_over, for lists) would."""
+    payload: dict[str, object] = {"company": company, "url": name}
+    if generation is not None:
+        payload["generation"] = generation
+    payload["live"] = isinstance(generation, int | None) and store._writes_live(
+        company, generation
+    )
+    store._client.upsert(
+        collection_name=COLLECTION_NAME,
+        points=[PointStruct(id=_point_id(name), vector={}, payload=payload)],
+    )
+
+
+def _visible(store: VectorStoreService, company: str | None) -> set[str]:
+    records, _ = store._client.scroll(
+        collection_name=COLLECTION_NAME,
+        scroll_filter=store._visible(company),
+        limit=100,
+        with_payload=True,
+    )
+    return {str((r.payload or {})["url"]) for r in records}
+
+
+def _all(store: VectorStoreService) -> set[str]:
+    records, _ = store._client.scroll(
+        collection_name=COLLECTION_NAME, limit=100, with_payload=True
+    )
+    return {str((r.payload or {})["url"]) for r in records}
+
+
+def test_company_sees_only_its_live_generation(store: VectorStoreService) -> None:
+    _put(store, "legacy", "acme")
+    _put(store, "live", "acme", 100)
+    assert _visible(store, "acme") == {"legacy"}
+
+    store.publish_generation("acme", 100)
+    _put(store, "staged", "acme", 200)
+
+    assert _visible(store, "acme") == {"live"}
+
+
+def test_all_companies_tie_generation_to_company(store: VectorStoreService) -> None:
+    _put(store, "acme-live", "acme", 200)
+    _put(store, "globex-old", "globex", 200)
+    _put(store, "globex-live", "globex", [200, 300])
+    _put(store, "initech-staged", "initech", 200)
+    _put(store, "hooli-legacy", "hooli")
+    _put(store, "acme-legacy", "acme")
+    store.publish_generation("acme", 200)
+    store.publish_generation("globex", 300)
+
+    assert _visible(store, None) == {"acme-live", "globex-live", "hooli-legacy"}
+
+
+def test_stale_deletion_keeps_live_carried_and_newer(
+    store: VectorStoreService,
+) -> None:
+    _put(store, "legacy", "acme")
+    _put(store, "old", "acme", 100)
+    _put(store, "carried", "acme", [100, 200])
+    _put(store, "live", "acme", 200)
+    _put(store, "staged", "acme", 300)
+    _put(store, "other", "globex", 100)
+    store.publish_generation("acme", 200)
+
+    assert store.delete_stale_generations("acme") == 2
+
+    assert _all(store) == {"carried", "live", "staged", "other"}
+
+
+def test_carry_over_survives_the_switch(store: VectorStoreService) -> None:
+    _put(store, "kept", "acme", 100)
+    _put(store, "changed", "acme", 100)
+    store.publish_generation("acme", 100)
+
+    store.carry_over(
+        "acme", [_point_id("kept")], 200, {"doc_hash": "h"}, {_point_id("kept"): 3}
+    )
+    assert _visible(store, "acme") == {"kept", "changed"}
+    [kept] = store._client.retrieve(COLLECTION_NAME, [_point_id("kept")])
+    assert kept.payload is not None
+    assert (kept.payload["doc_hash"], kept.payload["chunk_index"]) == ("h", 3)
+
+    store.publish_generation("acme", 200)
+    store.delete_stale_generations("acme")
+    assert _visible(store, "acme") == {"kept"}
+    assert _all(store) == {"kept"}
+
+
+def test_points_written_after_publish_are_live(store: VectorStoreService) -> None:
+    store.publish_generation("acme", 100)
+    _put(store, "streamed", "acme", 100)
+
+    assert _visible(store, "acme") == {"streamed"}
+
+
+def test_points_from_before_the_flag_are_flagged(store: VectorStoreService) -> None:
+    store.publish_generation("acme", 100)
+    for name, company, generation in [
+        ("acme-live", "acme", 100),
+        ("acme-staged", "acme", 200),
+        ("acme-legacy", "acme", None),
+        ("globex-legacy", "globex", None),
+    ]:
+        store._client.upsert(
+            collection_name=COLLECTION_NAME,
+            points=[
+                PointStruct(
+                    id=_point_id(name),
+                    vector={},
+                    payload={"company": company, "url": name}
+                    | ({"generation": generation} if generation else {}),
+                )
+            ],
+        )
+
+    store._flag_legacy_points()
+
+    assert _visible(store, None) == {"acme-live", "globex-legacy"}
+
+
+def test_live_generations_are_reloaded(store: VectorStoreService) -> None:
+    store.publish_generation("acme", 100)
+    store.publish_generation("globex", 200)
+
+    restarted = VectorStoreService.__new__(VectorStoreService)
+    restarted._client = store._client
+    restarted._live = {}
+    restarted._load_generations()
+
+    assert restarted._live == {"acme": 100, "globex": 200}
+    assert restarted.live_chunks("initech") == []
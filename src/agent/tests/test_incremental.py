@@ -0,0 +1,225 @@
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from agent.chunker.models import Chunk, ChunkMetadata
+from agent.ingestion import pipeline
+from agent.ingestion.pipeline import _content_hash, _Incremental
+from agent.scraper.models import RawDocument
+from agent.vectorstore.client import StoredChunk
+
+URL = "https://acme.com/about"
+
+
+class _Store:
+    """Serves preset live points; records carry-overs."""
+
+    def __init__(self) -> None:
+        self.live: list[StoredChunk] = []
+        self.carried: list[tuple[list[str], int, dict[str, object]]] = []
+        self.moved: dict[str, int] = {}
+
+    def live_chunks(self, company: str) -> list[StoredChunk]:  # noqa: ARG002
+        return self.live
+
+    def carry_over(
+        self,
+        company: str,  # noqa: ARG002
+        point_ids: list[str],
+        generation: int,
+        payload: dict[str, object],
+        moved: dict[str, int] | None = None,
+    ) -> int:
+        self.carried.append((point_ids, generation, payload))
+        self.moved |= moved or {}
+        return len(point_ids)
+
+
+def _chunk(doc: RawDocument) -> list[Chunk]:
+    return [
+        Chunk(
+            id=f"{doc.url}#{i}",
+            text=text,
+            metadata=ChunkMetadata(
+                url=doc.url,
+                title=doc.title,
+                company=doc.company,
+                source_type=doc.source_type,
+                chunk_index=i,
+                scraped_at=doc.scraped_at,
+            ),
+        )
+        for i, text in enumerate(doc.content.split("\n\n"))
+    ]
+
+
+@pytest.fixture
+def chunked(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Urls passed to the (paragraph-splitting) chunker."""
+    calls: list[str] = []
+
+    def chunk_document(doc: RawDocument) -> list[Chunk]:
+        calls.append(doc.url)
+        return _chunk(doc)
+
+    monkeypatch.setattr(pipeline, "chunk_document", chunk_document)
+    return calls
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> Iterator[_Store]:
+    store = _Store()
+    monkeypatch.setattr(pipeline, "get_vectorstore", lambda: store)
+    monkeypatch.setattr(pipeline, "INCREMENTAL", True)
+    monkeypatch.setattr(
+        pipeline, "get_settings", lambda: SimpleNamespace(embed_model="embed-a")
+    )
+    pipeline._hash_salt.cache_clear()
+    yield store
+    pipeline._hash_salt.cache_clear()
+
+
+def _doc(content: str, title: str = "About") -> RawDocument:
+    return RawDocument(
+        url=URL,
+        title=title,
+        content=content,
+        source_type="website",
+        company="acme",
+        scraped_at=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+
+
+def _ingested(store: _Store, doc: RawDocument) -> None:
+    """Make `doc` the live version, as a previous ingestion would have."""
+    doc_hash = _content_hash(doc.title, doc.source_type, doc.content)
+    store.live = [
+        StoredChunk(
+            point_id=f"p{c.metadata.chunk_index}",
+            url=doc.url,
+            chunk_index=c.metadata.chunk_index,
+            doc_hash=doc_hash,
+            chunk_hash=_content_hash(doc.title, doc.source_type, c.text),
+        )
+        for c in _chunk(doc)
+    ]
+
+
+def test_first_ingestion_embeds_everything(store: _Store, chunked: list[str]) -> None:
+    chunks, total = _Incremental("acme", 2).chunks(_doc("one\n\ntwo"))
+
+    assert [c.text for c in chunks] == ["one", "two"]
+    assert total == 2
+    assert all(c.metadata.doc_hash and c.metadata.chunk_hash for c in chunks)
+    assert chunked == [URL]
+    assert store.carried == []
+
+
+def test_unchanged_document_is_carried_without_chunking(
+    store: _Store, chunked: list[str]
+) -> None:
+    doc = _doc("one\n\ntwo\n\nthree")
+    _ingested(store, doc)
+    incremental = _Incremental("acme", 2)
+
+    assert incremental.chunks(doc) == ([], 3)
+
+    assert chunked == []
+    assert incremental.unchanged == 1
+    assert incremental.reused == 3
+    [(point_ids, generation, payload)] = store.carried
+    assert (point_ids, generation) == (["p0", "p1", "p2"], 2)
+    assert payload["scraped_at"] == doc.scraped_at.isoformat()
+
+
+def test_changed_document_reuses_matching_chunks(
+    store: _Store,
+    chunked: list[str],  # noqa: ARG001
+) -> None:
+    _ingested(store, _doc("one\n\ntwo\n\nthree"))
+    incremental = _Incremental("acme", 2)
+
+    edited = _doc("one\n\nTWO\n\nthree")
+    chunks, total = incremental.chunks(edited)
+
+    assert [c.text for c in chunks] == ["TWO"]
+    assert total == 3
+    [(point_ids, _, payload)] = store.carried
+    assert point_ids == ["p0", "p2"]
+    assert payload["doc_hash"] == chunks[0].metadata.doc_hash
+    assert store.moved == {}
+    assert incremental.unchanged == 0
+
+
+def test_insertion_reuses_the_chunks_it_shifted(
+    store: _Store,
+    chunked: list[str],  # noqa: ARG001
+) -> None:
+    _ingested(store, _doc("one\n\ntwo\n\nthree\n\nfour"))
+
+    chunks, total = _Incremental("acme", 2).chunks(
+        _doc("intro\n\none\n\ntwo\n\nthree\n\nfour")
+    )
+
+    assert [c.text for c in chunks] == ["intro"]
+    assert total == 5
+    [(point_ids, _, _)] = store.carried
+    assert point_ids == ["p0", "p1", "p2", "p3"]
+    assert store.moved == {"p0": 1, "p1": 2, "p2": 3, "p3": 4}
+
+
+def test_repeated_chunks_reuse_points_in_order(
+    store: _Store,
+    chunked: list[str],  # noqa: ARG001
+) -> None:
+    _ingested(store, _doc("cta\n\nbody\n\ncta"))
+
+    chunks, _ = _Incremental("acme", 2).chunks(_doc("cta\n\nnew\n\ncta\n\ncta"))
+
+    assert [c.text for c in chunks] == ["new", "cta"]
+    [(point_ids, _, _)] = store.carried
+    assert point_ids == ["p0", "p2"]
+    assert store.moved == {}
+
+
+def test_title_change_invalidates_every_chunk(
+    store: _Store,
+    chunked: list[str],  # noqa: ARG001
+) -> None:
+    _ingested(store, _doc("one\n\ntwo"))
+
+    chunks, _ = _Incremental("acme", 2).chunks(_doc("one\n\ntwo", title="Company"))
+
+    assert len(chunks) == 2
+    assert store.carried == []
+
+
+def test_embedding_settings_change_the_hash(
+    store: _Store,  # noqa: ARG001
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    before = _content_hash("About", "website", "one")
+    monkeypatch.setattr(
+        pipeline, "get_settings", lambda: SimpleNamespace(embed_model="embed-b")
+    )
+    pipeline._hash_salt.cache_clear()
+
+    assert _content_hash("About", "website", "one") != before
+    # parts are delimited, so moving text between them changes the hash
+    assert _content_hash("ab", "c") != _content_hash("a", "bc")
+
+
+def test_disabled_incremental_ignores_live_points(
+    store: _Store, chunked: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    doc = _doc("one\n\ntwo")
+    _ingested(store, doc)
+    monkeypatch.setattr(pipeline, "INCREMENTAL", False)
+
+    chunks, _ = _Incremental("acme", 2).chunks(doc)
+
+    assert len(chunks) == 2
+    assert chunked == [URL]
+    assert store.carried == []
@@ -0,0 +1,51 @@
+import asyncio
+import sys
+import threading
+import time
+
+from agent.scraper.netcache import RobotsCache, _RobotsEntry
+
+
+class _OfflineRobots(RobotsCache):
+    async def _fetch(self, origin: str) -> _RobotsEntry:  # noqa: ARG002
+        return _RobotsEntry(time.time() + 60, "User-agent: *\nDisallow: /private")
+
+
+def test_robots_rules_are_cached_per_origin() -> None:
+    robots = _OfflineRobots("agent", max_entries=2)
+
+    async def run() -> list[tuple[bool, float | None]]:
+        return [
+            await robots.check("https://acme.com/private/x"),
+            await robots.check("https://acme.com/about"),
+            await robots.check("https://b.example/"),
+            await robots.check("https://c.example/"),
+        ]
+
+    assert [allowed for allowed, _ in asyncio.run(run())] == [False, True, True, True]
+    assert list(robots.dump()) == ["https://b.example", "https://c.example"]
+
+
+def test_dump_and_load_while_the_crawler_loop_fills_the_cache() -> None:
+    robots = _OfflineRobots("agent", max_entries=500)
+    stop = threading.Event()
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    async def crawl() -> None:
+        i = 0
+        while not stop.is_set():
+            await robots.check(f"https://site{i % 1000}.example/")
+            i += 1
+
+    crawler = threading.Thread(target=lambda: asyncio.run(crawl()))
+    crawler.start()
+    try:
+        for _ in range(500):
+            robots.load(robots.dump())
+    finally:
+        stop.set()
+        crawler.join()
+        sys.setswitchinterval(interval)
+
+    assert len(robots.dump()) <= 1000
@@ -0,0 +1,173 @@
+import asyncio
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from agent.scraper import politeness
+from agent.scraper.config import MEAN_DELAY, POLITENESS_BURST, POLITENESS_MAX_INTERVAL
+from agent.scraper.politeness import (
+    PolitenessScheduler,
+    _retry_after_seconds,
+    paced_event_hooks,
+    registered_domain,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(politeness.time, "monotonic", clock)
+    return clock
+
+
+def _waits(scheduler: PolitenessScheduler, url: str, count: int) -> list[float]:
+    return [scheduler._reserve(url) for _ in range(count)]
+
+
+def test_registered_domain() -> None:
+    assert registered_domain("https://newsroom.acme.com/x") == "acme.com"
+    assert registered_domain("https://WWW.Acme.com") == "acme.com"
+    assert registered_domain("http://localhost:8000/") == "localhost"
+
+
+def test_registered_domain_knows_multi_label_suffixes() -> None:
+    assert registered_domain("https://news.bbc.co.uk/") == "bbc.co.uk"
+    assert registered_domain("https://www.tesco.co.uk/") == "tesco.co.uk"
+    assert registered_domain("https://ir.acme.com.au/") == "acme.com.au"
+    assert registered_domain("https://acme.github.io/") == "acme.github.io"
+    assert registered_domain("http://127.0.0.1:8000/") == "127.0.0.1"
+
+
+def test_sites_under_one_public_suffix_are_paced_apart(clock: _Clock) -> None:  # noqa: ARG001
+    scheduler = PolitenessScheduler()
+    _waits(scheduler, "https://www.bbc.co.uk/", POLITENESS_BURST)
+
+    assert scheduler._reserve("https://www.tesco.co.uk/") == 0.0
+
+
+def test_burst_then_even_spacing(clock: _Clock) -> None:  # noqa: ARG001
+    waits = _waits(PolitenessScheduler(), "https://acme.com/", POLITENESS_BURST + 3)
+
+    assert waits[:POLITENESS_BURST] == [0.0] * POLITENESS_BURST
+    assert waits[POLITENESS_BURST:] == pytest.approx(
+        [MEAN_DELAY * (i + 1) for i in range(3)]
+    )
+
+
+def test_domains_are_paced_independently(clock: _Clock) -> None:  # noqa: ARG001
+    scheduler = PolitenessScheduler()
+    _waits(scheduler, "https://www.acme.com/", POLITENESS_BURST)
+
+    assert scheduler._reserve("https://example.org/") == 0.0
+    # a subdomain shares its registered domain's bucket
+    assert scheduler._reserve("https://newsroom.acme.com/") == pytest.approx(MEAN_DELAY)
+
+
+def test_idle_domain_gets_its_burst_back(clock: _Clock) -> None:
+    scheduler = PolitenessScheduler()
+    _waits(scheduler, "https://acme.com/", POLITENESS_BURST + 2)
+    clock.now += 10 * MEAN_DELAY * POLITENESS_BURST
+
+    assert _waits(scheduler, "https://acme.com/", POLITENESS_BURST) == [0.0] * (
+        POLITENESS_BURST
+    )
+
+
+def test_crawl_delay_widens_spacing_up_to_the_cap(clock: _Clock) -> None:  # noqa: ARG001
+    scheduler = PolitenessScheduler()
+    scheduler.set_crawl_delay("https://acme.com/", MEAN_DELAY * 5)
+    scheduler.set_crawl_delay("https://slow.example/", POLITENESS_MAX_INTERVAL * 10)
+
+    acme = _waits(scheduler, "https://acme.com/", POLITENESS_BURST + 1)
+    slow = _waits(scheduler, "https://slow.example/", POLITENESS_BURST + 1)
+
+    assert acme[-1] == pytest.approx(MEAN_DELAY * 5)
+    assert slow[-1] == pytest.approx(POLITENESS_MAX_INTERVAL)
+
+
+def test_backoff_doubles_and_successes_decay(clock: _Clock) -> None:  # noqa: ARG001
+    scheduler = PolitenessScheduler()
+    url = "https://acme.com/"
+    scheduler.record(url, 429)
+    scheduler.record(url, 503)
+    assert scheduler._bucket(url).interval == pytest.approx(MEAN_DELAY * 4)
+
+    for _ in range(20):
+        scheduler.record(url, 200)
+    assert scheduler._bucket(url).interval == pytest.approx(MEAN_DELAY)
+
+    scheduler.record(url, 404)  # neither a backoff nor a success
+    assert scheduler._bucket(url).penalty == 1.0
+
+
+def test_retry_after_holds_every_request(clock: _Clock) -> None:
+    scheduler = PolitenessScheduler()
+    scheduler.record("https://acme.com/", 429, retry_after="30")
+
+    waits = _waits(scheduler, "https://acme.com/", POLITENESS_BURST + 1)
+
+    assert min(waits) == pytest.approx(30)
+    clock.now += 31
+    assert scheduler._reserve("https://other.example/") == 0.0
+
+
+def test_retry_after_parsing() -> None:
+    assert _retry_after_seconds("12") == 12.0
+    assert _retry_after_seconds("-5") == 0.0
+    assert _retry_after_seconds(None) is None
+    assert _retry_after_seconds("soon") is None
+    in_a_minute = _retry_after_seconds(formatdate(politeness.time.time() + 60))
+    assert in_a_minute is not None
+    assert 55 <= in_a_minute <= 60
+
+
+def _fetch_via_redirect(status: int, headers: dict[str, str]) -> None:
+    def handle(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "acme.com":
+            return httpx.Response(301, headers={"location": "https://en.acme.com/"})
+        return httpx.Response(status, headers=headers)
+
+    async def fetch() -> None:
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handle),
+            follow_redirects=True,
+            event_hooks=paced_event_hooks(),
+        ) as client:
+            await client.get("https://acme.com/")
+
+    asyncio.run(fetch())
+
+
+@pytest.fixture
+def shared(monkeypatch: pytest.MonkeyPatch) -> PolitenessScheduler:
+    scheduler = PolitenessScheduler()
+    monkeypatch.setattr(politeness, "get_scheduler", lambda: scheduler)
+    return scheduler
+
+
+def test_event_hooks_take_a_slot_per_hop(
+    clock: _Clock, shared: PolitenessScheduler
+) -> None:
+    _fetch_via_redirect(200, {})
+
+    # the redirect and its target both booked acme.com slots
+    assert shared._bucket("https://acme.com/").tat == pytest.approx(
+        clock.now + 2 * MEAN_DELAY
+    )
+
+
+def test_event_hooks_report_backoff(clock: _Clock, shared: PolitenessScheduler) -> None:
+    _fetch_via_redirect(429, {"retry-after": "30"})
+
+    bucket = shared._bucket("https://acme.com/")
+    assert bucket.penalty == 2.0
+    assert bucket.tat >= clock.now + 30
@@ -0,0 +1,159 @@
+import asyncio
+import gzip
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+import pytest
+
+from agent.scraper import crawl, sitemap
+from agent.scraper.config import SITEMAP_MIN_URLS
+from agent.scraper.sitemap import (
+    SitemapEntry,
+    _parse_lastmod,
+    collect_sitemap_entries,
+    select_sitemap_urls,
+)
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+FILES = {
+    "https://acme.com/sitemap.xml": f"""<?xml version="1.0"?>
+<sitemapindex {NS}>
+  <sitemap><loc>https://acme.com/sitemap-blog.xml</loc></sitemap>
+  <sitemap><loc>https://acme.com/sitemap-company.xml.gz</loc></sitemap>
+  <sitemap><loc>https://cdn.example/sitemap.xml</loc></sitemap>
+</sitemapindex>""",
+    "https://acme.com/sitemap-company.xml.gz": f"""<?xml version="1.0"?>
+<urlset {NS}>
+  <url><loc> https://acme.com/about </loc><lastmod>2026-03-01</lastmod></url>
+  <url><loc>https://www.acme.com/investors</loc></url>
+  <url><loc>https://other.example/about</loc></url>
+</urlset>""",
+    "https://acme.com/sitemap-blog.xml": f"""<?xml version="1.0"?>
+<urlset {NS}>
+  <url><loc>https://acme.com/about</loc><lastmod>2020-01-01</lastmod></url>
+  <url><loc>https://acme.com/blog/hello</loc><lastmod>bad</lastmod></url>
+</urlset>""",
+    "https://cdn.example/sitemap.xml": f"<urlset {NS}></urlset>",
+}
+
+
+class _Scheduler:
+    async def acquire(self, url: str) -> None:
+        pass
+
+    def record(self, url: str, status: int, retry_after: str | None = None) -> None:
+        pass
+
+
+class _Robots:
+    async def sitemaps(self, url: str) -> list[str]:  # noqa: ARG002
+        return []
+
+
+@pytest.fixture
+def fetched(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Serves FILES (gzipping *.gz) without touching the network."""
+    requested: list[str] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        requested.append(url)
+        if url not in FILES:
+            return httpx.Response(404)
+        body = FILES[url].encode()
+        return httpx.Response(
+            200, content=gzip.compress(body) if ".gz" in url else body
+        )
+
+    monkeypatch.setattr(
+        sitemap, "cached_dns_transport", lambda: httpx.MockTransport(handle)
+    )
+    monkeypatch.setattr(sitemap, "get_scheduler", _Scheduler)
+    monkeypatch.setattr(sitemap, "get_robots_cache", _Robots)
+    return requested
+
+
+def _entry(url: str, lastmod: str | None = None) -> SitemapEntry:
+    return SitemapEntry(url=url, lastmod=_parse_lastmod(lastmod))
+
+
+def test_lastmod_parsing() -> None:
+    assert _parse_lastmod("2026-03-01") == datetime(2026, 3, 1, tzinfo=UTC)
+    assert _parse_lastmod("2026-03-01T10:00:00Z") == datetime(
+        2026, 3, 1, 10, tzinfo=UTC
+    )
+    assert _parse_lastmod("yesterday") is None
+    assert _parse_lastmod(None) is None
+
+
+def test_index_is_followed_on_the_homepage_domain(fetched: list[str]) -> None:
+    entries = asyncio.run(collect_sitemap_entries("https://acme.com/"))
+
+    # relevant children first; other domains' sitemaps are never fetched
+    assert fetched == [
+        "https://acme.com/sitemap.xml",
+        "https://acme.com/sitemap-company.xml.gz",
+        "https://acme.com/sitemap-blog.xml",
+    ]
+    assert [(e.url, e.lastmod) for e in entries] == [
+        ("https://acme.com/about", datetime(2026, 3, 1, tzinfo=UTC)),
+        ("https://www.acme.com/investors", None),
+        ("https://acme.com/blog/hello", None),
+    ]
+
+
+def test_missing_sitemap_yields_nothing(
+    fetched: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delitem(FILES, "https://acme.com/sitemap.xml")
+
+    assert asyncio.run(collect_sitemap_entries("https://acme.com/")) == []
+    assert fetched == ["https://acme.com/sitemap.xml"]
+
+
+def test_selection_ranks_relevant_recent_pages() -> None:
+    entries = [
+        _entry("https://acme.com/blog/hello"),
+        _entry("https://acme.com/careers"),
+        _entry("https://acme.com/about", "2020-01-01"),
+        _entry("https://acme.com/team", "2026-01-01"),
+        _entry("https://acme.com/company/about"),
+        _entry("https://acme.com/"),
+    ]
+
+    assert select_sitemap_urls("https://acme.com/", entries, 10) == [
+        "https://acme.com/",
+        "https://acme.com/team",
+        "https://acme.com/about",
+        "https://acme.com/company/about",
+    ]
+    assert select_sitemap_urls("https://acme.com/", entries, 2) == [
+        "https://acme.com/",
+        "https://acme.com/team",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("picks", "used"), [(SITEMAP_MIN_URLS - 1, False), (SITEMAP_MIN_URLS, True)]
+)
+def test_homepage_does_not_count_towards_the_minimum(
+    monkeypatch: pytest.MonkeyPatch, picks: int, used: bool
+) -> None:
+    entries = [_entry("https://acme.com/")] + [
+        _entry(f"https://acme.com/about/{i}") for i in range(picks)
+    ]
+
+    async def collect(url: str) -> list[SitemapEntry]:  # noqa: ARG001
+        return entries
+
+    async def inline(fn: Any) -> Any:
+        return await fn()
+
+    monkeypatch.setattr(crawl, "collect_sitemap_entries", collect)
+    monkeypatch.setattr(crawl, "run_in_crawler_thread", inline)
+
+    urls = asyncio.run(crawl.discover_sitemap_urls("https://acme.com/"))
+
+    assert len(urls) == (picks + 1 if used else 0)
@@ -0,0 +1,87 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from agent.scraper import storage
+from agent.scraper.models import RawDocument, SourceType
+from agent.scraper.storage import (
+    RecordStore,
+    convert_markdown_store,
+    current_generation,
+    load_raw_documents,
+    save_raw_documents,
+)
+
+SCRAPED_AT = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+
+
+def _doc(url: str, content: str, source_type: SourceType = "website") -> RawDocument:
+    return RawDocument(
+        url=url,
+        title=f"Title of {url}",
+        content=content,
+        source_type=source_type,
+        company="acme",
+        scraped_at=SCRAPED_AT,
+    )
+
+
+DOCS = [
+    _doc("https://acme.com/", "Acme builds rockets.\n\n" * 50),
+    _doc("https://acme.com/about", "Über uns — ünïcödé ✓"),
+    _doc("https://en.wikipedia.org/wiki/Acme", "Acme is a company.", "wikipedia"),
+    _doc("https://news.example/acme", ""),
+]
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    assert save_raw_documents("acme", DOCS, tmp_path) == len(DOCS)
+
+    assert load_raw_documents("acme", tmp_path) == DOCS
+
+
+def test_index_holds_metadata_and_offsets(tmp_path: Path) -> None:
+    save_raw_documents("acme", DOCS, tmp_path)
+    raw = tmp_path / "acme" / f"raw.{current_generation('acme', tmp_path)}"
+
+    store = RecordStore.open(raw)
+    assert store is not None
+    with store:
+        assert len(store) == len(DOCS)
+        assert [r.url for r in store.records] == [d.url for d in DOCS]
+        assert [r.size for r in store.records] == [
+            len(d.content.encode()) for d in DOCS
+        ]
+        # bodies are back to back, each readable on its own
+        ends = [r.offset + r.length for r in store.records]
+        assert [r.offset for r in store.records[1:]] == ends[:-1]
+        assert store.content(store.records[1]) == DOCS[1].content
+
+
+def test_appends_keep_earlier_documents(tmp_path: Path) -> None:
+    generation = storage.new_generation("acme", tmp_path)
+    save_raw_documents("acme", DOCS[:2], tmp_path, generation)
+    save_raw_documents("acme", DOCS[2:], tmp_path, generation)
+
+    assert load_raw_documents("acme", tmp_path, generation) == DOCS
+
+
+def test_missing_company_loads_nothing(tmp_path: Path) -> None:
+    assert load_raw_documents("nobody", tmp_path) == []
+    assert RecordStore.open(tmp_path / "nobody" / "raw") is None
+
+
+def test_markdown_store_converts_to_records(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(storage, "RAW_STORE_FORMAT", "markdown")
+    save_raw_documents("acme", DOCS[:3], tmp_path)
+    markdown = load_raw_documents("acme", tmp_path)
+    monkeypatch.undo()
+
+    assert convert_markdown_store("acme", tmp_path) == 3
+
+    raw = tmp_path / "acme" / f"raw.{current_generation('acme', tmp_path)}"
+    assert RecordStore.open(raw) is not None
+    assert load_raw_documents("acme", tmp_path) == markdown